@@ -1,5 +1,16 @@
 """Analysis engines for deep medical insights."""
 
-from dr_nexus.analysis.ultrathink import UltrathinkAnalyzer
+from typing import TYPE_CHECKING
 
-__all__ = ["UltrathinkAnalyzer"]
+from dr_nexus.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from dr_nexus.analysis.ultrathink import UltrathinkAnalyzer
+
+__all__ = [
+    "UltrathinkAnalyzer",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "UltrathinkAnalyzer": "dr_nexus.analysis.ultrathink",
+})
@@ -1,10 +1,15 @@
-"""Command-line interface for Dr. Nexus."""
+"""
+Command-line interface for Dr. Nexus.
+
+Only click is imported at startup. Configuration, ingestors and the
+Anthropic client are imported inside the commands that need them, so
+read-only commands such as `stats` and `validate` start quickly.
+"""
 
 import sys
 import click
 from pathlib import Path
 
-from dr_nexus.utils.config import get_config
 from dr_nexus.utils.logging_config import setup_logging
 
 
@@ -13,17 +18,29 @@ from dr_nexus.utils.logging_config import setup_logging
 @click.pass_context
 def cli(ctx, log_level):
     """Dr. Nexus - Medical Knowledge Base Builder."""
-    config = get_config()
-    setup_logging(log_level, config.logs_dir)
-    ctx.obj = {'config': config}
+    setup_logging(log_level)
+    ctx.obj = {'log_level': log_level}
+
+
+def get_context_config(ctx):
+    """Load the configuration on first use and start logging to its log directory."""
+    if 'config' not in ctx.obj:
+        from dr_nexus.utils.config import get_config
+
+        config = get_config()
+        setup_logging(ctx.obj['log_level'], config.logs_dir)
+        ctx.obj['config'] = config
+    return ctx.obj['config']
 
 
 @cli.command()
 @click.option('--data-dir', type=click.Path(exists=True), help='Data directory')
 @click.option('--output', type=click.Path(), default='data/knowledge_base/current.json', help='Output file')
 @click.option('--enable-ultrathink/--no-ultrathink', default=True, help='Enable Ultrathink analysis')
+@click.option('--resume', is_flag=True, help='Resume an interrupted build from its checkpoint journal')
+@click.option('--time-budget', type=float, help='Seconds to spend, most valuable documents first; rerun to continue')
 @click.pass_context
-def build(ctx, data_dir, output, enable_ultrathink):
+def build(ctx, data_dir, output, enable_ultrathink, resume, time_budget):
     """Build initial knowledge base from medical records."""
     click.echo("Building knowledge base...")
 
@@ -37,6 +54,10 @@ def build(ctx, data_dir, output, enable_ultrathink):
         args.extend(['--data-dir', data_dir])
     if not enable_ultrathink:
         args.append('--no-ultrathink')
+    if resume:
+        args.append('--resume')
+    if time_budget is not None:
+        args.extend(['--time-budget', str(time_budget)])
 
     sys.argv = ['initial_build.py'] + args
 
@@ -46,6 +67,52 @@ def build(ctx, data_dir, output, enable_ultrathink):
         return e.code
 
 
+@cli.command()
+@click.option('--data-dir', type=click.Path(exists=True), help='Directory to watch (defaults to RAW_DATA_DIR)')
+@click.option('--kb', 'kb_file', type=click.Path(), default='data/knowledge_base/current.json', help='Knowledge base to update')
+@click.option('--interval', type=float, help='Seconds between polls')
+@click.option('--debounce', type=float, help='Quiet period before a burst of new files is applied')
+@click.option('--once', is_flag=True, help='Apply changes since the last session and exit')
+@click.pass_context
+def watch(ctx, data_dir, kb_file, interval, debounce, once):
+    """Watch for new records and merge them into the knowledge base."""
+    from dr_nexus.ingestors.cache import ParsedDocumentCache
+    from dr_nexus.ingestors.discovery import FileDiscovery
+    from dr_nexus.ingestors.parallel import ParallelIngestionEngine
+    from dr_nexus.ingestors.seen_index import SeenResourceIndex
+    from dr_nexus.knowledge_base.watcher import KBWatcher
+
+    config = get_context_config(ctx)
+    config.ensure_directories()
+
+    cache = None
+    if config.enable_cache:
+        cache = ParsedDocumentCache(config.cache_dir, config.cache_max_mb * 1024 * 1024)
+
+    watcher = KBWatcher(
+        data_dir=Path(data_dir) if data_dir else config.raw_data_dir,
+        kb_path=Path(kb_file),
+        discovery=FileDiscovery(manifest_path=config.watch_manifest_path),
+        engine=ParallelIngestionEngine.from_config(config, cache),
+        poll_interval=interval if interval is not None else config.watch_poll_seconds,
+        debounce_seconds=debounce if debounce is not None else config.watch_debounce_seconds,
+        max_batch=config.watch_max_batch,
+        seen_index=SeenResourceIndex(
+            config.watch_seen_index_path, scope=str(Path(kb_file).resolve())
+        )
+    )
+
+    if once:
+        watcher.start()
+        applied = watcher.flush()
+        click.echo(f"Applied {applied} new or modified files")
+        return 0
+
+    click.echo(f"Watching {watcher.data_dir} (Ctrl+C to stop)...")
+    watcher.run()
+    return 0
+
+
 @cli.command()
 @click.argument('kb_file', type=click.Path(exists=True))
 @click.pass_context
@@ -70,26 +137,27 @@ def validate(ctx, kb_file):
 @click.pass_context
 def stats(ctx, kb_file):
     """Show knowledge base statistics."""
-    from dr_nexus.knowledge_base.kb_loader import KBLoader
+    from dr_nexus.knowledge_base.kb_stats import read_stats
 
-    kb = KBLoader.load(Path(kb_file))
-    if not kb:
-        click.secho("Failed to load knowledge base", fg='red')
+    try:
+        kb = read_stats(Path(kb_file))
+    except (OSError, ValueError) as e:
+        click.secho(f"Failed to load knowledge base: {e}", fg='red')
         return 1
 
     click.echo("\n" + "="*60)
     click.echo("KNOWLEDGE BASE STATISTICS")
     click.echo("="*60)
-    click.echo(f"\nVersion: {kb.metadata.version}")
-    click.echo(f"Generated: {kb.metadata.generated_at}")
-    click.echo(f"Source files: {kb.metadata.source_files_count}")
-    click.echo(f"\nPatient: {kb.patient_profile.demographics.name}")
-    click.echo(f"Age: {kb.patient_profile.demographics.age}")
-    click.echo(f"\nTimeline events: {len(kb.timeline)}")
-    click.echo(f"Chronic conditions: {len(kb.patient_profile.chronic_conditions)}")
-    click.echo(f"Active symptoms: {len(kb.get_active_symptoms())}")
-    click.echo(f"Pending actions: {len(kb.get_pending_actions())}")
-    click.echo(f"Unresolved questions: {len(kb.unresolved_questions)}")
+    click.echo(f"\nVersion: {kb['version']}")
+    click.echo(f"Generated: {kb['generated_at']}")
+    click.echo(f"Source files: {kb['source_files_count']}")
+    click.echo(f"\nPatient: {kb['patient_name']}")
+    click.echo(f"Age: {kb['age']}")
+    click.echo(f"\nTimeline events: {kb['timeline_events']}")
+    click.echo(f"Chronic conditions: {kb['chronic_conditions']}")
+    click.echo(f"Active symptoms: {kb['active_symptoms']}")
+    click.echo(f"Pending actions: {kb['pending_actions']}")
+    click.echo(f"Unresolved questions: {kb['unresolved_questions']}")
 
     click.echo("\n" + "="*60)
     return 0
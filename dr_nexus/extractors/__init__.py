@@ -1,5 +1,25 @@
 """Extractors for medical entities and timeline building."""
 
-from dr_nexus.extractors.timeline_builder import TimelineBuilder
+from typing import TYPE_CHECKING
 
-__all__ = ["TimelineBuilder"]
+from dr_nexus.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from dr_nexus.extractors.timeline_store import ColumnarTimeline
+    from dr_nexus.extractors.event_dedup import NearDuplicateFilter
+    from dr_nexus.extractors.timeline_builder import TimelineBuilder
+    from dr_nexus.extractors.timeline_index import TimelineIndex
+
+__all__ = [
+    "ColumnarTimeline",
+    "NearDuplicateFilter",
+    "TimelineBuilder",
+    "TimelineIndex",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "ColumnarTimeline": "dr_nexus.extractors.timeline_store",
+    "NearDuplicateFilter": "dr_nexus.extractors.event_dedup",
+    "TimelineBuilder": "dr_nexus.extractors.timeline_builder",
+    "TimelineIndex": "dr_nexus.extractors.timeline_index",
+})
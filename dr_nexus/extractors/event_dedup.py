@@ -0,0 +1,218 @@
+"""Near-duplicate detection for timeline events."""
+
+import random
+import re
+import zlib
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from dr_nexus.models.timeline import TimelineEvent, EventType
+from dr_nexus.utils.temporal import HOUR, epoch_key
+
+
+# Character shingle length for summaries
+SHINGLE_SIZE = 3
+
+# MinHash signature length, split into bands for candidate lookup. A pair
+# becomes a candidate when any band matches, which happens with probability
+# 1 - (1 - s**ROWS)**BANDS for similarity s: above 0.95 from s = 0.7 up.
+BANDS = 8
+ROWS = 4
+NUM_HASHES = BANDS * ROWS
+
+# Default estimated Jaccard similarity at which two events are duplicates
+DEFAULT_THRESHOLD = 0.7
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20251227)
+_HASH_PARAMS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(_MERSENNE_PRIME))
+    for _ in range(NUM_HASHES)
+]
+
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+class Fingerprint(NamedTuple):
+    """What near-duplicate detection compares between two events."""
+    event_type: EventType
+    numbers: Tuple[str, ...]
+    codes: FrozenSet[Tuple[str, str]]
+    signature: Tuple[int, ...]
+    source: Optional[str]
+
+
+def fingerprint(event: TimelineEvent) -> Fingerprint:
+    """
+    Fingerprint an event for near-duplicate detection.
+
+    Numbers in the summary (lab values, doses, levels) are set aside to be
+    compared exactly; the rest of the summary is lowercased, stripped of
+    punctuation and MinHashed together with the event's codes. The source
+    document is kept so records of one document are never merged.
+
+    Args:
+        event: TimelineEvent to fingerprint
+
+    Returns:
+        Fingerprint of the event
+    """
+    summary = event.summary.lower()
+    codes = frozenset((system, code) for system, code in event.codes.items() if code)
+    return Fingerprint(
+        event.event_type,
+        tuple(_NUMBER.findall(summary)),
+        codes,
+        _signature(_NUMBER.sub(' ', summary), codes),
+        event.source_document
+    )
+
+
+def estimate_similarity(a: Fingerprint, b: Fingerprint) -> float:
+    """
+    Estimate the Jaccard similarity of two fingerprinted events.
+
+    Args:
+        a: First fingerprint
+        b: Second fingerprint
+
+    Returns:
+        Fraction of matching MinHash values, from 0.0 to 1.0
+    """
+    if a.signature is b.signature:
+        return 1.0
+    return sum(x == y for x, y in zip(a.signature, b.signature)) / NUM_HASHES
+
+
+def is_conflicting(a: Fingerprint, b: Fingerprint) -> bool:
+    """
+    Check whether two events differ in a way similarity cannot outweigh.
+
+    Events of different types, with different numbers in their summaries,
+    or with different codes in the same coding system are never duplicates.
+    Neither are events from the same source document: a document lists each
+    record once, so similar events in it are separate records, such as
+    serial readings of one lab test.
+
+    Args:
+        a: First fingerprint
+        b: Second fingerprint
+
+    Returns:
+        True if the events cannot be duplicates
+    """
+    if a.event_type != b.event_type or a.numbers != b.numbers:
+        return True
+    if a.source is not None and a.source == b.source:
+        return True
+    if a.codes == b.codes:
+        return False
+    b_codes = dict(b.codes)
+    return any(system in b_codes and b_codes[system] != code for system, code in a.codes)
+
+
+class NearDuplicateFilter:
+    """
+    Sweep-line near-duplicate filter for events in chronological order.
+
+    Events are fed in date order. Each kept event stays in a window for
+    `tolerance_hours`; a new event is a duplicate if a kept event in the
+    window from another source document has the same type and numbers, no
+    conflicting codes, and an estimated similarity of at least `threshold`. Candidates are found by
+    MinHash banding, so each event is compared only with kept events that
+    share a band, and the window is trimmed as the sweep advances. Expected
+    cost is linear in the number of events.
+    """
+
+    def __init__(
+        self,
+        tolerance_hours: float = 24,
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            tolerance_hours: Maximum time between duplicate events, in hours
+            threshold: Minimum estimated similarity for duplicates
+        """
+        self.window = int(tolerance_hours * HOUR)
+        self.threshold = threshold
+        # Kept events in date order: (epoch key, band keys)
+        self._kept: Deque[Tuple[int, List[tuple]]] = deque()
+        # Band key -> fingerprints of kept events in the window, oldest first
+        self._buckets: Dict[tuple, Deque[Fingerprint]] = {}
+
+    def is_duplicate(self, event: TimelineEvent, key: Optional[int] = None) -> bool:
+        """
+        Check an event against the window and keep it if it is new.
+
+        Args:
+            event: Next event in chronological order
+            key: The event's epoch key, if already computed
+
+        Returns:
+            True if the event duplicates a kept event
+        """
+        if key is None:
+            key = epoch_key(event.date)
+        self._expire(key)
+
+        current = fingerprint(event)
+        bands = [
+            (current.event_type, current.numbers, band, current.signature[start:start + ROWS])
+            for band, start in enumerate(range(0, NUM_HASHES, ROWS))
+        ]
+
+        checked = set()
+        for band_key in bands:
+            for candidate in self._buckets.get(band_key, ()):
+                if id(candidate) in checked:
+                    continue
+                checked.add(id(candidate))
+                if (
+                    not is_conflicting(current, candidate)
+                    and estimate_similarity(current, candidate) >= self.threshold
+                ):
+                    return True
+
+        self._kept.append((key, bands))
+        for band_key in bands:
+            bucket = self._buckets.get(band_key)
+            if bucket is None:
+                bucket = self._buckets[band_key] = deque()
+            bucket.append(current)
+        return False
+
+    def _expire(self, key: int) -> None:
+        """Drop kept events that are more than the window before key."""
+        horizon = key - self.window
+        while self._kept and self._kept[0][0] < horizon:
+            _, bands = self._kept.popleft()
+            # Events expire in the order they were kept, so each is the
+            # oldest entry of every bucket it is in
+            for band_key in bands:
+                bucket = self._buckets[band_key]
+                bucket.popleft()
+                if not bucket:
+                    del self._buckets[band_key]
+
+
+@lru_cache(maxsize=1 << 16)
+def _signature(text: str, codes: FrozenSet[Tuple[str, str]]) -> Tuple[int, ...]:
+    """MinHash a summary's character shingles and the codes (memoized)."""
+    text = ' '.join(_NON_WORD.sub(' ', text).split())
+
+    if len(text) <= SHINGLE_SIZE:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    shingles.update(f"\0{system}\0{code}" for system, code in codes)
+
+    hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _HASH_PARAMS
+    )
@@ -1,21 +1,60 @@
 """Build chronological timeline from medical events."""
 
+import heapq
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from operator import itemgetter
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import logging
 
+from dr_nexus.extractors.event_dedup import DEFAULT_THRESHOLD, NearDuplicateFilter
+from dr_nexus.extractors.timeline_index import TimelineIndex
 from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
+from dr_nexus.utils.temporal import epoch_key, normalize_datetime, utc_now
 
 
 logger = logging.getLogger(__name__)
 
 
 class TimelineBuilder:
-    """Build and manage chronological medical timeline."""
+    """
+    Build and manage chronological medical timeline.
+
+    Added events are buffered and only ordered when the timeline is read.
+    Documents are mostly in date order already, so the buffer is a sequence
+    of sorted runs, one or a few per document; a stable sort finds those
+    runs and merges them in O(n log k) for k runs, and the result is merged
+    into the already ordered events. Building from many documents therefore
+    never re-sorts the whole timeline. Events with equal dates keep the
+    order they were added in.
+    """
 
     def __init__(self) -> None:
         """Initialize timeline builder."""
-        self.events: List[TimelineEvent] = []
+        self._index = TimelineIndex()
+        # Events added since the timeline was last read, in insertion order
+        self._pending: List[TimelineEvent] = []
+
+    @property
+    def index(self) -> TimelineIndex:
+        """Index over every event added so far."""
+        self._flush()
+        return self._index
+
+    @property
+    def events(self) -> List[TimelineEvent]:
+        """
+        Events in chronological order.
+
+        Returns a copy, so changing it does not affect the builder; add
+        events with `add_event` or `add_events`, or assign a new list.
+        """
+        return list(self.index.events)
+
+    @events.setter
+    def events(self, events: List[TimelineEvent]) -> None:
+        """Replace every event in the timeline."""
+        self._index = TimelineIndex()
+        self._pending = list(events)
 
     def add_event(self, event: TimelineEvent) -> None:
         """
@@ -24,7 +63,7 @@ class TimelineBuilder:
         Args:
             event: TimelineEvent to add
         """
-        self.events.append(event)
+        self._pending.append(event)
 
     def add_events(self, events: List[TimelineEvent]) -> None:
         """
@@ -33,53 +72,105 @@ class TimelineBuilder:
         Args:
             events: List of TimelineEvent objects
         """
-        self.events.extend(events)
+        self._pending.extend(events)
 
     def sort_timeline(self) -> List[TimelineEvent]:
         """
-        Sort all events chronologically.
+        Get all events in chronological order.
 
         Returns:
             Sorted list of TimelineEvent objects
         """
-        self.events.sort(key=lambda e: e.date)
         return self.events
 
-    def deduplicate_events(self, tolerance_hours: int = 24) -> List[TimelineEvent]:
+    def iter_events(
+        self,
+        tolerance_hours: Optional[float] = None,
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> Iterator[TimelineEvent]:
         """
-        Remove duplicate events based on date, type, and summary.
+        Stream the timeline in chronological order in a single pass.
 
-        Events are considered duplicates if they occur within tolerance_hours
-        of each other and have the same type and similar summary.
+        Pending events are sorted and merged with the already ordered events
+        as they are consumed, without building the index; duplicates are
+        dropped on the fly when tolerance_hours is given. The builder is not
+        changed, and events must not be added while iterating.
 
         Args:
-            tolerance_hours: Hour tolerance for considering events as duplicates
+            tolerance_hours: Drop duplicates within this many hours (see
+                deduplicate_events), or None to keep every event
+            threshold: Minimum estimated summary similarity for duplicates
 
-        Returns:
-            Deduplicated list of events
+        Yields:
+            TimelineEvent objects in chronological order
         """
-        if not self.events:
-            return []
+        for _, event in self._iter_keyed(tolerance_hours, threshold):
+            yield event
 
-        # Sort first
-        sorted_events = self.sort_timeline()
-
-        deduplicated = []
-        seen = set()
+    def _iter_keyed(
+        self,
+        tolerance_hours: Optional[float],
+        threshold: float
+    ) -> Iterator[Tuple[int, TimelineEvent]]:
+        """Stream (epoch key, event) pairs for iter_events."""
+        pending = sorted(
+            zip([epoch_key(event.date) for event in self._pending], self._pending),
+            key=itemgetter(0)
+        )
+        if not self._index:
+            ordered = iter(pending)
+        else:
+            indexed = zip(self._index.epoch_keys, self._index.events)
+            ordered = heapq.merge(indexed, pending, key=itemgetter(0)) if pending else indexed
 
-        for event in sorted_events:
-            # Create a dedup key based on date (to hour), type, and summary
-            date_key = event.date.replace(minute=0, second=0, microsecond=0)
-            summary_key = event.summary.lower().strip()[:100]  # First 100 chars
-            key = (date_key, event.event_type, summary_key)
+        if tolerance_hours is None:
+            yield from ordered
+            return
 
-            if key not in seen:
-                seen.add(key)
-                deduplicated.append(event)
-            else:
+        duplicates = NearDuplicateFilter(tolerance_hours, threshold)
+        for key, event in ordered:
+            if duplicates.is_duplicate(event, key):
                 logger.debug(f"Duplicate event removed: {event.summary} on {event.date}")
+            else:
+                yield key, event
 
-        self.events = deduplicated
+    def _flush(self) -> None:
+        """Merge pending events into the index."""
+        if self._pending:
+            pending = self._pending
+            self._pending = []
+            self._index.extend(pending)
+
+    def deduplicate_events(
+        self,
+        tolerance_hours: float = 24,
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> List[TimelineEvent]:
+        """
+        Remove duplicate events based on date, type, summary, and codes.
+
+        Events are considered duplicates if they occur within tolerance_hours
+        of each other, have the same type and the same numbers in their
+        summaries, carry no conflicting codes, and have similar summaries
+        (see NearDuplicateFilter). The earliest event of each group is kept.
+
+        Args:
+            tolerance_hours: Hour tolerance for considering events as duplicates
+            threshold: Minimum estimated summary similarity for duplicates
+
+        Returns:
+            Deduplicated list of events
+        """
+        keys = []
+        deduplicated = []
+        for key, event in self._iter_keyed(tolerance_hours, threshold):
+            keys.append(key)
+            deduplicated.append(event)
+
+        # Built in one pass over the merged stream, already in order
+        self._index = TimelineIndex()
+        self._index.extend_sorted(keys, deduplicated)
+        self._pending = []
         return deduplicated
 
     def merge_timelines(self, other_events: List[TimelineEvent]) -> List[TimelineEvent]:
@@ -105,7 +196,7 @@ class TimelineBuilder:
         Returns:
             List of events matching the type
         """
-        return [e for e in self.events if e.event_type == event_type]
+        return self.index.by_type(event_type)
 
     def get_events_by_date_range(
         self,
@@ -122,10 +213,7 @@ class TimelineBuilder:
         Returns:
             List of events within the range
         """
-        return [
-            e for e in self.events
-            if start_date <= e.date <= end_date
-        ]
+        return self.index.between(start_date, end_date)
 
     def get_critical_events(self) -> List[TimelineEvent]:
         """
@@ -134,10 +222,7 @@ class TimelineBuilder:
         Returns:
             List of critical events
         """
-        return [
-            e for e in self.events
-            if e.clinical_significance == ClinicalSignificance.CRITICAL
-        ]
+        return self.index.by_significance(ClinicalSignificance.CRITICAL)
 
     def create_event_from_fhir_procedure(self, proc_data: Dict[str, Any]) -> TimelineEvent:
         """
@@ -167,9 +252,7 @@ class TimelineBuilder:
         Returns:
             TimelineEvent object
         """
-        date = encounter_data.get('date', datetime.now())
-        if isinstance(date, str):
-            date = datetime.fromisoformat(date.replace('Z', '+00:00'))
+        date = normalize_datetime(encounter_data.get('date')) or utc_now()
 
         return TimelineEvent(
             date=date,
@@ -195,14 +278,7 @@ class TimelineBuilder:
         Returns:
             TimelineEvent object
         """
-        onset_date = diagnosis_data.get('onset_date')
-        if isinstance(onset_date, str):
-            # If only date, add time
-            if len(onset_date) == 10:  # YYYY-MM-DD
-                onset_date = onset_date + 'T00:00:00'
-            date = datetime.fromisoformat(onset_date)
-        else:
-            date = onset_date or datetime.now()
+        date = normalize_datetime(diagnosis_data.get('onset_date')) or utc_now()
 
         return TimelineEvent(
             date=date,
@@ -212,8 +288,8 @@ class TimelineBuilder:
             source_document=source,
             clinical_significance=ClinicalSignificance.HIGH,
             codes={
-                'icd10': diagnosis_data.get('icd10_code', ''),
-                'snomed': diagnosis_data.get('snomed_code', '')
+                'icd10': diagnosis_data.get('icd10_code') or '',
+                'snomed': diagnosis_data.get('snomed_code') or ''
             }
         )
 
@@ -232,9 +308,7 @@ class TimelineBuilder:
         Returns:
             TimelineEvent object
         """
-        date = result_data.get('date', datetime.now())
-        if isinstance(date, str):
-            date = datetime.fromisoformat(date.replace('Z', '+00:00'))
+        date = normalize_datetime(result_data.get('date')) or utc_now()
 
         name = result_data.get('name', 'Lab result')
         value = result_data.get('value', '')
@@ -248,7 +322,8 @@ class TimelineBuilder:
             summary=summary,
             details=result_data,
             source_document=source,
-            clinical_significance=ClinicalSignificance.MEDIUM
+            clinical_significance=ClinicalSignificance.MEDIUM,
+            provider=result_data.get('performer')
         )
 
     def build_from_fhir_data(self, fhir_data: Dict[str, Any]) -> List[TimelineEvent]:
@@ -259,21 +334,22 @@ class TimelineBuilder:
             fhir_data: Dictionary from FHIRIngestor.ingest()
 
         Returns:
-            List of TimelineEvent objects
+            Events added from this document, in document order
         """
+        events: List[TimelineEvent] = []
         source = fhir_data.get('source_file', 'FHIR Bundle')
 
         # Add procedures (already TimelineEvents from ingestor)
         procedures = fhir_data.get('procedures', [])
         for proc in procedures:
             if isinstance(proc, TimelineEvent):
-                self.add_event(proc)
+                events.append(proc)
 
         # Add encounters (already TimelineEvents from ingestor)
         encounters = fhir_data.get('encounters', [])
         for enc in encounters:
             if isinstance(enc, TimelineEvent):
-                self.add_event(enc)
+                events.append(enc)
 
         # Convert conditions to diagnosis events
         conditions = fhir_data.get('conditions', [])
@@ -286,16 +362,17 @@ class TimelineBuilder:
                     'snomed_code': cond.snomed_code,
                     'status': cond.status.value
                 }, source)
-                self.add_event(event)
+                events.append(event)
 
         # Convert observations to lab result events
         observations = fhir_data.get('observations', [])
         for obs in observations:
             if obs.get('date'):
                 event = self.create_event_from_lab_result(obs, source)
-                self.add_event(event)
+                events.append(event)
 
-        return self.sort_timeline()
+        self.add_events(events)
+        return events
 
     def build_from_ccda_data(self, ccda_data: Dict[str, Any]) -> List[TimelineEvent]:
         """
@@ -305,8 +382,9 @@ class TimelineBuilder:
             ccda_data: Dictionary from CCDAIngestor.ingest()
 
         Returns:
-            List of TimelineEvent objects
+            Events added from this document, in document order
         """
+        events: List[TimelineEvent] = []
         source = ccda_data.get('source_file', 'C-CDA Document')
 
         # Add problems as diagnosis events
@@ -314,18 +392,14 @@ class TimelineBuilder:
         for problem in problems:
             if problem.get('onset_date'):
                 event = self.create_event_from_diagnosis(problem, source)
-                self.add_event(event)
+                events.append(event)
 
         # Add procedures
         procedures = ccda_data.get('procedures', [])
         for proc in procedures:
             if proc.get('date'):
-                date = proc['date']
-                if isinstance(date, str):
-                    date = datetime.fromisoformat(date.replace('Z', '+00:00'))
-
                 event = TimelineEvent(
-                    date=date,
+                    date=normalize_datetime(proc['date']) or utc_now(),
                     event_type=EventType.PROCEDURE,
                     summary=proc.get('name', 'Procedure'),
                     details=proc,
@@ -333,23 +407,24 @@ class TimelineBuilder:
                     clinical_significance=ClinicalSignificance.HIGH,
                     codes={'cpt': proc.get('code', '')}
                 )
-                self.add_event(event)
+                events.append(event)
 
         # Add results
         results = ccda_data.get('results', [])
         for result in results:
             if result.get('date'):
                 event = self.create_event_from_lab_result(result, source)
-                self.add_event(event)
+                events.append(event)
 
         # Add encounters
         encounters = ccda_data.get('encounters', [])
         for enc in encounters:
             if enc.get('date'):
                 event = self.create_event_from_encounter(enc, source)
-                self.add_event(event)
+                events.append(event)
 
-        return self.sort_timeline()
+        self.add_events(events)
+        return events
 
     def get_timeline(self) -> List[TimelineEvent]:
         """
@@ -366,8 +441,8 @@ class TimelineBuilder:
 
     def __len__(self) -> int:
         """Get number of events in timeline."""
-        return len(self.events)
+        return len(self._index) + len(self._pending)
 
     def __repr__(self) -> str:
         """String representation of timeline."""
-        return f"TimelineBuilder(events={len(self.events)})"
+        return f"TimelineBuilder(events={len(self)})"
@@ -0,0 +1,247 @@
+"""Indexed lookups over a chronological timeline."""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
+from dr_nexus.utils.temporal import epoch_key
+
+
+class _SortedRun:
+    """Events in date order with their epoch keys, index for index."""
+
+    __slots__ = ('keys', 'events')
+
+    def __init__(self) -> None:
+        self.keys: List[int] = []
+        self.events: List[TimelineEvent] = []
+
+    def insert(self, key: int, event: TimelineEvent) -> None:
+        """Insert one event after any events with the same key."""
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.events.insert(position, event)
+
+    def merge(self, keys: List[int], events: List[TimelineEvent]) -> None:
+        """Merge a batch sorted by key; existing events stay ahead of equal keys."""
+        if not self.keys or self.keys[-1] <= keys[0]:
+            self.keys.extend(keys)
+            self.events.extend(events)
+            return
+
+        merged = list(heapq.merge(
+            zip(self.keys, self.events), zip(keys, events), key=itemgetter(0)
+        ))
+        self.keys = [key for key, _ in merged]
+        self.events = [event for _, event in merged]
+
+    def select(self, start_key: Optional[int], end_key: Optional[int]) -> List[TimelineEvent]:
+        """Copy of the events between two keys (inclusive; None is unbounded)."""
+        start = 0 if start_key is None else bisect_left(self.keys, start_key)
+        end = len(self.keys) if end_key is None else bisect_right(self.keys, end_key)
+        return self.events[start:end]
+
+
+_EMPTY_RUN = _SortedRun()
+
+
+class TimelineIndex:
+    """
+    Chronological index over timeline events.
+
+    Events are kept in date order alongside their epoch keys, so date ranges
+    are found by bisection. Posting lists per event type, clinical
+    significance and code are kept in date order too and updated as events
+    are added, so filtered queries touch only matching events. Events with
+    equal dates keep the order they were added in.
+
+    Results are new lists; the indexed events themselves are shared, not
+    copied.
+    """
+
+    def __init__(self, events: Iterable[TimelineEvent] = ()) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            events: Events to index, in any order
+        """
+        self._all = _SortedRun()
+        self._by_type: Dict[EventType, _SortedRun] = defaultdict(_SortedRun)
+        self._by_significance: Dict[ClinicalSignificance, _SortedRun] = defaultdict(_SortedRun)
+        self._by_code: Dict[str, _SortedRun] = defaultdict(_SortedRun)
+        self.extend(events)
+
+    @property
+    def events(self) -> List[TimelineEvent]:
+        """All events in chronological order (owned by the index; do not modify)."""
+        return self._all.events
+
+    @property
+    def epoch_keys(self) -> List[int]:
+        """Epoch keys of `events`, index for index (do not modify)."""
+        return self._all.keys
+
+    def add(self, event: TimelineEvent) -> None:
+        """
+        Add a single event.
+
+        Args:
+            event: TimelineEvent to add
+        """
+        key = epoch_key(event.date)
+        for run in self._runs_for(event):
+            run.insert(key, event)
+
+    def extend(self, events: Iterable[TimelineEvent]) -> None:
+        """
+        Add a batch of events.
+
+        The batch is sorted once and merged into each posting list it
+        touches, which is cheaper than adding events one by one.
+
+        Args:
+            events: Events to add, in any order
+        """
+        events = list(events)
+        if not events:
+            return
+
+        keys = [epoch_key(event.date) for event in events]
+        order = sorted(range(len(events)), key=keys.__getitem__)
+        self.extend_sorted([keys[i] for i in order], [events[i] for i in order])
+
+    def extend_sorted(self, keys: List[int], events: List[TimelineEvent]) -> None:
+        """
+        Add a batch of events that is already in date order.
+
+        Args:
+            keys: Epoch keys of the events, in ascending order
+            events: Events matching keys, index for index
+        """
+        batches: Dict[_SortedRun, Tuple[List[int], List[TimelineEvent]]] = {}
+        for key, event in zip(keys, events):
+            for run in self._runs_for(event):
+                batch = batches.get(run)
+                if batch is None:
+                    batch = batches[run] = ([], [])
+                batch[0].append(key)
+                batch[1].append(event)
+
+        for run, (run_keys, run_events) in batches.items():
+            run.merge(run_keys, run_events)
+
+    def between(self, start_date: datetime, end_date: datetime) -> List[TimelineEvent]:
+        """
+        Get events within a date range.
+
+        Args:
+            start_date: Start of date range (inclusive)
+            end_date: End of date range (inclusive)
+
+        Returns:
+            Events within the range, in chronological order
+        """
+        return self._select(self._all, start_date, end_date)
+
+    def by_type(
+        self,
+        event_type: EventType,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[TimelineEvent]:
+        """
+        Get events of one type, optionally within a date range.
+
+        Args:
+            event_type: EventType to filter by
+            start_date: Start of date range (inclusive), or None
+            end_date: End of date range (inclusive), or None
+
+        Returns:
+            Matching events in chronological order
+        """
+        return self._select(self._by_type.get(event_type), start_date, end_date)
+
+    def by_significance(
+        self,
+        significance: ClinicalSignificance,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[TimelineEvent]:
+        """
+        Get events of one clinical significance, optionally within a date range.
+
+        Args:
+            significance: ClinicalSignificance to filter by
+            start_date: Start of date range (inclusive), or None
+            end_date: End of date range (inclusive), or None
+
+        Returns:
+            Matching events in chronological order
+        """
+        return self._select(self._by_significance.get(significance), start_date, end_date)
+
+    def by_code(
+        self,
+        code: str,
+        system: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[TimelineEvent]:
+        """
+        Get events carrying a medical code, optionally within a date range.
+
+        Args:
+            code: Code value, e.g. "22551"
+            system: Only match the code under this key of `codes` (e.g. "cpt")
+            start_date: Start of date range (inclusive), or None
+            end_date: End of date range (inclusive), or None
+
+        Returns:
+            Matching events in chronological order
+        """
+        events = self._select(self._by_code.get(code), start_date, end_date)
+        if system is not None:
+            events = [e for e in events if e.codes.get(system) == code]
+        return events
+
+    def _runs_for(self, event: TimelineEvent) -> List[_SortedRun]:
+        """Get every run an event belongs in."""
+        runs = [
+            self._all,
+            self._by_type[event.event_type],
+            self._by_significance[event.clinical_significance],
+        ]
+        for code in set(event.codes.values()):
+            if code:
+                runs.append(self._by_code[code])
+        return runs
+
+    @staticmethod
+    def _select(
+        run: Optional[_SortedRun],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> List[TimelineEvent]:
+        """Get a run's events between two optional dates."""
+        return (run or _EMPTY_RUN).select(
+            None if start_date is None else epoch_key(start_date),
+            None if end_date is None else epoch_key(end_date)
+        )
+
+    def __iter__(self) -> Iterator[TimelineEvent]:
+        """Iterate events in chronological order."""
+        return iter(self._all.events)
+
+    def __len__(self) -> int:
+        """Get number of indexed events."""
+        return len(self._all.events)
+
+    def __repr__(self) -> str:
+        """String representation of the index."""
+        return f"TimelineIndex(events={len(self)})"
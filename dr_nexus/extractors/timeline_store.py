@@ -0,0 +1,300 @@
+"""Columnar, array-backed storage for large timelines."""
+
+from datetime import datetime
+from typing import Any, Dict, Generic, Hashable, Iterable, List, Optional, Sequence, TypeVar
+
+import numpy as np
+from pydantic_core import to_jsonable_python
+
+from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
+from dr_nexus.utils import json_codec
+from dr_nexus.utils.temporal import epoch_key
+
+
+T = TypeVar('T', bound=Hashable)
+
+_EVENT_TYPES = list(EventType)
+_SIGNIFICANCES = list(ClinicalSignificance)
+_EVENT_TYPE_CODES = {value: code for code, value in enumerate(_EVENT_TYPES)}
+_SIGNIFICANCE_CODES = {value: code for code, value in enumerate(_SIGNIFICANCES)}
+
+
+class _Dictionary(Generic[T]):
+    """Distinct values and the integer code of each, in first-seen order."""
+
+    __slots__ = ('values', '_codes')
+
+    def __init__(self) -> None:
+        self.values: List[T] = []
+        self._codes: Dict[T, int] = {}
+
+    def encode(self, value: T) -> int:
+        """Get the code for a value, adding it if it is new."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class ColumnarTimeline:
+    """
+    Timeline stored as NumPy columns instead of one object per event.
+
+    Dates are int64 epoch keys (microseconds since 1970, UTC). Event type and
+    clinical significance are stored as uint8 codes; summaries, sources,
+    locations, providers and code sets are dictionary-encoded as int32 codes,
+    so repeated values are stored once. Details are kept out of line as one
+    JSON blob and decoded only when an event is converted back.
+
+    Timelines are immutable: filtering and sorting return new timelines that
+    share the dictionaries and the details blob with the original.
+
+    Details round-trip through JSON, as they do when a knowledge base is
+    saved and loaded.
+    """
+
+    # Fields stored as int32 codes into a dictionary of distinct values
+    _ENCODED_FIELDS = ('summary', 'source_document', 'location', 'provider', 'codes')
+
+    def __init__(
+        self,
+        dates: np.ndarray,
+        event_types: np.ndarray,
+        significance: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        dictionaries: Dict[str, list],
+        details_blob: bytes,
+        details_spans: np.ndarray
+    ) -> None:
+        """
+        Initialize from prepared columns; use `from_events` to build one.
+
+        Args:
+            dates: Epoch keys (int64)
+            event_types: Indexes into EventType (uint8)
+            significance: Indexes into ClinicalSignificance (uint8)
+            columns: Dictionary codes per encoded field (int32)
+            dictionaries: Decoded values per encoded field
+            details_blob: Concatenated JSON-encoded details
+            details_spans: Start and end of each event's details in the blob, shape (n, 2)
+        """
+        self.dates = dates
+        self.event_types = event_types
+        self.significance = significance
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self._details_blob = details_blob
+        self._details_spans = details_spans
+
+    @classmethod
+    def from_events(cls, events: Iterable[TimelineEvent]) -> 'ColumnarTimeline':
+        """
+        Build a columnar timeline from events, keeping their order.
+
+        Args:
+            events: TimelineEvent objects
+
+        Returns:
+            ColumnarTimeline holding the same events
+        """
+        dictionaries: Dict[str, _Dictionary] = {
+            name: _Dictionary() for name in cls._ENCODED_FIELDS
+        }
+        summary = dictionaries['summary'].encode
+        source_document = dictionaries['source_document'].encode
+        location = dictionaries['location'].encode
+        provider = dictionaries['provider'].encode
+        codes = dictionaries['codes'].encode
+
+        dates, event_types, significance = [], [], []
+        columns: Dict[str, list] = {name: [] for name in cls._ENCODED_FIELDS}
+        details = bytearray()
+        spans = []
+
+        for event in events:
+            dates.append(epoch_key(event.date))
+            event_types.append(_EVENT_TYPE_CODES[event.event_type])
+            significance.append(_SIGNIFICANCE_CODES[event.clinical_significance])
+            columns['summary'].append(summary(event.summary))
+            columns['source_document'].append(source_document(event.source_document))
+            columns['location'].append(location(event.location))
+            columns['provider'].append(provider(event.provider))
+            columns['codes'].append(codes(tuple(event.codes.items())))
+
+            start = len(details)
+            if event.details:
+                details += json_codec.dumps(event.details, default=to_jsonable_python)
+            spans.append((start, len(details)))
+
+        return cls(
+            dates=np.array(dates, dtype=np.int64),
+            event_types=np.array(event_types, dtype=np.uint8),
+            significance=np.array(significance, dtype=np.uint8),
+            columns={
+                name: np.array(values, dtype=np.int32) for name, values in columns.items()
+            },
+            dictionaries={name: d.values for name, d in dictionaries.items()},
+            details_blob=bytes(details),
+            details_spans=np.array(spans, dtype=np.int64).reshape(-1, 2)
+        )
+
+    def to_events(self) -> List[TimelineEvent]:
+        """
+        Convert back to TimelineEvent objects.
+
+        Returns:
+            List of TimelineEvent objects, in timeline order
+        """
+        dates = self.dates.astype('datetime64[us]').tolist()
+        event_types = [_EVENT_TYPES[code] for code in self.event_types.tolist()]
+        significance = [_SIGNIFICANCES[code] for code in self.significance.tolist()]
+        decoded = {
+            name: [values[code] for code in self.columns[name].tolist()]
+            for name, values in self.dictionaries.items()
+        }
+
+        # Every field comes from a validated event, so skip re-validation
+        return [
+            TimelineEvent.model_construct(
+                date=dates[i],
+                event_type=event_types[i],
+                summary=decoded['summary'][i],
+                details=self.details(i),
+                source_document=decoded['source_document'][i],
+                clinical_significance=significance[i],
+                location=decoded['location'][i],
+                provider=decoded['provider'][i],
+                codes=dict(decoded['codes'][i])
+            )
+            for i in range(len(self))
+        ]
+
+    def event(self, i: int) -> TimelineEvent:
+        """
+        Convert a single event back to a TimelineEvent.
+
+        Args:
+            i: Position in the timeline
+
+        Returns:
+            TimelineEvent object
+        """
+        return self.take([i]).to_events()[0]
+
+    def details(self, i: int) -> Dict[str, Any]:
+        """
+        Decode one event's details.
+
+        Args:
+            i: Position in the timeline
+
+        Returns:
+            Details dictionary (empty if the event has none)
+        """
+        start, end = self._details_spans[i].tolist()
+        if start == end:
+            return {}
+        return json_codec.loads(self._details_blob[start:end])
+
+    def take(self, indices: Sequence[int]) -> 'ColumnarTimeline':
+        """
+        Select events by position or boolean mask.
+
+        Args:
+            indices: Positions (any order) or a boolean mask
+
+        Returns:
+            New ColumnarTimeline with the selected events
+        """
+        indices = np.asarray(indices)
+        if indices.dtype != bool:
+            indices = indices.astype(np.intp, copy=False)
+        return ColumnarTimeline(
+            dates=self.dates[indices],
+            event_types=self.event_types[indices],
+            significance=self.significance[indices],
+            columns={name: column[indices] for name, column in self.columns.items()},
+            dictionaries=self.dictionaries,
+            details_blob=self._details_blob,
+            details_spans=self._details_spans[indices]
+        )
+
+    def sorted(self) -> 'ColumnarTimeline':
+        """
+        Sort chronologically; events with equal dates keep their order.
+
+        Returns:
+            New ColumnarTimeline in date order
+        """
+        return self.take(np.argsort(self.dates, kind='stable'))
+
+    def mask(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        event_type: Optional[EventType] = None,
+        significance: Optional[ClinicalSignificance] = None
+    ) -> np.ndarray:
+        """
+        Build a boolean mask of events matching every given filter.
+
+        Args:
+            start_date: Start of date range (inclusive), or None
+            end_date: End of date range (inclusive), or None
+            event_type: EventType to match, or None
+            significance: ClinicalSignificance to match, or None
+
+        Returns:
+            Boolean array, one entry per event
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if start_date is not None:
+            mask &= self.dates >= epoch_key(start_date)
+        if end_date is not None:
+            mask &= self.dates <= epoch_key(end_date)
+        if event_type is not None:
+            mask &= self.event_types == _EVENT_TYPE_CODES[event_type]
+        if significance is not None:
+            mask &= self.significance == _SIGNIFICANCE_CODES[significance]
+        return mask
+
+    def filter(self, **filters: Any) -> 'ColumnarTimeline':
+        """
+        Select the events matching every given filter (see `mask`).
+
+        Returns:
+            New ColumnarTimeline with the matching events
+        """
+        return self.take(self.mask(**filters))
+
+    def count_by_type(self) -> Dict[EventType, int]:
+        """
+        Count events per event type.
+
+        Returns:
+            Mapping of EventType to count, for types that occur
+        """
+        counts = np.bincount(self.event_types, minlength=len(_EVENT_TYPES))
+        return {
+            event_type: int(count)
+            for event_type, count in zip(_EVENT_TYPES, counts.tolist())
+            if count
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the columns and the details blob (not the dictionaries)."""
+        return (
+            self.dates.nbytes + self.event_types.nbytes + self.significance.nbytes
+            + sum(column.nbytes for column in self.columns.values())
+            + len(self._details_blob) + self._details_spans.nbytes
+        )
+
+    def __len__(self) -> int:
+        """Get number of events."""
+        return len(self.dates)
+
+    def __repr__(self) -> str:
+        """String representation of the timeline."""
+        return f"ColumnarTimeline(events={len(self)})"
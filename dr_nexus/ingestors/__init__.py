@@ -1,9 +1,22 @@
 """Data ingestors for various medical document formats."""
 
-from dr_nexus.ingestors.base import BaseIngestor
-from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+from typing import TYPE_CHECKING
+
+from dr_nexus.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from dr_nexus.ingestors.base import BaseIngestor
+    from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+    from dr_nexus.ingestors.ndjson_ingestor import NDJSONIngestor
 
 __all__ = [
     "BaseIngestor",
     "FHIRIngestor",
+    "NDJSONIngestor",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BaseIngestor": "dr_nexus.ingestors.base",
+    "FHIRIngestor": "dr_nexus.ingestors.fhir_ingestor",
+    "NDJSONIngestor": "dr_nexus.ingestors.ndjson_ingestor",
+})
@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 class BaseIngestor(ABC):
     """Base class for all data ingestors."""
 
+    # Bump whenever extracted output changes so cached results are invalidated
+    VERSION = "1"
+
     def __init__(self) -> None:
         """Initialize the ingestor."""
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -0,0 +1,160 @@
+"""Content-addressed on-disk cache of ingestor output."""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
+
+from dr_nexus.ingestors.base import BaseIngestor
+
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class ParsedDocumentCache:
+    """
+    Cache of parsed documents keyed by file path, content and ingestor version.
+
+    Entries are zlib-compressed pickles stored under `cache_dir`, sharded by
+    the first two hex digits of their key. An entry's mtime records its last
+    use, which drives least-recently-used eviction once the cache grows past
+    `max_bytes`.
+    """
+
+    SUFFIX = '.bin'
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 512 * 1024 * 1024) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Total size above which least-recently-used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def make_key(
+        self,
+        filepath: Path,
+        ingestor_cls: Type[BaseIngestor],
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Compute the cache key for a file.
+
+        The key covers the file content, the ingestor class and version, and
+        any constructor options that change the ingestor's output. Payloads
+        record the path they were parsed from (`source_file`, event sources,
+        lean source references), so the path is part of the key too and
+        identical files at different paths get separate entries.
+
+        Args:
+            filepath: Path to the source document
+            ingestor_cls: Ingestor class that parses the document
+            options: Ingestor constructor options
+
+        Returns:
+            Hex digest identifying the parsed output
+        """
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b''):
+                digest.update(chunk)
+
+        ingestor_id = f"{ingestor_cls.__module__}.{ingestor_cls.__qualname__}:{ingestor_cls.VERSION}"
+        option_id = repr(sorted((options or {}).items()))
+        digest.update(f"\0{filepath}\0{ingestor_id}\0{option_id}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached entry and mark it as recently used.
+
+        Args:
+            key: Cache key from `make_key`
+
+        Returns:
+            Cached ingestor output, or None on a miss or unreadable entry
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.loads(zlib.decompress(f.read()))
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, data: Dict[str, Any]) -> None:
+        """
+        Store an entry atomically.
+
+        Args:
+            key: Cache key from `make_key`
+            data: Ingestor output to cache
+        """
+        try:
+            payload = zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning(f"Not caching entry {key}, payload is not picklable: {e}")
+            return
+
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {key}: {e}")
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """
+        Remove least-recently-used entries until the cache fits in `max_bytes`.
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob(f"*/*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} cache entries ({total:,} bytes remain)")
+        return removed
+
+    def _entry_path(self, key: str) -> Path:
+        """Path of the file holding an entry."""
+        return self.cache_dir / key[:2] / f"{key}{self.SUFFIX}"
@@ -1,38 +1,125 @@
 """HL7 C-CDA XML document ingestor."""
 
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import xml.etree.ElementTree as ET
 
+try:
+    from lxml import etree as LET
+except ImportError:  # pragma: no cover - lxml is a declared dependency
+    LET = None
+
 from dr_nexus.ingestors.base import BaseIngestor
+from dr_nexus.ingestors.format_detection import detect_format
+from dr_nexus.models.document import DocumentType
 from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
+from dr_nexus.utils.temporal import normalize_date, normalize_datetime
+
+
+# Parser settings for untrusted, potentially very large documents
+_LXML_PARSER_OPTIONS = {
+    'huge_tree': True,
+    'no_network': True,
+    'resolve_entities': False,
+    'load_dtd': False,
+}
+
+# Compiled XPath expressions keyed by (ElementPath-style path, first match only)
+_XPATH_CACHE: Dict[Tuple[str, bool], Any] = {}
 
 
 class CCDAIngestor(BaseIngestor):
     """Ingest HL7 Clinical Document Architecture (C-CDA) XML documents."""
 
+    VERSION = "3"
+
     # HL7 v3 namespace
     NS = {
         'hl7': 'urn:hl7-org:v3',
         'xsi': 'http://www.w3.org/2001/XMLSchema-instance'
     }
 
-    def can_ingest(self, filepath: Path) -> bool:
-        """Check if file is a C-CDA XML document."""
-        if filepath.suffix.lower() != '.xml':
-            return False
+    # LOINC section codes mapped to result keys
+    SECTION_CODES = {
+        '11450-4': 'problems',  # Problem List
+        '10160-0': 'medications',  # Medications
+        '48765-2': 'allergies',  # Allergies
+        '47519-4': 'procedures',  # Procedures
+        '30954-2': 'results',  # Results
+        '8716-3': 'vitals',  # Vital Signs
+        '46240-8': 'encounters',  # Encounters
+        '11369-6': 'immunizations',  # Immunizations
+    }
 
-        try:
-            tree = ET.parse(filepath)
-            root = tree.getroot()
-            # Check for C-CDA namespace and ClinicalDocument root
-            return (
-                root.tag.endswith('ClinicalDocument') or
-                'urn:hl7-org:v3' in root.tag
-            )
-        except ET.ParseError:
-            return False
+    # C-CDA R2.1 section templateIds (entries optional and required) mapped to result keys
+    SECTION_TEMPLATES = {
+        '2.16.840.1.113883.10.20.22.2.5': 'problems',
+        '2.16.840.1.113883.10.20.22.2.5.1': 'problems',
+        '2.16.840.1.113883.10.20.22.2.1': 'medications',
+        '2.16.840.1.113883.10.20.22.2.1.1': 'medications',
+        '2.16.840.1.113883.10.20.22.2.6': 'allergies',
+        '2.16.840.1.113883.10.20.22.2.6.1': 'allergies',
+        '2.16.840.1.113883.10.20.22.2.7': 'procedures',
+        '2.16.840.1.113883.10.20.22.2.7.1': 'procedures',
+        '2.16.840.1.113883.10.20.22.2.3': 'results',
+        '2.16.840.1.113883.10.20.22.2.3.1': 'results',
+        '2.16.840.1.113883.10.20.22.2.4': 'vitals',
+        '2.16.840.1.113883.10.20.22.2.4.1': 'vitals',
+        '2.16.840.1.113883.10.20.22.2.22': 'encounters',
+        '2.16.840.1.113883.10.20.22.2.22.1': 'encounters',
+        '2.16.840.1.113883.10.20.22.2.2': 'immunizations',
+        '2.16.840.1.113883.10.20.22.2.2.1': 'immunizations',
+    }
+
+    # Result keys mapped to the method extracting records from a single entry
+    ENTRY_HANDLERS = {
+        'problems': '_extract_problem',
+        'medications': '_extract_medication',
+        'allergies': '_extract_allergy',
+        'procedures': '_extract_procedure',
+        'results': '_extract_result_entry',
+        'vitals': '_extract_vital',
+        'encounters': '_extract_encounter',
+        'immunizations': '_extract_immunization',
+    }
+
+    _SECTION_TAG = '{urn:hl7-org:v3}section'
+    _COMPONENT_TAG = '{urn:hl7-org:v3}component'
+    _STRUCTURED_BODY_TAG = '{urn:hl7-org:v3}structuredBody'
+
+    BACKENDS = ('auto', 'lxml', 'etree')
+
+    def __init__(self, streaming: bool = False, backend: str = 'auto') -> None:
+        """
+        Initialize the C-CDA ingestor.
+
+        Args:
+            streaming: Parse incrementally, extracting and discarding each
+                section as soon as it closes. The result then holds only
+                extracted data (no `sections` element lists).
+            backend: XML engine: 'lxml' (compiled XPath), 'etree' (standard
+                library ElementTree), or 'auto' to use lxml when streaming and
+                installed. lxml elements cannot be pickled, so 'auto' keeps
+                ElementTree for full parses, whose `sections` hold elements and
+                may cross process boundaries or go through the parse cache.
+        """
+        super().__init__()
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown XML backend '{backend}', expected one of {self.BACKENDS}")
+        if backend == 'lxml' and LET is None:
+            raise ImportError("lxml is required for the 'lxml' backend")
+
+        if backend == 'auto':
+            backend = 'lxml' if streaming and LET is not None else 'etree'
+
+        self.streaming = streaming
+        self.backend = backend
+        self._use_lxml = self.backend == 'lxml'
+
+    def can_ingest(self, filepath: Path) -> bool:
+        """Check if file is a C-CDA XML document (sniffs the root element only)."""
+        return detect_format(filepath) == DocumentType.CCDA
 
     def ingest(self, filepath: Path) -> Dict[str, Any]:
         """
@@ -47,7 +134,13 @@ class CCDAIngestor(BaseIngestor):
         self.validate_file_exists(filepath)
         self.validate_file_readable(filepath)
 
-        tree = ET.parse(filepath)
+        if self.streaming:
+            return self._ingest_streaming(filepath)
+
+        if self._use_lxml:
+            tree = LET.parse(str(filepath), LET.XMLParser(**_LXML_PARSER_OPTIONS))
+        else:
+            tree = ET.parse(filepath)
         root = tree.getroot()
 
         self.logger.info(f"Processing C-CDA document: {filepath.name}")
@@ -58,59 +151,137 @@ class CCDAIngestor(BaseIngestor):
         # Extract patient information
         patient = self._extract_patient_from_record_target(root)
 
-        # Extract sections
-        sections = self._extract_sections(root)
-
         result = {
             'source_file': str(filepath),
             'document_type': 'C-CDA',
             'metadata': metadata,
             'patient': patient,
-            'problems': self._extract_problems(sections.get('problems', [])),
-            'medications': self._extract_medications_from_section(sections.get('medications', [])),
-            'allergies': self._extract_allergies(sections.get('allergies', [])),
-            'procedures': self._extract_procedures_from_section(sections.get('procedures', [])),
-            'results': self._extract_results(sections.get('results', [])),
-            'vitals': self._extract_vitals(sections.get('vitals', [])),
-            'encounters': self._extract_encounters_from_section(sections.get('encounters', [])),
-            'immunizations': self._extract_immunizations(sections.get('immunizations', [])),
-            'sections': sections
         }
+        for key in self.ENTRY_HANDLERS:
+            result[key] = []
+
+        # Extract sections
+        sections: Dict[str, List[ET.Element]] = {}
+        self._walk_body(root, result, sections)
+        result['sections'] = sections
+
+        return result
+
+    def _ingest_streaming(self, filepath: Path) -> Dict[str, Any]:
+        """
+        Ingest a C-CDA document with iterparse.
+
+        Each top-level body section is extracted when its end tag is read and
+        then detached from the tree, so only the document header and the
+        section currently being parsed are ever held in memory.
+
+        Args:
+            filepath: Path to C-CDA XML file
+
+        Returns:
+            Dictionary with extracted data only
+        """
+        self.logger.info(f"Streaming C-CDA document: {filepath.name}")
+
+        result: Dict[str, Any] = {
+            'source_file': str(filepath),
+            'document_type': 'C-CDA',
+        }
+        for key in self.ENTRY_HANDLERS:
+            result[key] = []
+
+        root = None
+        stack: List[ET.Element] = []
+
+        if self._use_lxml:
+            events = LET.iterparse(str(filepath), events=('start', 'end'), **_LXML_PARSER_OPTIONS)
+        else:
+            events = ET.iterparse(filepath, events=('start', 'end'))
+
+        for event, elem in events:
+            if event == 'start':
+                if root is None:
+                    root = elem
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if (
+                elem.tag == self._SECTION_TAG
+                and len(stack) >= 2
+                and stack[-1].tag == self._COMPONENT_TAG
+                and stack[-2].tag == self._STRUCTURED_BODY_TAG
+            ):
+                self._walk_section(elem, result)
+                elem.clear()
+                stack[-1].remove(elem)
+
+        # Only the header remains in the tree at this point
+        result['metadata'] = self._extract_metadata(root)
+        result['patient'] = self._extract_patient_from_record_target(root)
 
         return result
 
+    def _find(self, elem: ET.Element, path: str) -> Optional[ET.Element]:
+        """Find the first element matching an `hl7:`-prefixed path."""
+        if self._use_lxml:
+            matches = self._compiled_xpath(path, True)(elem)
+            return matches[0] if matches else None
+        return elem.find(path, self.NS)
+
+    def _findall(self, elem: ET.Element, path: str) -> List[ET.Element]:
+        """Find all elements matching an `hl7:`-prefixed path, in document order."""
+        if self._use_lxml:
+            return self._compiled_xpath(path, False)(elem)
+        return elem.findall(path, self.NS)
+
+    def _compiled_xpath(self, path: str, first: bool) -> Any:
+        """
+        Compile an ElementPath-style path into an lxml XPath, once per process.
+
+        The paths used here are valid XPath 1.0 as written; first-match lookups
+        are wrapped in `(...)[1]` so evaluation stops at the first hit.
+        """
+        key = (path, first)
+        xpath = _XPATH_CACHE.get(key)
+        if xpath is None:
+            expression = f"({path})[1]" if first else path
+            xpath = LET.XPath(expression, namespaces=self.NS)
+            _XPATH_CACHE[key] = xpath
+        return xpath
+
     def _extract_metadata(self, root: ET.Element) -> Dict[str, Any]:
         """Extract document metadata."""
         metadata = {}
 
         # Document ID
-        id_elem = root.find('.//hl7:id', self.NS)
+        id_elem = self._find(root, './/hl7:id')
         if id_elem is not None:
             metadata['document_id'] = id_elem.get('root', '') + '.' + id_elem.get('extension', '')
 
         # Document title
-        title_elem = root.find('.//hl7:title', self.NS)
+        title_elem = self._find(root, './/hl7:title')
         if title_elem is not None:
             metadata['title'] = title_elem.text
 
         # Effective time
-        effective_time = root.find('.//hl7:effectiveTime', self.NS)
+        effective_time = self._find(root, './/hl7:effectiveTime')
         if effective_time is not None:
             time_value = effective_time.get('value')
             if time_value:
                 metadata['effective_time'] = self._parse_hl7_datetime(time_value)
 
         # Author
-        author_elem = root.find('.//hl7:author/hl7:assignedAuthor', self.NS)
+        author_elem = self._find(root, './/hl7:author/hl7:assignedAuthor')
         if author_elem is not None:
-            author_name_elem = author_elem.find('.//hl7:name', self.NS)
+            author_name_elem = self._find(author_elem, './/hl7:name')
             if author_name_elem is not None:
                 metadata['author'] = self._extract_name(author_name_elem)
 
         # Custodian (organization)
-        custodian_elem = root.find('.//hl7:custodian/hl7:assignedCustodian/hl7:representedCustodianOrganization', self.NS)
+        custodian_elem = self._find(root, './/hl7:custodian/hl7:assignedCustodian/hl7:representedCustodianOrganization')
         if custodian_elem is not None:
-            org_name = custodian_elem.find('.//hl7:name', self.NS)
+            org_name = self._find(custodian_elem, './/hl7:name')
             if org_name is not None:
                 metadata['organization'] = org_name.text
 
@@ -118,43 +289,43 @@ class CCDAIngestor(BaseIngestor):
 
     def _extract_patient_from_record_target(self, root: ET.Element) -> Optional[Dict]:
         """Extract patient information from recordTarget."""
-        record_target = root.find('.//hl7:recordTarget/hl7:patientRole', self.NS)
+        record_target = self._find(root, './/hl7:recordTarget/hl7:patientRole')
         if record_target is None:
             return None
 
         patient_data = {}
 
         # Patient ID
-        id_elem = record_target.find('.//hl7:id', self.NS)
+        id_elem = self._find(record_target, './/hl7:id')
         if id_elem is not None:
             patient_data['id'] = id_elem.get('extension', '')
 
         # Patient name
-        patient_elem = record_target.find('.//hl7:patient', self.NS)
+        patient_elem = self._find(record_target, './/hl7:patient')
         if patient_elem is not None:
-            name_elem = patient_elem.find('.//hl7:name', self.NS)
+            name_elem = self._find(patient_elem, './/hl7:name')
             if name_elem is not None:
                 patient_data['name'] = self._extract_name(name_elem)
 
             # Birth time
-            birth_elem = patient_elem.find('.//hl7:birthTime', self.NS)
+            birth_elem = self._find(patient_elem, './/hl7:birthTime')
             if birth_elem is not None:
                 birth_value = birth_elem.get('value')
                 if birth_value:
                     patient_data['birth_date'] = self._parse_hl7_date(birth_value)
 
             # Gender
-            gender_elem = patient_elem.find('.//hl7:administrativeGenderCode', self.NS)
+            gender_elem = self._find(patient_elem, './/hl7:administrativeGenderCode')
             if gender_elem is not None:
                 patient_data['gender'] = gender_elem.get('code')
 
         # Address
-        addr_elem = record_target.find('.//hl7:addr', self.NS)
+        addr_elem = self._find(record_target, './/hl7:addr')
         if addr_elem is not None:
             patient_data['address'] = self._extract_address(addr_elem)
 
         # Telecom
-        telecom_elems = record_target.findall('.//hl7:telecom', self.NS)
+        telecom_elems = self._findall(record_target, './/hl7:telecom')
         telecoms = []
         for tel in telecom_elems:
             telecoms.append({
@@ -166,320 +337,312 @@ class CCDAIngestor(BaseIngestor):
 
         return patient_data
 
-    def _extract_sections(self, root: ET.Element) -> Dict[str, List[ET.Element]]:
-        """Extract all structured body sections."""
-        sections = {}
-
-        component = root.find('.//hl7:component/hl7:structuredBody', self.NS)
-        if component is None:
-            return sections
-
-        section_mappings = {
-            '11450-4': 'problems',  # Problem List
-            '10160-0': 'medications',  # Medications
-            '48765-2': 'allergies',  # Allergies
-            '47519-4': 'procedures',  # Procedures
-            '30954-2': 'results',  # Results
-            '8716-3': 'vitals',  # Vital Signs
-            '46240-8': 'encounters',  # Encounters
-            '11369-6': 'immunizations',  # Immunizations
-        }
+    def _walk_body(
+        self,
+        root: ET.Element,
+        result: Dict[str, Any],
+        sections: Optional[Dict[str, List[ET.Element]]] = None
+    ) -> None:
+        """
+        Extract every structured body section in a single traversal.
 
-        for section in component.findall('.//hl7:section', self.NS):
-            code_elem = section.find('.//hl7:code', self.NS)
-            if code_elem is not None:
-                code = code_elem.get('code', '')
-                if code in section_mappings:
-                    section_name = section_mappings[code]
-                    if section_name not in sections:
-                        sections[section_name] = []
-                    sections[section_name].append(section)
-
-        return sections
-
-    def _extract_problems(self, sections: List[ET.Element]) -> List[Dict]:
-        """Extract problems/conditions from problem list sections."""
-        problems = []
-
-        for section in sections:
-            entries = section.findall('.//hl7:entry', self.NS)
-            for entry in entries:
-                obs = entry.find('.//hl7:observation', self.NS)
-                if obs is None:
-                    continue
-
-                problem = {}
-
-                # Problem name
-                value_elem = obs.find('.//hl7:value', self.NS)
-                if value_elem is not None:
-                    problem['name'] = value_elem.get('displayName', 'Unknown condition')
-                    problem['code'] = value_elem.get('code')
-                    problem['code_system'] = value_elem.get('codeSystem')
-
-                # Status
-                status_elem = obs.find('.//hl7:statusCode', self.NS)
-                if status_elem is not None:
-                    problem['status'] = status_elem.get('code')
-
-                # Effective time (onset)
-                effective_time = obs.find('.//hl7:effectiveTime/hl7:low', self.NS)
-                if effective_time is not None:
-                    time_value = effective_time.get('value')
-                    if time_value:
-                        problem['onset_date'] = self._parse_hl7_date(time_value)
-
-                problems.append(problem)
-
-        return problems
-
-    def _extract_medications_from_section(self, sections: List[ET.Element]) -> List[Dict]:
-        """Extract medications from medication sections."""
-        medications = []
-
-        for section in sections:
-            entries = section.findall('.//hl7:entry', self.NS)
-            for entry in entries:
-                subst_admin = entry.find('.//hl7:substanceAdministration', self.NS)
-                if subst_admin is None:
-                    continue
-
-                med = {}
-
-                # Medication name
-                material = subst_admin.find('.//hl7:manufacturedMaterial', self.NS)
-                if material is not None:
-                    code_elem = material.find('.//hl7:code', self.NS)
-                    if code_elem is not None:
-                        med['name'] = code_elem.get('displayName', 'Unknown medication')
-                        med['code'] = code_elem.get('code')
-
-                # Dosage
-                dose_elem = subst_admin.find('.//hl7:doseQuantity', self.NS)
-                if dose_elem is not None:
-                    med['dose'] = dose_elem.get('value')
-                    med['dose_unit'] = dose_elem.get('unit')
-
-                # Route
-                route_elem = subst_admin.find('.//hl7:routeCode', self.NS)
-                if route_elem is not None:
-                    med['route'] = route_elem.get('displayName')
-
-                # Frequency
-                freq_elem = subst_admin.find('.//hl7:effectiveTime[@operator="A"]', self.NS)
-                if freq_elem is not None:
-                    period = freq_elem.find('.//hl7:period', self.NS)
-                    if period is not None:
-                        med['frequency'] = f"Every {period.get('value')} {period.get('unit')}"
-
-                medications.append(med)
-
-        return medications
-
-    def _extract_allergies(self, sections: List[ET.Element]) -> List[Dict]:
-        """Extract allergies from allergy sections."""
-        allergies = []
-
-        for section in sections:
-            entries = section.findall('.//hl7:entry', self.NS)
-            for entry in entries:
-                obs = entry.find('.//hl7:observation', self.NS)
-                if obs is None:
-                    continue
-
-                allergy = {}
-
-                # Allergen
-                participant = obs.find('.//hl7:participant/hl7:participantRole', self.NS)
-                if participant is not None:
-                    code_elem = participant.find('.//hl7:code', self.NS)
-                    if code_elem is not None:
-                        allergy['allergen'] = code_elem.get('displayName', 'Unknown allergen')
-
-                # Reaction
-                reaction_obs = obs.find('.//hl7:entryRelationship/hl7:observation', self.NS)
-                if reaction_obs is not None:
-                    value_elem = reaction_obs.find('.//hl7:value', self.NS)
-                    if value_elem is not None:
-                        allergy['reaction'] = value_elem.get('displayName')
-
-                allergies.append(allergy)
-
-        return allergies
-
-    def _extract_procedures_from_section(self, sections: List[ET.Element]) -> List[Dict]:
-        """Extract procedures from procedure sections."""
-        procedures = []
-
-        for section in sections:
-            entries = section.findall('.//hl7:entry', self.NS)
-            for entry in entries:
-                procedure_elem = entry.find('.//hl7:procedure', self.NS)
-                if procedure_elem is None:
-                    continue
-
-                proc = {}
-
-                # Procedure name
-                code_elem = procedure_elem.find('.//hl7:code', self.NS)
-                if code_elem is not None:
-                    proc['name'] = code_elem.get('displayName', 'Unknown procedure')
-                    proc['code'] = code_elem.get('code')
-                    proc['code_system'] = code_elem.get('codeSystem')
+        Args:
+            root: ClinicalDocument root element
+            result: Result dictionary receiving extracted entries
+            sections: Optional dictionary collecting classified section elements
+        """
+        body = self._find(root, 'hl7:component/hl7:structuredBody')
+        if body is None:
+            return
+
+        for component in self._findall(body, 'hl7:component'):
+            for section in self._findall(component, 'hl7:section'):
+                self._walk_section(section, result, sections=sections)
+
+    def _walk_section(
+        self,
+        section: ET.Element,
+        result: Dict[str, Any],
+        parent_key: Optional[str] = None,
+        sections: Optional[Dict[str, List[ET.Element]]] = None
+    ) -> None:
+        """
+        Dispatch a section's entries to its entry handler, then recurse into subsections.
 
-                # Date
-                time_elem = procedure_elem.find('.//hl7:effectiveTime', self.NS)
-                if time_elem is not None:
-                    time_value = time_elem.get('value')
-                    if time_value:
-                        proc['date'] = self._parse_hl7_datetime(time_value)
+        Only direct children are visited, so each entry and each nested
+        section is handled exactly once. Subsections without a recognized
+        code or templateId inherit their parent's classification.
 
-                procedures.append(proc)
+        Args:
+            section: Section element
+            result: Result dictionary receiving extracted entries
+            parent_key: Classification of the enclosing section
+            sections: Optional dictionary collecting classified section elements
+        """
+        key = self._classify_section(section) or parent_key
+
+        if key:
+            if sections is not None:
+                sections.setdefault(key, []).append(section)
+            handler = getattr(self, self.ENTRY_HANDLERS[key])
+            for entry in self._findall(section, 'hl7:entry'):
+                result[key].extend(handler(entry))
+
+        for component in self._findall(section, 'hl7:component'):
+            for subsection in self._findall(component, 'hl7:section'):
+                self._walk_section(subsection, result, key, sections)
+
+    def _classify_section(self, section: ET.Element) -> Optional[str]:
+        """Map a section to its result key by LOINC code, falling back to templateId."""
+        code_elem = self._find(section, 'hl7:code')
+        if code_elem is not None:
+            key = self.SECTION_CODES.get(code_elem.get('code', ''))
+            if key:
+                return key
+
+        for template in self._findall(section, 'hl7:templateId'):
+            key = self.SECTION_TEMPLATES.get(template.get('root', ''))
+            if key:
+                return key
+
+        return None
+
+    def _extract_problem(self, entry: ET.Element) -> List[Dict]:
+        """Extract a problem/condition from a problem list entry."""
+        obs = self._find(entry, './/hl7:observation')
+        if obs is None:
+            return []
+
+        problem = {}
+
+        # Problem name
+        value_elem = self._find(obs, './/hl7:value')
+        if value_elem is not None:
+            problem['name'] = value_elem.get('displayName', 'Unknown condition')
+            problem['code'] = value_elem.get('code')
+            problem['code_system'] = value_elem.get('codeSystem')
+
+        # Status
+        status_elem = self._find(obs, './/hl7:statusCode')
+        if status_elem is not None:
+            problem['status'] = status_elem.get('code')
+
+        # Effective time (onset)
+        effective_time = self._find(obs, './/hl7:effectiveTime/hl7:low')
+        if effective_time is not None:
+            time_value = effective_time.get('value')
+            if time_value:
+                problem['onset_date'] = self._parse_hl7_date(time_value)
 
-        return procedures
+        return [problem]
 
-    def _extract_results(self, sections: List[ET.Element]) -> List[Dict]:
-        """Extract lab results from results sections."""
-        results = []
+    def _extract_medication(self, entry: ET.Element) -> List[Dict]:
+        """Extract a medication from a medication entry."""
+        subst_admin = self._find(entry, './/hl7:substanceAdministration')
+        if subst_admin is None:
+            return []
 
-        for section in sections:
-            organizers = section.findall('.//hl7:organizer', self.NS)
-            for organizer in organizers:
-                observations = organizer.findall('.//hl7:observation', self.NS)
-                for obs in observations:
-                    result = {}
-
-                    # Result name
-                    code_elem = obs.find('.//hl7:code', self.NS)
-                    if code_elem is not None:
-                        result['name'] = code_elem.get('displayName', 'Unknown test')
-                        result['code'] = code_elem.get('code')
-
-                    # Value
-                    value_elem = obs.find('.//hl7:value', self.NS)
-                    if value_elem is not None:
-                        result['value'] = value_elem.get('value')
-                        result['unit'] = value_elem.get('unit')
-
-                    # Reference range
-                    ref_range = obs.find('.//hl7:referenceRange/hl7:observationRange', self.NS)
-                    if ref_range is not None:
-                        low = ref_range.find('.//hl7:value/hl7:low', self.NS)
-                        high = ref_range.find('.//hl7:value/hl7:high', self.NS)
-                        if low is not None and high is not None:
-                            result['reference_range'] = f"{low.get('value')}-{high.get('value')}"
-
-                    # Date
-                    time_elem = obs.find('.//hl7:effectiveTime', self.NS)
-                    if time_elem is not None:
-                        time_value = time_elem.get('value')
-                        if time_value:
-                            result['date'] = self._parse_hl7_datetime(time_value)
-
-                    results.append(result)
+        med = {}
 
-        return results
+        # Medication name
+        material = self._find(subst_admin, './/hl7:manufacturedMaterial')
+        if material is not None:
+            code_elem = self._find(material, './/hl7:code')
+            if code_elem is not None:
+                med['name'] = code_elem.get('displayName', 'Unknown medication')
+                med['code'] = code_elem.get('code')
+
+        # Dosage
+        dose_elem = self._find(subst_admin, './/hl7:doseQuantity')
+        if dose_elem is not None:
+            med['dose'] = dose_elem.get('value')
+            med['dose_unit'] = dose_elem.get('unit')
+
+        # Route
+        route_elem = self._find(subst_admin, './/hl7:routeCode')
+        if route_elem is not None:
+            med['route'] = route_elem.get('displayName')
+
+        # Frequency
+        freq_elem = self._find(subst_admin, './/hl7:effectiveTime[@operator="A"]')
+        if freq_elem is not None:
+            period = self._find(freq_elem, './/hl7:period')
+            if period is not None:
+                med['frequency'] = f"Every {period.get('value')} {period.get('unit')}"
+
+        return [med]
+
+    def _extract_allergy(self, entry: ET.Element) -> List[Dict]:
+        """Extract an allergy from an allergy entry."""
+        obs = self._find(entry, './/hl7:observation')
+        if obs is None:
+            return []
+
+        allergy = {}
+
+        # Allergen
+        participant = self._find(obs, './/hl7:participant/hl7:participantRole')
+        if participant is not None:
+            code_elem = self._find(participant, './/hl7:code')
+            if code_elem is not None:
+                allergy['allergen'] = code_elem.get('displayName', 'Unknown allergen')
+
+        # Reaction
+        reaction_obs = self._find(obs, './/hl7:entryRelationship/hl7:observation')
+        if reaction_obs is not None:
+            value_elem = self._find(reaction_obs, './/hl7:value')
+            if value_elem is not None:
+                allergy['reaction'] = value_elem.get('displayName')
+
+        return [allergy]
+
+    def _extract_procedure(self, entry: ET.Element) -> List[Dict]:
+        """Extract a procedure from a procedure entry."""
+        procedure_elem = self._find(entry, './/hl7:procedure')
+        if procedure_elem is None:
+            return []
+
+        proc = {}
+
+        # Procedure name
+        code_elem = self._find(procedure_elem, './/hl7:code')
+        if code_elem is not None:
+            proc['name'] = code_elem.get('displayName', 'Unknown procedure')
+            proc['code'] = code_elem.get('code')
+            proc['code_system'] = code_elem.get('codeSystem')
+
+        # Date
+        time_elem = self._find(procedure_elem, './/hl7:effectiveTime')
+        if time_elem is not None:
+            time_value = time_elem.get('value')
+            if time_value:
+                proc['date'] = self._parse_hl7_datetime(time_value)
 
-    def _extract_vitals(self, sections: List[ET.Element]) -> List[Dict]:
-        """Extract vital signs from vitals sections."""
-        vitals = []
+        return [proc]
+
+    def _extract_result_entry(self, entry: ET.Element) -> List[Dict]:
+        """Extract lab results from a result organizer entry."""
+        results = []
 
-        for section in sections:
-            observations = section.findall('.//hl7:observation', self.NS)
-            for obs in observations:
-                vital = {}
+        for organizer in self._findall(entry, './/hl7:organizer'):
+            for obs in self._findall(organizer, './/hl7:observation'):
+                result = {}
 
-                # Vital name
-                code_elem = obs.find('.//hl7:code', self.NS)
+                # Result name
+                code_elem = self._find(obs, './/hl7:code')
                 if code_elem is not None:
-                    vital['name'] = code_elem.get('displayName', 'Unknown vital')
+                    result['name'] = code_elem.get('displayName', 'Unknown test')
+                    result['code'] = code_elem.get('code')
 
                 # Value
-                value_elem = obs.find('.//hl7:value', self.NS)
+                value_elem = self._find(obs, './/hl7:value')
                 if value_elem is not None:
-                    vital['value'] = value_elem.get('value')
-                    vital['unit'] = value_elem.get('unit')
+                    result['value'] = value_elem.get('value')
+                    result['unit'] = value_elem.get('unit')
+
+                # Reference range
+                ref_range = self._find(obs, './/hl7:referenceRange/hl7:observationRange')
+                if ref_range is not None:
+                    low = self._find(ref_range, './/hl7:value/hl7:low')
+                    high = self._find(ref_range, './/hl7:value/hl7:high')
+                    if low is not None and high is not None:
+                        result['reference_range'] = f"{low.get('value')}-{high.get('value')}"
 
                 # Date
-                time_elem = obs.find('.//hl7:effectiveTime', self.NS)
+                time_elem = self._find(obs, './/hl7:effectiveTime')
                 if time_elem is not None:
                     time_value = time_elem.get('value')
                     if time_value:
-                        vital['date'] = self._parse_hl7_datetime(time_value)
-
-                vitals.append(vital)
-
-        return vitals
-
-    def _extract_encounters_from_section(self, sections: List[ET.Element]) -> List[Dict]:
-        """Extract encounters from encounter sections."""
-        encounters = []
-
-        for section in sections:
-            entries = section.findall('.//hl7:entry', self.NS)
-            for entry in entries:
-                enc_elem = entry.find('.//hl7:encounter', self.NS)
-                if enc_elem is None:
-                    continue
+                        result['date'] = self._parse_hl7_datetime(time_value)
 
-                encounter = {}
+                results.append(result)
 
-                # Encounter type
-                code_elem = enc_elem.find('.//hl7:code', self.NS)
-                if code_elem is not None:
-                    encounter['type'] = code_elem.get('displayName', 'Unknown encounter')
+        return results
 
-                # Date
-                time_elem = enc_elem.find('.//hl7:effectiveTime', self.NS)
-                if time_elem is not None:
-                    low = time_elem.find('.//hl7:low', self.NS)
-                    if low is not None:
-                        time_value = low.get('value')
-                        if time_value:
-                            encounter['date'] = self._parse_hl7_datetime(time_value)
+    def _extract_vital(self, entry: ET.Element) -> List[Dict]:
+        """Extract vital signs from a vitals entry."""
+        vitals = []
 
-                encounters.append(encounter)
+        for obs in self._findall(entry, './/hl7:observation'):
+            vital = {}
 
-        return encounters
+            # Vital name
+            code_elem = self._find(obs, './/hl7:code')
+            if code_elem is not None:
+                vital['name'] = code_elem.get('displayName', 'Unknown vital')
 
-    def _extract_immunizations(self, sections: List[ET.Element]) -> List[Dict]:
-        """Extract immunizations from immunization sections."""
-        immunizations = []
+            # Value
+            value_elem = self._find(obs, './/hl7:value')
+            if value_elem is not None:
+                vital['value'] = value_elem.get('value')
+                vital['unit'] = value_elem.get('unit')
 
-        for section in sections:
-            entries = section.findall('.//hl7:entry', self.NS)
-            for entry in entries:
-                subst_admin = entry.find('.//hl7:substanceAdministration', self.NS)
-                if subst_admin is None:
-                    continue
+            # Date
+            time_elem = self._find(obs, './/hl7:effectiveTime')
+            if time_elem is not None:
+                time_value = time_elem.get('value')
+                if time_value:
+                    vital['date'] = self._parse_hl7_datetime(time_value)
 
-                immunization = {}
+            vitals.append(vital)
 
-                # Vaccine name
-                material = subst_admin.find('.//hl7:manufacturedMaterial', self.NS)
-                if material is not None:
-                    code_elem = material.find('.//hl7:code', self.NS)
-                    if code_elem is not None:
-                        immunization['vaccine'] = code_elem.get('displayName', 'Unknown vaccine')
+        return vitals
 
-                # Date
-                time_elem = subst_admin.find('.//hl7:effectiveTime', self.NS)
-                if time_elem is not None:
-                    time_value = time_elem.get('value')
-                    if time_value:
-                        immunization['date'] = self._parse_hl7_datetime(time_value)
+    def _extract_encounter(self, entry: ET.Element) -> List[Dict]:
+        """Extract an encounter from an encounter entry."""
+        enc_elem = self._find(entry, './/hl7:encounter')
+        if enc_elem is None:
+            return []
+
+        encounter = {}
+
+        # Encounter type
+        code_elem = self._find(enc_elem, './/hl7:code')
+        if code_elem is not None:
+            encounter['type'] = code_elem.get('displayName', 'Unknown encounter')
+
+        # Date
+        time_elem = self._find(enc_elem, './/hl7:effectiveTime')
+        if time_elem is not None:
+            low = self._find(time_elem, './/hl7:low')
+            if low is not None:
+                time_value = low.get('value')
+                if time_value:
+                    encounter['date'] = self._parse_hl7_datetime(time_value)
+
+        return [encounter]
+
+    def _extract_immunization(self, entry: ET.Element) -> List[Dict]:
+        """Extract an immunization from an immunization entry."""
+        subst_admin = self._find(entry, './/hl7:substanceAdministration')
+        if subst_admin is None:
+            return []
+
+        immunization = {}
+
+        # Vaccine name
+        material = self._find(subst_admin, './/hl7:manufacturedMaterial')
+        if material is not None:
+            code_elem = self._find(material, './/hl7:code')
+            if code_elem is not None:
+                immunization['vaccine'] = code_elem.get('displayName', 'Unknown vaccine')
 
-                immunizations.append(immunization)
+        # Date
+        time_elem = self._find(subst_admin, './/hl7:effectiveTime')
+        if time_elem is not None:
+            time_value = time_elem.get('value')
+            if time_value:
+                immunization['date'] = self._parse_hl7_datetime(time_value)
 
-        return immunizations
+        return [immunization]
 
     def _extract_name(self, name_elem: ET.Element) -> str:
         """Extract full name from HL7 name element."""
         parts = []
-        for given in name_elem.findall('.//hl7:given', self.NS):
+        for given in self._findall(name_elem, './/hl7:given'):
             if given.text:
                 parts.append(given.text)
-        family = name_elem.find('.//hl7:family', self.NS)
+        family = self._find(name_elem, './/hl7:family')
         if family is not None and family.text:
             parts.append(family.text)
         return ' '.join(parts) if parts else 'Unknown'
@@ -487,38 +650,32 @@ class CCDAIngestor(BaseIngestor):
     def _extract_address(self, addr_elem: ET.Element) -> Dict[str, str]:
         """Extract address from HL7 addr element."""
         address = {}
-        street_lines = addr_elem.findall('.//hl7:streetAddressLine', self.NS)
+        street_lines = self._findall(addr_elem, './/hl7:streetAddressLine')
         if street_lines:
             address['street'] = ' '.join([s.text for s in street_lines if s.text])
 
-        city = addr_elem.find('.//hl7:city', self.NS)
+        city = self._find(addr_elem, './/hl7:city')
         if city is not None:
             address['city'] = city.text
 
-        state = addr_elem.find('.//hl7:state', self.NS)
+        state = self._find(addr_elem, './/hl7:state')
         if state is not None:
             address['state'] = state.text
 
-        postal = addr_elem.find('.//hl7:postalCode', self.NS)
+        postal = self._find(addr_elem, './/hl7:postalCode')
         if postal is not None:
             address['postal_code'] = postal.text
 
         return address
 
     def _parse_hl7_datetime(self, hl7_time: str) -> Optional[datetime]:
-        """Parse HL7 datetime format (YYYYMMDDHHmmss+/-ZZZZ)."""
-        try:
-            # Remove timezone for simplicity
-            clean_time = hl7_time[:14]  # YYYYMMDDHHmmss
-            return datetime.strptime(clean_time, '%Y%m%d%H%M%S')
-        except (ValueError, IndexError):
-            return None
+        """Parse HL7 datetime format (YYYYMMDDHHmmss+/-ZZZZ) to naive UTC."""
+        return normalize_datetime(hl7_time)
 
     def _parse_hl7_date(self, hl7_date: str) -> Optional[str]:
         """Parse HL7 date format (YYYYMMDD) to ISO format."""
-        try:
-            clean_date = hl7_date[:8]  # YYYYMMDD
-            dt = datetime.strptime(clean_date, '%Y%m%d')
-            return dt.date().isoformat()
-        except (ValueError, IndexError):
+        if not hl7_date:
             return None
+        # The calendar date as recorded, without applying the offset
+        parsed = normalize_date(hl7_date[:8])
+        return parsed.isoformat() if parsed else None
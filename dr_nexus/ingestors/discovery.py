@@ -0,0 +1,336 @@
+"""Single-pass discovery of medical files with a reusable directory manifest."""
+
+import fnmatch
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from dr_nexus.ingestors.format_detection import detect_format
+from dr_nexus.models.document import DocumentType
+from dr_nexus.utils import json_codec
+
+
+logger = logging.getLogger(__name__)
+
+# File categories reported by discovery, in the order the build processes them
+CATEGORIES = ('fhir', 'ccda', 'ndjson', 'pdf', 'images')
+
+# Names skipped by default: hidden files and folders, Office lock files, partial downloads
+DEFAULT_IGNORE_PATTERNS = ('.*', '~$*', '__pycache__', '*.tmp', '*.part', '*.crdownload')
+
+# Directories modified this recently are listed again on the next scan, since a
+# file added within the same timestamp tick would not change their mtime
+RACY_WINDOW_NS = 2 * 10**9
+
+# XML files at or below this size are stubs rather than C-CDA documents
+MIN_CCDA_BYTES = 1000
+
+_DETECTED_CATEGORIES = {
+    DocumentType.FHIR_BUNDLE: 'fhir',
+    DocumentType.CCDA: 'ccda',
+    DocumentType.NDJSON: 'ndjson',
+    DocumentType.PDF: 'pdf',
+    DocumentType.IMAGE: 'images',
+}
+
+
+class DiscoveredFile(NamedTuple):
+    """A file found during discovery."""
+    path: Path
+    size: int
+    mtime_ns: int
+    category: Optional[str]
+
+
+class ScanChanges(NamedTuple):
+    """Files added, changed or removed since the previous scan."""
+    added: List[Path]
+    changed: List[Path]
+    removed: List[Path]
+
+
+def classify_file(path: Path, size: int) -> Optional[str]:
+    """
+    Classify a file into a discovery category.
+
+    Extensions that name one format decide directly. JSON files (`.json` or
+    `.ndjson`, which are easily swapped) and files with any other extension
+    are classified by sniffing their header; when that is inconclusive, a
+    `*FHIR*.json` name still marks a FHIR file and `.ndjson` an NDJSON one.
+
+    Args:
+        path: File path
+        size: File size in bytes
+
+    Returns:
+        Category name, or None if the file is not a medical document
+    """
+    suffix = path.suffix.lower()
+
+    if suffix == '.xml':
+        return 'ccda' if size > MIN_CCDA_BYTES else None
+    if suffix == '.pdf':
+        return 'pdf'
+    if suffix == '.jpg':
+        return 'images'
+
+    category = _DETECTED_CATEGORIES.get(detect_format(path)) if size else None
+    if category is not None:
+        return category
+    if fnmatch.fnmatch(path.name, '*FHIR*.json'):
+        return 'fhir'
+    if suffix == '.ndjson':
+        return 'ndjson'
+    return None
+
+
+# Budgeted builds process structured data before narrative documents
+_RANK_PRIORITY = {'fhir': 0, 'ndjson': 0, 'ccda': 1}
+
+_DAY_NS = 86400 * 10**9
+
+
+def rank_documents(files: Iterable[DiscoveredFile]) -> List[DiscoveredFile]:
+    """
+    Order ingestible documents by their expected value to the knowledge base.
+
+    Most recently modified documents come first, by calendar day. Within a
+    day, structured FHIR data comes before C-CDA, and larger documents (more
+    clinical content) before smaller ones.
+
+    Args:
+        files: Discovered files
+
+    Returns:
+        FHIR, NDJSON and C-CDA files in processing order
+    """
+    ranked = [f for f in files if f.category in _RANK_PRIORITY]
+    ranked.sort(key=lambda f: (
+        -(f.mtime_ns // _DAY_NS),
+        _RANK_PRIORITY[f.category],
+        -f.size,
+        f.path,
+    ))
+    return ranked
+
+
+class FileDiscovery:
+    """
+    Walk a data directory once, classifying files and recording their stat data.
+
+    A manifest of every directory (its mtime and the files and subdirectories
+    it contained) is written after each scan. On the next scan, a directory
+    whose mtime is unchanged is not listed again: its recorded entries are
+    reused, and only its subdirectories are visited. Adding, removing or
+    renaming a file changes its directory's mtime, so such changes are always
+    found; directories modified within RACY_WINDOW_NS of being listed are
+    listed again, since mtimes are too coarse to order them. A file rewritten
+    in place keeps its directory's mtime; pass `full=True` to `scan` to
+    re-list every directory.
+    """
+
+    MANIFEST_VERSION = 2
+
+    def __init__(
+        self,
+        ignore_patterns: Optional[Iterable[str]] = None,
+        manifest_path: Optional[Path] = None
+    ) -> None:
+        """
+        Initialize discovery.
+
+        Args:
+            ignore_patterns: Glob patterns matched against each entry's name and
+                its path relative to the scan root (defaults to DEFAULT_IGNORE_PATTERNS)
+            manifest_path: Where the manifest is read from and written to
+                (None disables the manifest)
+        """
+        patterns = DEFAULT_IGNORE_PATTERNS if ignore_patterns is None else ignore_patterns
+        self.ignore_patterns = tuple(patterns)
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.changes = ScanChanges([], [], [])
+        self.directories_listed = 0
+        self.directories_reused = 0
+
+    def scan(self, root: Path, full: bool = False) -> List[DiscoveredFile]:
+        """
+        Discover every file under `root`.
+
+        Args:
+            root: Directory to scan
+            full: List every directory, using the manifest only to report changes
+
+        Returns:
+            Discovered files, sorted by path
+        """
+        root = Path(root)
+        previous = self._load_manifest(root)
+        directories: Dict[str, Dict[str, Any]] = {}
+        added: List[Path] = []
+        changed: List[Path] = []
+        removed: List[Path] = []
+        self.directories_listed = 0
+        self.directories_reused = 0
+
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError as e:
+                logger.warning(f"Cannot access {directory}: {e}")
+                continue
+
+            key = str(directory)
+            entry = previous.get(key)
+            if not full and entry is not None and entry['mtime_ns'] == mtime_ns and entry.get('stable', True):
+                self.directories_reused += 1
+            else:
+                new_entry = self._list_directory(directory, root, mtime_ns)
+                self.directories_listed += 1
+                self._diff(directory, entry, new_entry, added, changed, removed)
+                entry = new_entry
+
+            directories[key] = entry
+            pending.extend(directory / name for name in reversed(entry['subdirs']))
+
+        # Directories that disappeared take all their recorded files with them
+        for key, entry in previous.items():
+            if key not in directories:
+                removed.extend(Path(key) / name for name, *_ in entry['files'])
+
+        self.changes = ScanChanges(sorted(added), sorted(changed), sorted(removed))
+        self._save_manifest(root, directories)
+
+        logger.info(
+            f"Discovery listed {self.directories_listed} directories, "
+            f"reused {self.directories_reused} from manifest "
+            f"({len(added)} added, {len(changed)} changed, {len(removed)} removed)"
+        )
+
+        files = [
+            DiscoveredFile(Path(key) / name, size, file_mtime_ns, category)
+            for key, entry in directories.items()
+            for name, size, file_mtime_ns, category in entry['files']
+        ]
+        files.sort(key=lambda f: f.path)
+        return files
+
+    @staticmethod
+    def group(files: Iterable[DiscoveredFile]) -> Dict[str, List[Path]]:
+        """
+        Group discovered files by category.
+
+        Args:
+            files: Output of `scan`
+
+        Returns:
+            Dictionary mapping each category in CATEGORIES to its file paths
+        """
+        grouped: Dict[str, List[Path]] = {category: [] for category in CATEGORIES}
+        for f in files:
+            if f.category in grouped:
+                grouped[f.category].append(f.path)
+        return grouped
+
+    def is_ignored(self, name: str, relative_path: str) -> bool:
+        """Check an entry's name and root-relative path against the ignore patterns."""
+        return any(
+            fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative_path, pattern)
+            for pattern in self.ignore_patterns
+        )
+
+    def _list_directory(self, directory: Path, root: Path, mtime_ns: int) -> Dict[str, Any]:
+        """List one directory, classifying its files from a single stat each."""
+        files: List[Tuple[str, int, int, Optional[str]]] = []
+        subdirs: List[str] = []
+
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    relative = Path(entry.path).relative_to(root).as_posix()
+                    if self.is_ignored(entry.name, relative):
+                        continue
+                    try:
+                        # Symlinked directories are not followed, matching Path.rglob
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            category = classify_file(Path(entry.path), stat.st_size)
+                            files.append((entry.name, stat.st_size, stat.st_mtime_ns, category))
+                    except OSError as e:
+                        logger.warning(f"Cannot access {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Cannot list {directory}: {e}")
+
+        files.sort()
+        subdirs.sort()
+        stable = time.time_ns() - mtime_ns >= RACY_WINDOW_NS
+        return {'mtime_ns': mtime_ns, 'stable': stable, 'files': files, 'subdirs': subdirs}
+
+    @staticmethod
+    def _diff(
+        directory: Path,
+        old: Optional[Dict[str, Any]],
+        new: Dict[str, Any],
+        added: List[Path],
+        changed: List[Path],
+        removed: List[Path]
+    ) -> None:
+        """Record file-level differences between two listings of a directory."""
+        old_files = {name: (size, mtime_ns) for name, size, mtime_ns, _ in (old or {}).get('files', [])}
+        new_names = set()
+
+        for name, size, mtime_ns, _ in new['files']:
+            new_names.add(name)
+            if name not in old_files:
+                added.append(directory / name)
+            elif old_files[name] != (size, mtime_ns):
+                changed.append(directory / name)
+
+        removed.extend(directory / name for name in old_files if name not in new_names)
+
+    def _load_manifest(self, root: Path) -> Dict[str, Dict[str, Any]]:
+        """Load the previous scan's directories if the manifest matches this scan."""
+        if self.manifest_path is None or not self.manifest_path.exists():
+            return {}
+
+        try:
+            manifest = json_codec.load_file(self.manifest_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable file manifest {self.manifest_path}: {e}")
+            return {}
+
+        if (
+            manifest.get('version') != self.MANIFEST_VERSION
+            or manifest.get('root') != str(root)
+            or manifest.get('ignore_patterns') != list(self.ignore_patterns)
+        ):
+            return {}
+        return manifest.get('directories', {})
+
+    def _save_manifest(self, root: Path, directories: Dict[str, Dict[str, Any]]) -> None:
+        """Write the manifest atomically."""
+        if self.manifest_path is None:
+            return
+
+        manifest = {
+            'version': self.MANIFEST_VERSION,
+            'root': str(root),
+            'ignore_patterns': list(self.ignore_patterns),
+            'directories': directories,
+        }
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.manifest_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json_codec.dumps(manifest))
+            os.replace(tmp_name, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Failed to write file manifest {self.manifest_path}: {e}")
+            Path(tmp_name).unlink(missing_ok=True)
@@ -1,31 +1,234 @@
 """FHIR Bundle ingestor."""
 
-import json
+from itertools import count
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 from dr_nexus.ingestors.base import BaseIngestor
+from dr_nexus.ingestors.fhir_paths import (
+    ExtractionPlan,
+    PathField,
+    parse_fhir_date,
+    parse_fhir_datetime,
+)
+from dr_nexus.ingestors.fhir_references import ReferenceIndex
+from dr_nexus.ingestors.format_detection import detect_format
+from dr_nexus.ingestors.seen_index import SeenResourceIndex, resource_key
+from dr_nexus.ingestors.source_refs import make_source_ref
+from dr_nexus.ingestors.json_stream import iter_top_level
 from dr_nexus.models.patient import PatientDemographics, ContactInfo, Gender
-from dr_nexus.models.condition import Condition, ConditionStatus, ImplantedDevice
+from dr_nexus.models.condition import Allergy, Condition, ConditionStatus, ImplantedDevice
 from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
 from dr_nexus.models.document import DocumentType
+from dr_nexus.utils import json_codec
+from dr_nexus.utils.temporal import utc_now
+
+
+class ResourcePlan(NamedTuple):
+    """
+    How one FHIR resource type is extracted.
+
+    Attributes:
+        key: Result key the extracted values are appended to
+        plan: Compiled field mapping
+        builder: Name of the FHIRIngestor method that turns the extracted
+            fields into the stored value (None stores the fields dictionary)
+        raw_key: Key the source resource is kept under, in the fields
+            dictionary or, for built timeline events, in their details
+            (None drops it). Lean ingestors keep a source reference under
+            'source_ref' instead.
+    """
+    key: str
+    plan: ExtractionPlan
+    builder: Optional[str] = None
+    raw_key: Optional[str] = None
+
+
+# Condition clinicalStatus codes that are not active
+CONDITION_STATUSES = {
+    'resolved': ConditionStatus.RESOLVED,
+    'inactive': ConditionStatus.RESOLVED,
+}
 
 
 class FHIRIngestor(BaseIngestor):
     """Ingest FHIR R4 Bundle documents."""
 
-    def can_ingest(self, filepath: Path) -> bool:
-        """Check if file is a FHIR Bundle JSON."""
-        if filepath.suffix.lower() != '.json':
-            return False
+    VERSION = "4"
+
+    # Declarative extraction per resource type. Paths are compiled once,
+    # here, and each plan is applied to all resources of its type together.
+    RESOURCE_PLANS: Dict[str, ResourcePlan] = {
+        'Patient': ResourcePlan('patient', ExtractionPlan({
+            'patient_id': PathField('id', 'unknown'),
+            'given': PathField('name[0].given', many=True),
+            'family': PathField('name[0].family', ''),
+            'date_of_birth': PathField('birthDate', convert=parse_fhir_date),
+            'birth_date_text': PathField('birthDate'),
+            'gender': PathField('gender', 'unknown'),
+            'phone': PathField("telecom.where(system = 'phone').value"),
+            'email': PathField("telecom.where(system = 'email').value"),
+            'address_line1': PathField('address[0].line[0]'),
+            'address_line2': PathField('address[0].line[1]'),
+            'city': PathField('address[0].city'),
+            'state': PathField('address[0].state'),
+            'zip_code': PathField('address[0].postalCode'),
+            'country': PathField('address[0].country', 'USA'),
+            'mrn': PathField("identifier.where(system ~ 'medical-record-number').value"),
+        }), '_build_patient'),
+        'Condition': ResourcePlan('conditions', ExtractionPlan({
+            'name': PathField('code.text', 'Unknown condition'),
+            'icd10_code': PathField("code.coding.where(system ~ 'icd-10').code"),
+            'snomed_code': PathField("code.coding.where(system ~ 'snomed').code"),
+            'clinical_status': PathField('clinicalStatus.coding[0].code'),
+            'verification_status': PathField('verificationStatus.coding[0].code'),
+            'onset_date': PathField('onsetDateTime', convert=parse_fhir_date),
+        }), '_build_condition'),
+        'Device': ResourcePlan('devices', ExtractionPlan({
+            'device_name': PathField('deviceName[0].name', 'Unknown device'),
+            'device_type': PathField('type.text', 'Unknown type'),
+            'udi': PathField('udiCarrier[0].deviceIdentifier'),
+            'manufacturer': PathField('manufacturer'),
+            'lot_number': PathField('lotNumber'),
+        }), '_build_device'),
+        'Procedure': ResourcePlan('procedures', ExtractionPlan({
+            'summary': PathField('code.text', 'Unknown procedure'),
+            'provider': PathField('performer.actor.display'),
+            'location': PathField('location.display'),
+            'date': PathField('performedDateTime | performedPeriod.start', convert=parse_fhir_datetime),
+            'cpt': PathField("code.coding.where(system ~ 'cpt').code"),
+            'snomed': PathField("code.coding.where(system ~ 'snomed').code"),
+        }), '_build_procedure', 'procedure_resource'),
+        'MedicationRequest': ResourcePlan('medications', ExtractionPlan({
+            'medication': PathField('medicationCodeableConcept.text', 'Unknown medication'),
+            'dosage': PathField('dosageInstruction[0].text', ''),
+            'status': PathField('status'),
+            'intent': PathField('intent'),
+            'authored_on': PathField('authoredOn', convert=parse_fhir_datetime),
+        }), raw_key='raw'),
+        'MedicationStatement': ResourcePlan('medication_statements', ExtractionPlan({
+            'medication': PathField(
+                'medicationCodeableConcept.text | medicationCodeableConcept.coding[0].display',
+                'Unknown medication'
+            ),
+            'dosage': PathField('dosage[0].text', ''),
+            'status': PathField('status'),
+            'effective': PathField(
+                'effectiveDateTime | effectivePeriod.start', convert=parse_fhir_datetime
+            ),
+            'date_asserted': PathField('dateAsserted', convert=parse_fhir_datetime),
+        }), raw_key='raw'),
+        'Observation': ResourcePlan('observations', ExtractionPlan({
+            'name': PathField('code.text', 'Unknown observation'),
+            'value': PathField('valueQuantity.value'),
+            'unit': PathField('valueQuantity.unit'),
+            'date': PathField('effectiveDateTime', convert=parse_fhir_datetime),
+            'status': PathField('status'),
+            'category': PathField('category[0].coding[0].code'),
+            'performer': PathField('performer.display'),
+        }), raw_key='raw'),
+        'Encounter': ResourcePlan('encounters', ExtractionPlan({
+            'summary': PathField('type[0].text', 'Unknown encounter'),
+            'provider': PathField('participant.individual.display'),
+            'location': PathField('location.location.display | serviceProvider.display'),
+            'date': PathField('period.start', convert=parse_fhir_datetime),
+        }), '_build_encounter', 'encounter_resource'),
+        'AllergyIntolerance': ResourcePlan('allergies', ExtractionPlan({
+            'allergen': PathField('code.text | code.coding[0].display', 'Unknown allergen'),
+            'reaction': PathField(
+                'reaction[0].manifestation[0].text | reaction[0].manifestation[0].coding[0].display'
+            ),
+            'severity': PathField('reaction[0].severity | criticality'),
+            'onset_date': PathField('onsetDateTime | recordedDate', convert=parse_fhir_date),
+            'status': PathField('clinicalStatus.coding[0].code', 'active'),
+            'notes': PathField('note[0].text'),
+        }), '_build_allergy'),
+        'Immunization': ResourcePlan('immunizations', ExtractionPlan({
+            'vaccine': PathField('vaccineCode.text | vaccineCode.coding[0].display', 'Unknown vaccine'),
+            'cvx_code': PathField("vaccineCode.coding.where(system ~ 'cvx').code"),
+            'date': PathField('occurrenceDateTime', convert=parse_fhir_datetime),
+            'status': PathField('status'),
+            'lot_number': PathField('lotNumber'),
+        }), raw_key='raw'),
+        'DiagnosticReport': ResourcePlan('diagnostic_reports', ExtractionPlan({
+            'name': PathField('code.text | code.coding[0].display', 'Unknown report'),
+            'loinc_code': PathField("code.coding.where(system ~ 'loinc').code"),
+            'category': PathField('category[0].coding[0].code'),
+            'status': PathField('status'),
+            'date': PathField('effectiveDateTime | effectivePeriod.start', convert=parse_fhir_datetime),
+            'issued': PathField('issued', convert=parse_fhir_datetime),
+            'conclusion': PathField('conclusion'),
+            'results': PathField('result.reference', many=True),
+        }), raw_key='raw'),
+    }
+
+    # Resource types passed through unchanged
+    RAW_RESOURCE_KEYS = {
+        'DocumentReference': 'document_references',
+        'Organization': 'organizations',
+        'Practitioner': 'practitioners',
+        'Location': 'locations',
+        'CareTeam': 'care_teams',
+    }
+
+    # Resource types a SeenResourceIndex may skip. The patient and referenced
+    # resources are always kept: they are cheap and every document needs them.
+    SKIPPABLE_TYPES = frozenset(RESOURCE_PLANS) - {'Patient'}
+
+    # Resource types other resources refer to by reference
+    REFERENCE_TARGETS = ('Practitioner', 'Organization', 'Location')
+
+    # References resolved once the whole bundle has been read, since a
+    # reference may point at a resource later in the bundle. Until then the
+    # reference's own display text (if any) is used. Plans map the attribute
+    # (or key) a resolved name is stored in to the reference element.
+    REFERENCE_PLANS: Dict[str, ExtractionPlan] = {
+        'Encounter': ExtractionPlan({
+            'provider': PathField('participant.individual'),
+            'location': PathField('location.location | serviceProvider'),
+        }),
+        'Procedure': ExtractionPlan({
+            'provider': PathField('performer.actor'),
+            'location': PathField('location'),
+        }),
+        'Observation': ExtractionPlan({
+            'performer': PathField('performer'),
+        }),
+    }
+
+    # Where lean ingestors park reference elements until they are resolved
+    PENDING_REFERENCES_KEY = '_references'
+
+    def __init__(
+        self,
+        streaming: bool = False,
+        stream_threshold_bytes: Optional[int] = None,
+        seen_index: Optional[SeenResourceIndex] = None,
+        lean: bool = False
+    ) -> None:
+        """
+        Initialize the FHIR ingestor.
 
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('resourceType') == 'Bundle'
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            return False
+        Args:
+            streaming: Always walk bundle entries incrementally instead of
+                loading the whole bundle into memory
+            stream_threshold_bytes: Stream bundles at or above this size even
+                when `streaming` is False
+            seen_index: Skip resource versions already in this index; versions
+                found in a successfully ingested document are staged in it
+            lean: Keep a source reference (see `source_refs.fetch_resource`)
+                instead of each full FHIR resource
+        """
+        super().__init__()
+        self.streaming = streaming
+        self.stream_threshold_bytes = stream_threshold_bytes
+        self.seen_index = seen_index
+        self.lean = lean
+        self.skipped_resources = 0
+
+    def can_ingest(self, filepath: Path) -> bool:
+        """Check if file is a FHIR Bundle JSON (sniffs the header only)."""
+        return detect_format(filepath) == DocumentType.FHIR_BUNDLE
 
     def ingest(self, filepath: Path) -> Dict[str, Any]:
         """
@@ -40,325 +243,329 @@ class FHIRIngestor(BaseIngestor):
         self.validate_file_exists(filepath)
         self.validate_file_readable(filepath)
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            bundle = json.load(f)
+        if self._should_stream(filepath):
+            return self._ingest_streaming(filepath)
+
+        bundle = json_codec.load_file(filepath)
 
         if bundle.get('resourceType') != 'Bundle':
             raise ValueError(f"Not a FHIR Bundle: {filepath}")
 
         self.logger.info(f"Processing FHIR Bundle: {filepath.name}")
 
-        # Extract all resources
-        entries = bundle.get('entry', [])
-        resources_by_type: Dict[str, List[Dict]] = {}
+        result = self._new_result(filepath)
+        counts: Dict[str, int] = {}
+        references = ReferenceIndex(self.REFERENCE_TARGETS)
+        seen_keys: Set[str] = set()
+        self.skipped_resources = 0
 
+        entries = bundle.get('entry', [])
         for entry in entries:
-            resource = entry.get('resource', {})
-            resource_type = resource.get('resourceType')
-            if resource_type:
-                if resource_type not in resources_by_type:
-                    resources_by_type[resource_type] = []
-                resources_by_type[resource_type].append(resource)
-
-        self.logger.info(f"Found {len(entries)} resources in bundle")
-        for rtype, resources in resources_by_type.items():
-            self.logger.info(f"  {rtype}: {len(resources)}")
-
-        # Extract structured data
-        result = {
-            'source_file': str(filepath),
-            'patient': self._extract_patient(resources_by_type.get('Patient', [])),
-            'conditions': self._extract_conditions(resources_by_type.get('Condition', [])),
-            'devices': self._extract_devices(resources_by_type.get('Device', [])),
-            'procedures': self._extract_procedures(resources_by_type.get('Procedure', [])),
-            'medications': self._extract_medications(resources_by_type.get('MedicationRequest', [])),
-            'observations': self._extract_observations(resources_by_type.get('Observation', [])),
-            'encounters': self._extract_encounters(resources_by_type.get('Encounter', [])),
-            'document_references': resources_by_type.get('DocumentReference', []),
-            'organizations': resources_by_type.get('Organization', []),
-            'practitioners': resources_by_type.get('Practitioner', []),
-            'care_teams': resources_by_type.get('CareTeam', []),
-        }
+            references.add(entry.get('resource', {}), entry.get('fullUrl'))
+        self._add_resources(
+            result, (entry.get('resource', {}) for entry in entries), counts, seen_keys
+        )
+        self.resolve_references(result, references)
+        self.stage_seen(seen_keys)
 
+        self._log_counts(len(entries), counts)
         return result
 
-    def _extract_patient(self, patients: List[Dict]) -> Optional[PatientDemographics]:
-        """Extract patient demographics from Patient resource."""
-        if not patients:
-            return None
-
-        patient = patients[0]  # Should only be one patient
-
-        # Extract name
-        names = patient.get('name', [])
-        full_name = "Unknown"
-        if names:
-            name = names[0]
-            given = name.get('given', [])
-            family = name.get('family', '')
-            full_name = f"{' '.join(given)} {family}".strip()
-
-        # Extract birth date
-        birth_date_str = patient.get('birthDate')
-        birth_date = None
-        if birth_date_str:
-            try:
-                birth_date = datetime.strptime(birth_date_str, '%Y-%m-%d').date()
-            except ValueError:
-                self.logger.warning(f"Invalid birth date format: {birth_date_str}")
-
-        # Extract gender
-        gender_str = patient.get('gender', 'unknown')
-        try:
-            gender = Gender(gender_str.lower())
-        except ValueError:
-            gender = Gender.UNKNOWN
+    def _should_stream(self, filepath: Path) -> bool:
+        """Decide whether a bundle should be read incrementally."""
+        if self.streaming:
+            return True
+        if self.stream_threshold_bytes is None:
+            return False
+        return filepath.stat().st_size >= self.stream_threshold_bytes
 
-        # Extract contact info
-        contact = ContactInfo()
-        telecoms = patient.get('telecom', [])
-        for telecom in telecoms:
-            system = telecom.get('system')
-            value = telecom.get('value')
-            if system == 'phone':
-                contact.phone = value
-            elif system == 'email':
-                contact.email = value
-
-        # Extract address
-        addresses = patient.get('address', [])
-        if addresses:
-            addr = addresses[0]
-            lines = addr.get('line', [])
-            contact.address_line1 = lines[0] if len(lines) > 0 else None
-            contact.address_line2 = lines[1] if len(lines) > 1 else None
-            contact.city = addr.get('city')
-            contact.state = addr.get('state')
-            contact.zip_code = addr.get('postalCode')
-            contact.country = addr.get('country', 'USA')
-
-        # Extract identifiers
-        patient_id = patient.get('id', 'unknown')
-        mrn = None
-        identifiers = patient.get('identifier', [])
-        for identifier in identifiers:
-            if identifier.get('system', '').endswith('medical-record-number'):
-                mrn = identifier.get('value')
-                break
+    def _ingest_streaming(self, filepath: Path) -> Dict[str, Any]:
+        """
+        Ingest a FHIR Bundle one entry at a time.
 
-        return PatientDemographics(
-            patient_id=patient_id,
-            name=full_name,
-            date_of_birth=birth_date,
-            gender=gender,
-            contact=contact,
-            mrn=mrn
-        )
+        Each entry is decoded, extracted and released before the next one is
+        read, so peak memory is bounded by the largest single resource rather
+        than by the bundle size.
 
-    def _extract_conditions(self, conditions: List[Dict]) -> List[Condition]:
-        """Extract conditions/diagnoses from Condition resources."""
-        result = []
-
-        for cond in conditions:
-            # Extract condition name
-            coding = cond.get('code', {}).get('coding', [])
-            name = cond.get('code', {}).get('text', 'Unknown condition')
-
-            # Extract codes
-            icd10 = None
-            snomed = None
-            for code in coding:
-                system = code.get('system', '')
-                if 'icd-10' in system.lower():
-                    icd10 = code.get('code')
-                elif 'snomed' in system.lower():
-                    snomed = code.get('code')
-
-            # Extract status
-            clinical_status = cond.get('clinicalStatus', {}).get('coding', [{}])[0].get('code')
-            status = ConditionStatus.ACTIVE
-            if clinical_status == 'resolved':
-                status = ConditionStatus.RESOLVED
-            elif clinical_status == 'inactive':
-                status = ConditionStatus.RESOLVED
-
-            # Extract dates
-            onset_date = None
-            onset_str = cond.get('onsetDateTime')
-            if onset_str:
-                try:
-                    onset_date = datetime.fromisoformat(onset_str.replace('Z', '+00:00')).date()
-                except (ValueError, AttributeError):
-                    pass
-
-            result.append(Condition(
-                name=name,
-                icd10_code=icd10,
-                snomed_code=snomed,
-                status=status,
-                onset_date=onset_date,
-                clinical_status=clinical_status,
-                verification_status=cond.get('verificationStatus', {}).get('coding', [{}])[0].get('code')
-            ))
+        Args:
+            filepath: Path to FHIR Bundle JSON
 
+        Returns:
+            Dictionary with extracted data, same shape as `ingest`
+        """
+        self.logger.info(f"Streaming FHIR Bundle: {filepath.name}")
+
+        result = self._new_result(filepath)
+        counts: Dict[str, int] = {}
+        references = ReferenceIndex(self.REFERENCE_TARGETS)
+        seen_keys: Set[str] = set()
+        self.skipped_resources = 0
+        resource_type = None
+        total = 0
+
+        with open(filepath, 'r', encoding='utf-8-sig') as f:
+            for key, value in iter_top_level(f, stream_keys=('entry',)):
+                if key == 'resourceType':
+                    resource_type = value
+                    if resource_type != 'Bundle':
+                        raise ValueError(f"Not a FHIR Bundle: {filepath}")
+                elif key == 'entry':
+                    total += 1
+                    resource = value.get('resource', {})
+                    references.add(resource, value.get('fullUrl'))
+                    self._add_resources(result, [resource], counts, seen_keys, [total - 1])
+
+        if resource_type != 'Bundle':
+            raise ValueError(f"Not a FHIR Bundle: {filepath}")
+
+        self.resolve_references(result, references)
+        self.stage_seen(seen_keys)
+
+        self._log_counts(total, counts)
         return result
 
-    def _extract_devices(self, devices: List[Dict]) -> List[ImplantedDevice]:
-        """Extract implanted devices from Device resources."""
-        result = []
+    def _new_result(self, filepath: Path) -> Dict[str, Any]:
+        """Create an empty result dictionary."""
+        result: Dict[str, Any] = {'source_file': str(filepath), 'patient': None}
+        for resource_type, resource_plan in self.RESOURCE_PLANS.items():
+            if resource_type != 'Patient':
+                result[resource_plan.key] = []
+        for key in self.RAW_RESOURCE_KEYS.values():
+            result[key] = []
+        return result
 
-        for device in devices:
-            # Extract device info
-            device_name = device.get('deviceName', [{}])[0].get('name', 'Unknown device')
-            device_type = device.get('type', {}).get('text', 'Unknown type')
+    def _add_resources(
+        self,
+        result: Dict[str, Any],
+        resources: Iterable[Dict[str, Any]],
+        counts: Dict[str, int],
+        seen_keys: Optional[Set[str]] = None,
+        positions: Optional[Iterable[int]] = None,
+        position_key: str = 'entry'
+    ) -> None:
+        """
+        Extract resources into the result dictionary.
 
-            # Extract UDI
-            udi_carrier = device.get('udiCarrier', [{}])
-            udi = udi_carrier[0].get('deviceIdentifier') if udi_carrier else None
+        Resources are grouped by type and each group goes through its
+        extraction plan in one batch. Order within a type is preserved.
+        With a seen index, versions already seen (in the index, or earlier
+        in the same document via `seen_keys`) are dropped first and new ones
+        are added to `seen_keys`.
 
-            # Extract manufacturer
-            manufacturer = device.get('manufacturer')
+        `positions` locate the resources in `result['source_file']` for the
+        source references of lean mode: Bundle entry indexes by default
+        (counting from 0), or NDJSON byte offsets with `position_key='offset'`.
+        """
+        located: Iterable[Tuple[Dict[str, Any], int]] = zip(
+            resources, count() if positions is None else positions
+        )
+        if self.seen_index is not None:
+            located = self._unseen(located, seen_keys if seen_keys is not None else set())
 
-            # Extract lot number
-            lot_number = device.get('lotNumber')
+        by_type: Dict[str, List[Tuple[Dict[str, Any], int]]] = {}
+        for resource, position in located:
+            resource_type = resource.get('resourceType')
+            if resource_type:
+                by_type.setdefault(resource_type, []).append((resource, position))
+
+        for resource_type, located_group in by_type.items():
+            counts[resource_type] = counts.get(resource_type, 0) + len(located_group)
+            group = [resource for resource, _ in located_group]
+
+            if resource_type in self.RAW_RESOURCE_KEYS:
+                result[self.RAW_RESOURCE_KEYS[resource_type]].extend(group)
+                continue
+            if resource_type not in self.RESOURCE_PLANS:
+                continue
+            if resource_type == 'Patient':
+                # Should only be one patient; the first one wins
+                if result['patient'] is not None:
+                    continue
+                group, located_group = group[:1], located_group[:1]
+
+            source_refs = None
+            if self.lean and self.RESOURCE_PLANS[resource_type].raw_key is not None:
+                source_refs = [
+                    make_source_ref(result['source_file'], resource, **{position_key: position})
+                    for resource, position in located_group
+                ]
+            items = self._extract_resources(resource_type, group, source_refs)
+
+            if resource_type == 'Patient':
+                result['patient'] = items[0]
+            else:
+                result[self.RESOURCE_PLANS[resource_type].key].extend(items)
+
+    def _unseen(
+        self,
+        located: Iterable[Tuple[Dict[str, Any], int]],
+        seen_keys: Set[str]
+    ) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Drop resource versions that have already been seen."""
+        seen_index = self.seen_index
+        for resource, position in located:
+            if resource.get('resourceType') in self.SKIPPABLE_TYPES:
+                key = resource_key(resource)
+                if key is not None:
+                    if key in seen_keys or key in seen_index:
+                        self.skipped_resources += 1
+                        continue
+                    seen_keys.add(key)
+            yield resource, position
+
+    def stage_seen(self, seen_keys: Set[str]) -> None:
+        """
+        Stage the resource versions of a successfully ingested document.
 
-            result.append(ImplantedDevice(
-                device_type=device_type,
-                device_name=device_name,
-                udi=udi,
-                manufacturer=manufacturer,
-                lot_number=lot_number,
-                status="active"
-            ))
+        Args:
+            seen_keys: Keys collected by `_add_resources`
+        """
+        if self.seen_index is not None:
+            self.seen_index.stage(seen_keys)
+
+    def _extract_resources(
+        self,
+        resource_type: str,
+        resources: List[Dict[str, Any]],
+        source_refs: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Any]:
+        """
+        Apply a resource type's extraction plan to a batch of resources.
 
-        return result
+        Each value keeps its source resource under the plan's `raw_key`, or,
+        when `source_refs` are given, its source reference under 'source_ref'
+        plus any unresolved reference elements.
+        """
+        resource_plan = self.RESOURCE_PLANS[resource_type]
+        rows = resource_plan.plan.extract_all(resources)
+
+        if resource_plan.builder is None:
+            items = rows
+            stores = rows
+        else:
+            build = getattr(self, resource_plan.builder)
+            items = [build(fields, resource) for fields, resource in zip(rows, resources)]
+            stores = [item.details for item in items] if resource_plan.raw_key else []
+
+        if resource_plan.raw_key is None:
+            return items
+
+        if source_refs is None:
+            for store, resource in zip(stores, resources):
+                store[resource_plan.raw_key] = resource
+            return items
+
+        for store, source_ref in zip(stores, source_refs):
+            store['source_ref'] = source_ref
+        reference_plan = self.REFERENCE_PLANS.get(resource_type)
+        if reference_plan is not None:
+            for store, elements in zip(stores, reference_plan.extract_all(resources)):
+                store[self.PENDING_REFERENCES_KEY] = elements
+        return items
+
+    def resolve_references(self, result: Dict[str, Any], references: ReferenceIndex) -> None:
+        """
+        Fill in providers, locations and performers from referenced resources.
 
-    def _extract_procedures(self, procedures: List[Dict]) -> List[TimelineEvent]:
-        """Extract procedures as timeline events."""
-        events = []
-
-        for proc in procedures:
-            # Extract procedure name
-            name = proc.get('code', {}).get('text', 'Unknown procedure')
-
-            # Extract date
-            performed = proc.get('performedDateTime') or proc.get('performedPeriod', {}).get('start')
-            event_date = datetime.now()
-            if performed:
-                try:
-                    event_date = datetime.fromisoformat(performed.replace('Z', '+00:00'))
-                except (ValueError, AttributeError):
-                    pass
-
-            # Extract codes
-            codes = {}
-            for coding in proc.get('code', {}).get('coding', []):
-                system = coding.get('system', '')
-                if 'cpt' in system.lower():
-                    codes['cpt'] = coding.get('code')
-                elif 'snomed' in system.lower():
-                    codes['snomed'] = coding.get('code')
-
-            events.append(TimelineEvent(
-                date=event_date,
-                event_type=EventType.PROCEDURE,
-                summary=name,
-                details={'procedure_resource': proc},
-                clinical_significance=ClinicalSignificance.HIGH,
-                codes=codes
-            ))
-
-        return events
-
-    def _extract_medications(self, medications: List[Dict]) -> List[Dict]:
-        """Extract medication requests."""
-        result = []
-
-        for med in medications:
-            medication_name = med.get('medicationCodeableConcept', {}).get('text', 'Unknown medication')
-
-            # Extract dosage
-            dosage_instruction = med.get('dosageInstruction', [{}])[0]
-            dosage_text = dosage_instruction.get('text', '')
-
-            # Extract dates
-            authored_on = med.get('authoredOn')
-            authored_date = None
-            if authored_on:
-                try:
-                    authored_date = datetime.fromisoformat(authored_on.replace('Z', '+00:00'))
-                except (ValueError, AttributeError):
-                    pass
-
-            result.append({
-                'medication': medication_name,
-                'dosage': dosage_text,
-                'status': med.get('status'),
-                'intent': med.get('intent'),
-                'authored_on': authored_date,
-                'raw': med
-            })
+        Args:
+            result: Result dictionary, updated in place
+            references: Index of the resources the result's resources may refer to
+        """
+        if not references and not self.lean:
+            return
+
+        for resource_type, reference_plan in self.REFERENCE_PLANS.items():
+            resource_plan = self.RESOURCE_PLANS[resource_type]
+            is_dict = resource_plan.builder is None
+            for item in result[resource_plan.key]:
+                store = item if is_dict else item.details
+                elements = store.pop(self.PENDING_REFERENCES_KEY, None)
+                if elements is None:
+                    if resource_plan.raw_key not in store:
+                        continue
+                    elements = reference_plan.extract(store[resource_plan.raw_key])
+                for field, element in elements.items():
+                    name = references.describe(element)
+                    if not name:
+                        continue
+                    if is_dict:
+                        item[field] = name
+                    else:
+                        setattr(item, field, name)
+
+    def _log_counts(self, total: int, counts: Dict[str, int]) -> None:
+        """Log resource counts for a processed bundle."""
+        self.logger.info(f"Found {total} resources in bundle")
+        for rtype, n in counts.items():
+            self.logger.info(f"  {rtype}: {n}")
+        if self.skipped_resources:
+            self.logger.info(f"  Skipped {self.skipped_resources} resources seen before")
+
+    def _build_patient(self, fields: Dict[str, Any], resource: Dict) -> PatientDemographics:
+        """Build patient demographics from extracted Patient fields."""
+        full_name = f"{' '.join(fields['given'])} {fields['family']}".strip() or "Unknown"
+
+        if fields['birth_date_text'] and fields['date_of_birth'] is None:
+            self.logger.warning(f"Invalid birth date format: {fields['birth_date_text']}")
 
-        return result
+        try:
+            gender = Gender(str(fields['gender']).lower())
+        except ValueError:
+            gender = Gender.UNKNOWN
 
-    def _extract_observations(self, observations: List[Dict]) -> List[Dict]:
-        """Extract observations (lab results, vitals, etc.)."""
-        result = []
-
-        for obs in observations:
-            # Extract observation name
-            name = obs.get('code', {}).get('text', 'Unknown observation')
-
-            # Extract value
-            value_quantity = obs.get('valueQuantity', {})
-            value = value_quantity.get('value')
-            unit = value_quantity.get('unit')
-
-            # Extract date
-            effective = obs.get('effectiveDateTime')
-            obs_date = None
-            if effective:
-                try:
-                    obs_date = datetime.fromisoformat(effective.replace('Z', '+00:00'))
-                except (ValueError, AttributeError):
-                    pass
-
-            result.append({
-                'name': name,
-                'value': value,
-                'unit': unit,
-                'date': obs_date,
-                'status': obs.get('status'),
-                'category': obs.get('category', [{}])[0].get('coding', [{}])[0].get('code'),
-                'raw': obs
-            })
+        contact = ContactInfo(
+            phone=fields['phone'],
+            email=fields['email'],
+            address_line1=fields['address_line1'],
+            address_line2=fields['address_line2'],
+            city=fields['city'],
+            state=fields['state'],
+            zip_code=fields['zip_code'],
+            country=fields['country']
+        )
 
-        return result
+        return PatientDemographics(
+            patient_id=fields['patient_id'],
+            name=full_name,
+            date_of_birth=fields['date_of_birth'],
+            gender=gender,
+            contact=contact,
+            mrn=fields['mrn']
+        )
+
+    def _build_condition(self, fields: Dict[str, Any], resource: Dict) -> Condition:
+        """Build a condition/diagnosis from extracted Condition fields."""
+        status = CONDITION_STATUSES.get(fields['clinical_status'], ConditionStatus.ACTIVE)
+        return Condition(status=status, **fields)
+
+    def _build_device(self, fields: Dict[str, Any], resource: Dict) -> ImplantedDevice:
+        """Build an implanted device from extracted Device fields."""
+        return ImplantedDevice(status="active", **fields)
+
+    def _build_procedure(self, fields: Dict[str, Any], resource: Dict) -> TimelineEvent:
+        """Build a procedure timeline event from extracted Procedure fields."""
+        codes = {system: fields[system] for system in ('cpt', 'snomed') if fields[system]}
+        return TimelineEvent(
+            date=fields['date'] or utc_now(),
+            event_type=EventType.PROCEDURE,
+            summary=fields['summary'],
+            clinical_significance=ClinicalSignificance.HIGH,
+            location=fields['location'],
+            provider=fields['provider'],
+            codes=codes
+        )
+
+    def _build_encounter(self, fields: Dict[str, Any], resource: Dict) -> TimelineEvent:
+        """Build an encounter timeline event from extracted Encounter fields."""
+        return TimelineEvent(
+            date=fields['date'] or utc_now(),
+            event_type=EventType.ENCOUNTER,
+            summary=fields['summary'],
+            clinical_significance=ClinicalSignificance.MEDIUM,
+            location=fields['location'],
+            provider=fields['provider']
+        )
 
-    def _extract_encounters(self, encounters: List[Dict]) -> List[TimelineEvent]:
-        """Extract encounters as timeline events."""
-        events = []
-
-        for enc in encounters:
-            # Extract encounter type
-            enc_type = enc.get('type', [{}])[0].get('text', 'Unknown encounter')
-
-            # Extract period
-            period = enc.get('period', {})
-            start_str = period.get('start')
-            event_date = datetime.now()
-            if start_str:
-                try:
-                    event_date = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-                except (ValueError, AttributeError):
-                    pass
-
-            events.append(TimelineEvent(
-                date=event_date,
-                event_type=EventType.ENCOUNTER,
-                summary=enc_type,
-                details={'encounter_resource': enc},
-                clinical_significance=ClinicalSignificance.MEDIUM
-            ))
-
-        return events
+    def _build_allergy(self, fields: Dict[str, Any], resource: Dict) -> Allergy:
+        """Build an allergy from extracted AllergyIntolerance fields."""
+        return Allergy(**fields)
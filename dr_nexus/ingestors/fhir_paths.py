@@ -0,0 +1,347 @@
+"""Declarative FHIR extraction plans compiled into accessor functions."""
+
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from dr_nexus.utils.temporal import normalize_date, normalize_datetime
+
+
+_SEGMENT = re.compile(
+    r"""
+    \s*(?:
+        where\(\s*(?P<key>\w+)\s*(?P<op>=|~)\s*'(?P<text>[^']*)'\s*\)
+      | (?P<name>\w+)(?:\[(?P<index>\d+)\])?
+    )\s*(?:\.|$)
+    """,
+    re.VERBOSE
+)
+
+
+def parse_fhir_datetime(value: Any) -> Optional[datetime]:
+    """
+    Parse a FHIR date, dateTime or instant.
+
+    Args:
+        value: ISO 8601 string; partial dates and a trailing Z are accepted
+
+    Returns:
+        Naive UTC datetime, or None if the value is missing or invalid
+    """
+    if not isinstance(value, str):
+        return None
+    return normalize_datetime(value)
+
+
+def parse_fhir_date(value: Any) -> Optional[date]:
+    """
+    Parse the date part of a FHIR date or dateTime.
+
+    Args:
+        value: ISO 8601 string; partial dates fall on the first day of their period
+
+    Returns:
+        date, or None if the value is missing or invalid
+    """
+    if not isinstance(value, str):
+        return None
+    return normalize_date(value)
+
+
+class PathField(NamedTuple):
+    """
+    Mapping from a FHIR path to one output field.
+
+    Attributes:
+        path: Path expression (see `compile_path`)
+        default: Value used when the path selects nothing (or conversion fails)
+        convert: Optional function applied to each selected value
+        many: Return every selected value as a list instead of the first one
+    """
+    path: str
+    default: Any = None
+    convert: Optional[Callable[[Any], Any]] = None
+    many: bool = False
+
+
+# Marks a single-valued path that selected nothing
+_MISSING = object()
+
+
+class _Child(NamedTuple):
+    """Step to a child element (optionally only its n-th item)."""
+    name: str
+    index: Optional[int]
+
+
+class _Where(NamedTuple):
+    """Filter the current items on one of their elements."""
+    key: str
+    op: str
+    text: str
+
+
+def _parse(expression: str) -> List[Tuple[Any, ...]]:
+    """Parse a path expression into its alternatives' steps."""
+    alternatives = []
+    for part in expression.split('|'):
+        part = part.strip()
+        steps: List[Any] = []
+        position = 0
+        while position < len(part):
+            match = _SEGMENT.match(part, position)
+            if match is None or match.end() == position:
+                raise ValueError(f"Invalid FHIR path at {position}: {expression!r}")
+            if match.group('name'):
+                index = match.group('index')
+                steps.append(_Child(match.group('name'), None if index is None else int(index)))
+            else:
+                steps.append(_Where(match.group('key'), match.group('op'), match.group('text')))
+            position = match.end()
+        if not steps:
+            raise ValueError(f"Empty FHIR path: {expression!r}")
+        alternatives.append(tuple(steps))
+    return alternatives
+
+
+def _matcher(step: _Where) -> Callable[[Any], bool]:
+    """Build the test of a where() step."""
+    key, text = step.key, step.text
+    if step.op == '=':
+        return lambda item: isinstance(item, dict) and item.get(key) == text
+
+    text = text.lower()
+
+    def contains(item: Any) -> bool:
+        value = item.get(key) if isinstance(item, dict) else None
+        return isinstance(value, str) and text in value.lower()
+
+    return contains
+
+
+def _collection_step(step: Any) -> Callable[[List[Any]], List[Any]]:
+    """Build a function mapping the current collection through one step."""
+    if isinstance(step, _Where):
+        matches = _matcher(step)
+        return lambda items: [item for item in items if matches(item)]
+
+    name, index = step
+
+    def child(items: List[Any]) -> List[Any]:
+        selected = []
+        for item in items:
+            if isinstance(item, dict):
+                value = item.get(name)
+                if isinstance(value, list):
+                    selected.extend(value)
+                elif value is not None:
+                    selected.append(value)
+        return selected
+
+    if index is None:
+        return child
+    # The index applies to the flattened collection
+    return lambda items: child(items)[index:index + 1]
+
+
+def _collector(steps: Tuple[Any, ...]) -> Callable[[Dict[str, Any]], List[Any]]:
+    """Build a function returning every value one alternative selects."""
+    compiled = tuple(_collection_step(step) for step in steps)
+
+    def collect(resource: Dict[str, Any]) -> List[Any]:
+        items = [resource]
+        for step in compiled:
+            items = step(items)
+            if not items:
+                break
+        return items
+
+    return collect
+
+
+def _first_step(step: Any, rest: Optional[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    """
+    Build a function finding the first value selected from one node.
+
+    Args:
+        step: Step applied to the node
+        rest: Function continuing with the steps after this one, or None
+            if this step ends the path
+    """
+    if isinstance(step, _Where):
+        matches = _matcher(step)
+        if rest is None:
+            return lambda node: node if matches(node) else _MISSING
+        return lambda node: rest(node) if matches(node) else _MISSING
+
+    name, index = step
+    if index is not None:
+        def child_at(node: Any) -> Any:
+            value = node.get(name) if isinstance(node, dict) else None
+            if isinstance(value, list):
+                value = value[index] if len(value) > index else None
+            elif index:
+                value = None
+            if value is None:
+                return _MISSING
+            return value if rest is None else rest(value)
+        return child_at
+
+    if rest is None:
+        def last_child(node: Any) -> Any:
+            value = node.get(name) if isinstance(node, dict) else None
+            if isinstance(value, list):
+                value = next((item for item in value if item is not None), None)
+            return _MISSING if value is None else value
+        return last_child
+
+    def child(node: Any) -> Any:
+        value = node.get(name) if isinstance(node, dict) else None
+        if value is None:
+            return _MISSING
+        if not isinstance(value, list):
+            return rest(value)
+        for item in value:
+            if item is not None:
+                found = rest(item)
+                if found is not _MISSING:
+                    return found
+        return _MISSING
+    return child
+
+
+def _finder(steps: Tuple[Any, ...]) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Build a function returning the first value one alternative selects.
+
+    Steps are chained depth-first so the search stops at the first match.
+    An index after a step that fans out counts across the whole flattened
+    collection, so such paths collect it instead.
+    """
+    fanned_out = False
+    for step in steps:
+        if isinstance(step, _Child):
+            if step.index is None:
+                fanned_out = True
+            elif fanned_out:
+                collect = _collector(steps)
+                return lambda resource: next(iter(collect(resource)), _MISSING)
+
+    find = None
+    for step in reversed(steps):
+        find = _first_step(step, find)
+    return find
+
+
+def _compile_field(spec: PathField) -> Callable[[Dict[str, Any]], Any]:
+    """Compile one field into a function computing its value from a resource."""
+    alternatives = _parse(spec.path)
+    convert, default = spec.convert, spec.default
+
+    if spec.many:
+        collectors = tuple(_collector(steps) for steps in alternatives)
+
+        def field(resource: Dict[str, Any]) -> Any:
+            for collect in collectors:
+                values = collect(resource)
+                if convert is not None:
+                    values = [y for y in map(convert, values) if y is not None]
+                if values:
+                    return values
+            return []
+
+        return field
+
+    finders = tuple(_finder(steps) for steps in alternatives)
+
+    if len(finders) == 1 and convert is None:
+        find = finders[0]
+
+        def field(resource: Dict[str, Any]) -> Any:
+            value = find(resource)
+            return default if value is _MISSING else value
+
+        return field
+
+    def field(resource: Dict[str, Any]) -> Any:
+        for find in finders:
+            value = find(resource)
+            if value is not _MISSING:
+                if convert is None:
+                    return value
+                value = convert(value)
+                return default if value is None else value
+        return default
+
+    return field
+
+
+def compile_path(expression: str) -> Callable[[Dict[str, Any]], List[Any]]:
+    """
+    Compile a FHIRPath-like expression into a function over a resource.
+
+    Supported syntax (a small FHIRPath subset):
+
+    - `name`: child element; repeating elements are flattened
+    - `name[n]`: n-th item of the child collection
+    - `where(key = 'text')`: keep items whose `key` equals `text`
+    - `where(key ~ 'text')`: keep items whose `key` contains `text`, ignoring case
+    - `a | b`: the first alternative that yields any value
+
+    The expression is parsed once and its steps are chained into closures,
+    so evaluating it does no parsing.
+
+    Args:
+        expression: Path expression, e.g. "code.coding.where(system ~ 'icd-10').code"
+
+    Returns:
+        Function mapping a resource to the collection the path selects
+
+    Raises:
+        ValueError: If the expression is not valid
+    """
+    return _compile_field(PathField(expression, many=True))
+
+
+class ExtractionPlan:
+    """
+    A declarative mapping from FHIR paths to output fields, compiled once.
+
+    Each field is compiled into a function once, so applying a plan
+    involves no interpretation of paths.
+
+    Attributes:
+        fields: Output field name to PathField
+        extract: Compiled function mapping one resource to its output fields
+    """
+
+    def __init__(self, fields: Dict[str, PathField]) -> None:
+        """
+        Compile an extraction plan.
+
+        Args:
+            fields: Output field name to PathField
+
+        Raises:
+            ValueError: If any path expression is not valid
+        """
+        self.fields = dict(fields)
+
+        compiled = tuple((name, _compile_field(spec)) for name, spec in self.fields.items())
+
+        def extract(resource: Dict[str, Any]) -> Dict[str, Any]:
+            return {name: field(resource) for name, field in compiled}
+
+        self.extract: Callable[[Dict[str, Any]], Dict[str, Any]] = extract
+
+    def extract_all(self, resources: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extract the plan's fields from a batch of resources.
+
+        Args:
+            resources: FHIR resources of the type the plan describes
+
+        Returns:
+            One dictionary of output fields per resource, in input order
+        """
+        return list(map(self.extract, resources))
@@ -0,0 +1,142 @@
+"""Resolution of FHIR references (Practitioner, Organization, Location)."""
+
+from typing import Any, Dict, Iterable, Optional
+
+
+def reference_key(reference: str) -> str:
+    """
+    Reduce a literal FHIR reference to its `ResourceType/id` form.
+
+    Absolute URLs and version-specific references are accepted, e.g.
+    "https://example.org/fhir/Practitioner/12/_history/3" becomes
+    "Practitioner/12".
+
+    Args:
+        reference: Reference string
+
+    Returns:
+        The `ResourceType/id` key (or the input if it has no such form)
+    """
+    path = reference.split('/_history/', 1)[0].rstrip('/')
+    parts = path.rsplit('/', 2)
+    if len(parts) < 2:
+        return reference
+    return f"{parts[-2]}/{parts[-1]}"
+
+
+def display_name(resource: Dict[str, Any]) -> Optional[str]:
+    """
+    Human-readable name of a Practitioner, Organization or Location.
+
+    Args:
+        resource: FHIR resource
+
+    Returns:
+        Name such as "Dr. Jane Smith", or None if the resource has none
+    """
+    name = resource.get('name')
+    if isinstance(name, str):
+        return name or None
+    if not isinstance(name, list) or not name or not isinstance(name[0], dict):
+        return None
+
+    human_name = name[0]
+    if human_name.get('text'):
+        return human_name['text']
+    parts = [*human_name.get('prefix', []), *human_name.get('given', [])]
+    if human_name.get('family'):
+        parts.append(human_name['family'])
+    return ' '.join(parts) or None
+
+
+class ReferenceIndex:
+    """
+    Hash index from FHIR references to the resources they point at.
+
+    Resources are registered under `ResourceType/id` and under their bundle
+    `fullUrl`, so each reference resolves with a dictionary lookup no matter
+    how many resources the bundle holds.
+    """
+
+    def __init__(self, resource_types: Iterable[str]) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            resource_types: Types of resource that can be referenced; other
+                resources are ignored by `add`
+        """
+        self.resource_types = frozenset(resource_types)
+        self._resources: Dict[str, Dict[str, Any]] = {}
+        self._names: Dict[str, Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def add(self, resource: Dict[str, Any], full_url: Optional[str] = None) -> None:
+        """
+        Register a resource.
+
+        Args:
+            resource: FHIR resource
+            full_url: The bundle entry's fullUrl, if any
+        """
+        resource_type = resource.get('resourceType')
+        if resource_type not in self.resource_types:
+            return
+        if resource.get('id'):
+            self._resources[f"{resource_type}/{resource['id']}"] = resource
+        if full_url:
+            self._resources[full_url] = resource
+        self._names.clear()
+
+    def add_all(self, resources: Iterable[Dict[str, Any]]) -> None:
+        """Register several resources that have no fullUrl."""
+        for resource in resources:
+            self.add(resource)
+
+    def resolve(self, reference: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up the resource a reference points at.
+
+        Args:
+            reference: Literal reference ("Practitioner/1", a fullUrl, or an
+                absolute URL ending in "Practitioner/1")
+
+        Returns:
+            The referenced resource, or None if it is not in the index
+        """
+        if not reference or reference.startswith('#'):
+            return None
+        resource = self._resources.get(reference)
+        if resource is None:
+            resource = self._resources.get(reference_key(reference))
+        return resource
+
+    def describe(self, reference: Any) -> Optional[str]:
+        """
+        Name the target of a FHIR Reference element.
+
+        Falls back to the reference's own `display` text when the target is
+        not in the index. Names are cached per reference string, since many
+        resources usually point at the same few practitioners and locations.
+
+        Args:
+            reference: Reference element, e.g. {"reference": "Location/1"}
+
+        Returns:
+            Display name, or None
+        """
+        if not isinstance(reference, dict):
+            return None
+
+        literal = reference.get('reference')
+        if not isinstance(literal, str):
+            return reference.get('display')
+        if literal in self._names:
+            name = self._names[literal]
+        else:
+            target = self.resolve(literal)
+            name = display_name(target) if target is not None else None
+            self._names[literal] = name
+        return name or reference.get('display')
@@ -0,0 +1,308 @@
+"""Cheap format detection from file headers."""
+
+import codecs
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from dr_nexus.models.document import DocumentType
+
+
+logger = logging.getLogger(__name__)
+
+# Number of bytes read from the start of a file for sniffing
+SNIFF_BYTES = 8192
+
+# Bytes scanned past the sniff window looking for the end of a long first
+# NDJSON line; beyond this the extension decides
+NDJSON_SCAN_BYTES = 16 * 1024 * 1024
+_SCAN_CHUNK_BYTES = 1024 * 1024
+
+Sniffer = Callable[[bytes, Path], Optional[DocumentType]]
+
+_MAGIC_NUMBERS = [
+    (b'%PDF-', DocumentType.PDF),
+    (b'\xff\xd8\xff', DocumentType.IMAGE),  # JPEG
+    (b'\x89PNG\r\n\x1a\n', DocumentType.IMAGE),
+    (b'GIF87a', DocumentType.IMAGE),
+    (b'GIF89a', DocumentType.IMAGE),
+    (b'II*\x00', DocumentType.IMAGE),  # TIFF, little-endian
+    (b'MM\x00*', DocumentType.IMAGE),  # TIFF, big-endian
+]
+
+_EXTENSIONS = {
+    '.pdf': DocumentType.PDF,
+    '.jpg': DocumentType.IMAGE,
+    '.jpeg': DocumentType.IMAGE,
+    '.png': DocumentType.IMAGE,
+    '.dcm': DocumentType.IMAGE,
+    '.html': DocumentType.HTML,
+    '.htm': DocumentType.HTML,
+    '.ndjson': DocumentType.NDJSON,
+}
+
+# Prolog constructs that may precede the root element of an XML document
+_XML_PROLOG = re.compile(r'\s*(<\?.*?\?>|<!--.*?-->|<!DOCTYPE[^>]*>)', re.DOTALL | re.IGNORECASE)
+_XML_ROOT = re.compile(r'<([A-Za-z_][\w.\-]*:)?([A-Za-z_][\w.\-]*)([^>]*)')
+
+
+def _decode_head(head: bytes) -> str:
+    """Decode a file header, honoring byte order marks."""
+    for bom, encoding in (
+        (codecs.BOM_UTF8, 'utf-8'),
+        (codecs.BOM_UTF16_LE, 'utf-16-le'),
+        (codecs.BOM_UTF16_BE, 'utf-16-be'),
+    ):
+        if head.startswith(bom):
+            return head[len(bom):].decode(encoding, errors='ignore')
+    return head.decode('utf-8', errors='ignore')
+
+
+def _top_level_string(text: str, wanted: str) -> Optional[str]:
+    """
+    Find the string value of a top-level member in a (possibly truncated) JSON object.
+
+    Only members at depth 1 are considered, so a nested `resourceType` inside
+    `entry[]` is never mistaken for the document's own type.
+    """
+    depth = 0
+    i = 0
+    n = len(text)
+    expect_key = False
+
+    while i < n:
+        char = text[i]
+        if char == '"':
+            end = i + 1
+            while end < n and text[end] != '"':
+                end += 2 if text[end] == '\\' else 1
+            if end >= n:
+                return None
+            if depth == 1 and expect_key:
+                key = text[i + 1:end]
+                rest = text[end + 1:].lstrip()
+                if key == wanted and rest.startswith(':'):
+                    value = rest[1:].lstrip()
+                    match = re.match(r'"((?:[^"\\]|\\.)*)"', value)
+                    return match.group(1) if match else None
+                expect_key = False
+            i = end + 1
+            continue
+        if char in '{[':
+            depth += 1
+            expect_key = char == '{' and depth == 1
+        elif char in '}]':
+            depth -= 1
+        elif char == ',' and depth == 1:
+            expect_key = True
+        i += 1
+
+    return None
+
+
+def _parse_resource(line: str) -> Optional[dict]:
+    """Parse one line as a FHIR resource, or return None if it is not one."""
+    try:
+        value = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) and value.get('resourceType') else None
+
+
+def _object_follows_first_line(filepath: Path) -> Optional[bool]:
+    """
+    Check whether another JSON object line follows the first line of a file.
+
+    Reads past the sniff window in chunks, so a first line of any length up
+    to `NDJSON_SCAN_BYTES` can be stepped over.
+
+    Returns:
+        True if the next non-blank line starts with '{', False if the file
+        ends first, or None if the file cannot be read or the first line
+        does not end within the scan limit
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            in_first_line = True
+            scanned = 0
+            while scanned < NDJSON_SCAN_BYTES:
+                chunk = f.read(_SCAN_CHUNK_BYTES)
+                if not chunk:
+                    return False
+                scanned += len(chunk)
+                if in_first_line:
+                    end = chunk.find(b'\n')
+                    if end < 0:
+                        continue
+                    in_first_line = False
+                    chunk = chunk[end + 1:]
+                chunk = chunk.lstrip()
+                if chunk:
+                    return chunk.startswith(b'{')
+    except OSError as e:
+        logger.debug(f"Cannot scan {filepath}: {e}")
+    return None
+
+
+def sniff_magic(head: bytes, filepath: Path) -> Optional[DocumentType]:
+    """Detect binary formats from their magic numbers."""
+    for magic, doc_type in _MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return doc_type
+    if head[128:132] == b'DICM':
+        return DocumentType.IMAGE
+    return None
+
+
+def sniff_xml(head: bytes, filepath: Path) -> Optional[DocumentType]:
+    """Detect C-CDA and HTML documents from their root element."""
+    text = _decode_head(head).lstrip()
+    if not text.startswith('<'):
+        return None
+
+    pos = 0
+    while True:
+        match = _XML_PROLOG.match(text, pos)
+        if match is None:
+            break
+        if match.group(1).lower().startswith('<!doctype html'):
+            return DocumentType.HTML
+        pos = match.end()
+
+    root = _XML_ROOT.match(text[pos:].lstrip())
+    if root is None:
+        return None
+
+    local_name = root.group(2)
+    if local_name == 'ClinicalDocument' or 'urn:hl7-org:v3' in root.group(3):
+        return DocumentType.CCDA
+    if local_name.lower() == 'html':
+        return DocumentType.HTML
+    return None
+
+
+def sniff_json(head: bytes, filepath: Path) -> Optional[DocumentType]:
+    """Detect FHIR Bundles, NDJSON files and Bulk Data manifests."""
+    text = _decode_head(head).lstrip()
+    if not text.startswith('{'):
+        return None
+
+    # NDJSON: every line is a complete resource. One minified resource on a
+    # line is also a plain JSON document, so a second resource line is needed;
+    # a file holding a single line is NDJSON only by its extension
+    first_line, newline, rest = text.partition('\n')
+    resource_type = _top_level_string(text, 'resourceType')
+    # Whether another line follows a lone first resource line, if checked
+    follows = None
+    if newline and _parse_resource(first_line) is not None:
+        second_line, more, _ = rest.lstrip().partition('\n')
+        if second_line:
+            # A second line cut off by the sniff window only has to start like a resource
+            if _parse_resource(second_line) is not None or (not more and second_line.startswith('{')):
+                return DocumentType.NDJSON
+        else:
+            follows = _object_follows_first_line(filepath)
+    elif not newline and resource_type not in (None, 'Bundle'):
+        # The first line does not fit in the sniff window: look past it
+        follows = _object_follows_first_line(filepath)
+        if follows is None:
+            return None
+
+    if follows:
+        return DocumentType.NDJSON
+    if follows is False and sniff_extension(head, filepath) == DocumentType.NDJSON:
+        return DocumentType.NDJSON
+
+    if resource_type == 'Bundle':
+        return DocumentType.FHIR_BUNDLE
+    if resource_type is None and _top_level_string(text, 'transactionTime') is not None:
+        # Bulk Data export manifest
+        return DocumentType.NDJSON
+    if resource_type is not None:
+        return DocumentType.OTHER
+    return None
+
+
+def sniff_extension(head: bytes, filepath: Path) -> Optional[DocumentType]:
+    """Fall back to the file extension when the content is inconclusive."""
+    return _EXTENSIONS.get(filepath.suffix.lower())
+
+
+class FormatDetector:
+    """Registry of header sniffers that classify medical documents."""
+
+    def __init__(self, sniff_bytes: int = SNIFF_BYTES) -> None:
+        """
+        Initialize an empty detector.
+
+        Args:
+            sniff_bytes: Number of bytes read from the start of each file
+        """
+        self.sniff_bytes = sniff_bytes
+        self._sniffers: List[Tuple[int, Sniffer]] = []
+
+    def register(self, sniffer: Sniffer, priority: int = 100) -> None:
+        """
+        Register a sniffer.
+
+        Sniffers run in ascending priority order; the first one to return a
+        DocumentType wins.
+
+        Args:
+            sniffer: Callable taking (header bytes, file path)
+            priority: Lower values run first
+        """
+        self._sniffers.append((priority, sniffer))
+        self._sniffers.sort(key=lambda item: item[0])
+
+    def detect(self, filepath: Path) -> DocumentType:
+        """
+        Detect the type of a document from its first few KB.
+
+        Args:
+            filepath: Path to the file
+
+        Returns:
+            Detected DocumentType (OTHER if unknown or unreadable)
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                head = f.read(self.sniff_bytes)
+        except OSError as e:
+            logger.debug(f"Cannot sniff {filepath}: {e}")
+            return DocumentType.OTHER
+
+        for _, sniffer in self._sniffers:
+            doc_type = sniffer(head, filepath)
+            if doc_type is not None:
+                return doc_type
+
+        return DocumentType.OTHER
+
+
+def create_default_detector() -> FormatDetector:
+    """Create a detector with the built-in sniffers registered."""
+    detector = FormatDetector()
+    detector.register(sniff_magic, priority=10)
+    detector.register(sniff_xml, priority=20)
+    detector.register(sniff_json, priority=30)
+    detector.register(sniff_extension, priority=1000)
+    return detector
+
+
+default_detector = create_default_detector()
+
+
+def detect_format(filepath: Path) -> DocumentType:
+    """
+    Detect the type of a document using the default detector.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        Detected DocumentType
+    """
+    return default_detector.detect(filepath)
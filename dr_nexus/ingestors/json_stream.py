@@ -0,0 +1,137 @@
+"""Incremental JSON reading for very large documents."""
+
+import json
+from typing import Any, Iterator, Tuple, TextIO, Iterable
+
+
+_decoder = json.JSONDecoder()
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _IncrementalReader:
+    """Buffered reader that decodes one JSON value at a time from a text stream."""
+
+    def __init__(self, fp: TextIO, chunk_size: int) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            fp: Open text-mode file object
+            chunk_size: Number of characters to read per refill
+        """
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Append more data to the buffer, discarding consumed characters."""
+        chunk = self.fp.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                return ''
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be `char`."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'EOF'}'")
+        self.pos += 1
+
+    def read_value(self) -> Any:
+        """Decode the next complete JSON value, reading more data as needed."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                # Value spans past the buffer; grow geometrically so very
+                # large values are not re-scanned once per chunk.
+                self._fill(size)
+                size *= 2
+                continue
+
+            # A number at the very end of the buffer may still be truncated
+            if end == len(self.buf) and not self.eof and self._fill(size):
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_top_level(
+    fp: TextIO,
+    stream_keys: Iterable[str] = ('entry',),
+    chunk_size: int = 1 << 16
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Walk the members of a top-level JSON object without loading it whole.
+
+    Members named in `stream_keys` must hold arrays; each array item is
+    yielded separately as `(key, item)` and released before the next one
+    is decoded. All other members are yielded once as `(key, value)`.
+
+    Args:
+        fp: Open text-mode file object positioned at the start of the document
+        stream_keys: Member names whose array items should be streamed
+        chunk_size: Number of characters to read per refill
+
+    Yields:
+        (member name, value or array item) tuples in document order
+
+    Raises:
+        ValueError: If the document is not a JSON object
+    """
+    stream_keys = set(stream_keys)
+    reader = _IncrementalReader(fp, chunk_size)
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        key = reader.read_value()
+        if not isinstance(key, str):
+            raise ValueError("Expected an object member name")
+        reader.expect(':')
+
+        if key in stream_keys:
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield key, reader.read_value()
+                    separator = reader.peek()
+                    reader.pos += 1
+                    if separator == ']':
+                        break
+                    if separator != ',':
+                        raise ValueError(f"Malformed '{key}' array")
+        else:
+            yield key, reader.read_value()
+
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError("Malformed JSON object")
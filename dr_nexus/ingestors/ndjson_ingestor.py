@@ -0,0 +1,278 @@
+"""FHIR Bulk Data (NDJSON) ingestor."""
+
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from dr_nexus.ingestors.base import BaseIngestor
+from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+from dr_nexus.ingestors.fhir_references import ReferenceIndex
+from dr_nexus.ingestors.format_detection import detect_format
+from dr_nexus.ingestors.seen_index import SeenResourceIndex
+from dr_nexus.models.document import DocumentType
+from dr_nexus.utils import json_codec
+
+
+logger = logging.getLogger(__name__)
+
+# Per-process ingestors used by chunk workers, by lean flag
+_chunk_ingestors: Dict[bool, FHIRIngestor] = {}
+
+
+class Chunk(NamedTuple):
+    """Consecutive lines of one NDJSON file."""
+    filepath: str
+    offsets: List[int]
+    lines: List[bytes]
+
+
+def _extract_chunk(
+    chunk: Chunk,
+    lean: bool = False,
+    ingestor: Optional[FHIRIngestor] = None,
+    seen_keys: Optional[Set[str]] = None
+) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    Extract a chunk of NDJSON lines.
+
+    Runs in worker processes, so it must stay a module-level function.
+
+    Args:
+        chunk: Raw NDJSON lines, one FHIR resource per line, with their byte offsets
+        lean: Keep source references instead of full resources
+        ingestor: Ingestor to extract with (defaults to a per-process one)
+        seen_keys: Resource versions seen so far in the export, when the
+            ingestor has a seen index
+
+    Returns:
+        Tuple of (partial result dictionary, resource counts by type)
+    """
+    if ingestor is None:
+        ingestor = _chunk_ingestors.get(lean)
+        if ingestor is None:
+            ingestor = _chunk_ingestors[lean] = FHIRIngestor(lean=lean)
+
+    partial = ingestor._new_result(Path(chunk.filepath))
+    counts: Dict[str, int] = {}
+    resources = []
+    offsets = []
+
+    for offset, line in zip(chunk.offsets, chunk.lines):
+        try:
+            resources.append(json_codec.loads(line))
+        except json_codec.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed NDJSON line: {e}")
+            continue
+        offsets.append(offset)
+
+    ingestor._add_resources(partial, resources, counts, seen_keys, offsets, 'offset')
+
+    return partial, counts
+
+
+class NDJSONIngestor(BaseIngestor):
+    """Ingest FHIR Bulk Data exports (a manifest.json plus NDJSON files)."""
+
+    VERSION = "4"
+
+    MANIFEST_NAME = 'manifest.json'
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        chunk_size: int = 1000,
+        seen_index: Optional[SeenResourceIndex] = None,
+        lean: bool = False
+    ) -> None:
+        """
+        Initialize the NDJSON ingestor.
+
+        Args:
+            max_workers: Number of worker processes used to extract chunks
+            chunk_size: Number of NDJSON lines per chunk
+            seen_index: Skip resource versions already in this index (chunks
+                are then extracted in this process, where the index lives)
+            lean: Keep source references (NDJSON file and byte offset) instead
+                of full FHIR resources
+        """
+        super().__init__()
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.seen_index = seen_index
+        self.lean = lean
+
+    def can_ingest(self, filepath: Path) -> bool:
+        """Check if file is an NDJSON file or a Bulk Data manifest."""
+        if filepath.suffix.lower() == '.ndjson':
+            return True
+        return detect_format(filepath) == DocumentType.NDJSON
+
+    def ingest(self, filepath: Path) -> Dict[str, Any]:
+        """
+        Ingest a Bulk Data export or a single NDJSON file.
+
+        Args:
+            filepath: Path to manifest.json or to an NDJSON file
+
+        Returns:
+            Dictionary with extracted data, same shape as `FHIRIngestor.ingest`
+        """
+        self.validate_file_exists(filepath)
+        self.validate_file_readable(filepath)
+
+        if filepath.suffix.lower() == '.ndjson':
+            ndjson_files = [filepath]
+        else:
+            ndjson_files = self.resolve_manifest(filepath)
+
+        self.logger.info(
+            f"Processing Bulk Data export: {filepath.name} ({len(ndjson_files)} NDJSON files)"
+        )
+
+        fhir = FHIRIngestor(seen_index=self.seen_index, lean=self.lean)
+        result = fhir._new_result(filepath)
+        counts: Dict[str, int] = {}
+        seen_keys: Set[str] = set()
+        total = 0
+
+        for partial, partial_counts in self._extract_chunks(ndjson_files, fhir, seen_keys):
+            self._merge_partial(result, partial)
+            for rtype, count in partial_counts.items():
+                counts[rtype] = counts.get(rtype, 0) + count
+                total += count
+
+        # Referenced resources can be in any file, so resolve once all are read
+        references = ReferenceIndex(fhir.REFERENCE_TARGETS)
+        for resource_type in fhir.REFERENCE_TARGETS:
+            references.add_all(result[fhir.RAW_RESOURCE_KEYS[resource_type]])
+        fhir.resolve_references(result, references)
+        fhir.stage_seen(seen_keys)
+
+        fhir._log_counts(total, counts)
+        return result
+
+    def resolve_manifest(self, manifest_path: Path) -> List[Path]:
+        """
+        Resolve the NDJSON files listed in a Bulk Data manifest.
+
+        Output URLs are mapped onto files next to the manifest by file name,
+        falling back to `<resourceType>.ndjson`.
+
+        Args:
+            manifest_path: Path to manifest.json
+
+        Returns:
+            List of existing NDJSON file paths, in manifest order
+        """
+        manifest = self._load_manifest(manifest_path)
+        base_dir = manifest_path.parent
+        files = []
+
+        for output in manifest.get('output', []):
+            url_name = Path(urlparse(output.get('url', '')).path).name
+            candidates = [base_dir / url_name] if url_name else []
+            if output.get('type'):
+                candidates.append(base_dir / f"{output['type']}.ndjson")
+
+            found = next((c for c in candidates if c.is_file()), None)
+            if found is None:
+                self.logger.warning(f"Manifest output not found locally: {output.get('url')}")
+            elif found not in files:
+                files.append(found)
+
+        return files
+
+    @classmethod
+    def group_exports(cls, ndjson_files: List[Path]) -> List[Path]:
+        """
+        Collapse NDJSON files that belong to a Bulk Data export into its manifest.
+
+        Args:
+            ndjson_files: NDJSON file paths
+
+        Returns:
+            Manifest paths for exports, plus any standalone NDJSON files
+        """
+        inputs = []
+        seen_manifests = set()
+
+        for ndjson_file in ndjson_files:
+            manifest = ndjson_file.parent / cls.MANIFEST_NAME
+            if manifest.is_file():
+                if manifest not in seen_manifests:
+                    seen_manifests.add(manifest)
+                    inputs.append(manifest)
+            else:
+                inputs.append(ndjson_file)
+
+        return inputs
+
+    def _load_manifest(self, manifest_path: Path) -> Dict[str, Any]:
+        """Load a Bulk Data manifest."""
+        return json_codec.load_file(manifest_path)
+
+    def _iter_chunks(self, ndjson_files: List[Path]) -> Iterator[Chunk]:
+        """Read NDJSON files line by line in fixed-size chunks."""
+        for ndjson_file in ndjson_files:
+            chunk = Chunk(str(ndjson_file), [], [])
+            offset = 0
+            with open(ndjson_file, 'rb') as f:
+                for line in f:
+                    line_offset = offset
+                    offset += len(line)
+                    if not line.strip():
+                        continue
+                    chunk.offsets.append(line_offset)
+                    chunk.lines.append(line)
+                    if len(chunk.lines) >= self.chunk_size:
+                        yield chunk
+                        chunk = Chunk(str(ndjson_file), [], [])
+            if chunk.lines:
+                yield chunk
+
+    def _extract_chunks(
+        self,
+        ndjson_files: List[Path],
+        fhir: FHIRIngestor,
+        seen_keys: Set[str]
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, int]]]:
+        """
+        Extract chunks in order, spreading them across worker processes.
+
+        At most two chunks per worker are in flight so memory stays bounded
+        regardless of export size.
+        """
+        chunks = self._iter_chunks(ndjson_files)
+
+        if self.seen_index is not None:
+            for chunk in chunks:
+                yield _extract_chunk(chunk, self.lean, fhir, seen_keys)
+            return
+
+        if self.max_workers <= 1:
+            for chunk in chunks:
+                yield _extract_chunk(chunk, self.lean)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_extract_chunk, chunk, self.lean))
+                if len(pending) >= self.max_workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _merge_partial(self, result: Dict[str, Any], partial: Dict[str, Any]) -> None:
+        """Merge a chunk's partial result into the overall result."""
+        for key, value in partial.items():
+            if key == 'source_file':
+                continue
+            if key == 'patient':
+                if result['patient'] is None:
+                    result['patient'] = value
+            else:
+                result[key].extend(value)
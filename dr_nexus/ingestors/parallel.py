@@ -0,0 +1,239 @@
+"""Parallel multi-file ingestion across worker processes."""
+
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+from dr_nexus.ingestors.base import BaseIngestor
+from dr_nexus.ingestors.cache import ParsedDocumentCache
+from dr_nexus.ingestors.ccda_ingestor import CCDAIngestor
+from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+from dr_nexus.models.document import DocumentType
+
+
+logger = logging.getLogger(__name__)
+
+# Ingestor classes used for each document type by default
+DEFAULT_INGESTORS: Dict[DocumentType, Type[BaseIngestor]] = {
+    DocumentType.FHIR_BUNDLE: FHIRIngestor,
+    DocumentType.CCDA: CCDAIngestor,
+}
+
+IngestJob = Tuple[DocumentType, Path]
+
+
+class IngestResult(NamedTuple):
+    """Outcome of ingesting a single file."""
+    filepath: Path
+    document_type: DocumentType
+    data: Optional[Dict[str, Any]]
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def skipped(self) -> bool:
+        """True if the ingestor declined the file."""
+        return self.data is None and self.error is None
+
+
+# Per-process ingestor instances keyed by (class, options), reused across batches
+_worker_ingestors: Dict[Tuple, BaseIngestor] = {}
+
+
+def _ingest_batch(
+    batch: List[Tuple[Type[BaseIngestor], Dict[str, Any], DocumentType, Path]],
+    cache: Optional[ParsedDocumentCache] = None
+) -> List[IngestResult]:
+    """
+    Ingest a batch of files.
+
+    Runs in worker processes, so it must stay a module-level function.
+    Failures are captured per file so one bad document does not lose the
+    rest of its batch. Cache lookups also happen here so content hashing is
+    spread across workers.
+
+    Args:
+        batch: (ingestor class, constructor options, document type, path) tuples
+        cache: Optional parsed-document cache
+
+    Returns:
+        One IngestResult per input, in input order
+    """
+    results = []
+
+    for ingestor_cls, options, doc_type, filepath in batch:
+        key = (ingestor_cls, tuple(sorted(options.items())))
+        ingestor = _worker_ingestors.get(key)
+        if ingestor is None:
+            ingestor = ingestor_cls(**options)
+            _worker_ingestors[key] = ingestor
+
+        try:
+            cache_key = None
+            if cache is not None:
+                cache_key = cache.make_key(filepath, ingestor_cls, options)
+                data = cache.get(cache_key)
+                if data is not None:
+                    results.append(IngestResult(filepath, doc_type, data, cached=True))
+                    continue
+
+            if not ingestor.can_ingest(filepath):
+                results.append(IngestResult(filepath, doc_type, None))
+                continue
+
+            data = ingestor.ingest(filepath)
+            if cache_key is not None:
+                cache.put(cache_key, data)
+            results.append(IngestResult(filepath, doc_type, data))
+        except Exception as e:
+            results.append(IngestResult(filepath, doc_type, None, f"{type(e).__name__}: {e}"))
+
+    return results
+
+
+class ParallelIngestionEngine:
+    """Run ingestors over many files across CPU cores in fixed-size batches."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        batch_size: int = 10,
+        ingestor_options: Optional[Dict[DocumentType, Dict[str, Any]]] = None,
+        cache: Optional[ParsedDocumentCache] = None
+    ) -> None:
+        """
+        Initialize the engine.
+
+        Args:
+            max_workers: Number of worker processes (1 runs inline)
+            batch_size: Number of files sent to a worker per task
+            ingestor_options: Constructor keyword arguments per document type
+            cache: Optional parsed-document cache for unchanged files
+        """
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.ingestor_options = ingestor_options or {}
+        self.cache = cache
+        self.ingestors: Dict[DocumentType, Type[BaseIngestor]] = dict(DEFAULT_INGESTORS)
+        self.cache_hits = 0
+        self.cache_lookups = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Any,
+        cache: Optional[ParsedDocumentCache] = None
+    ) -> 'ParallelIngestionEngine':
+        """
+        Create an engine with the worker and ingestor settings from the configuration.
+
+        Args:
+            config: Application Config
+            cache: Optional parsed-document cache
+
+        Returns:
+            Configured ParallelIngestionEngine
+        """
+        return cls(
+            max_workers=config.max_workers,
+            batch_size=config.batch_size,
+            ingestor_options={
+                DocumentType.FHIR_BUNDLE: {
+                    'stream_threshold_bytes': config.fhir_stream_threshold_mb * 1024 * 1024,
+                    'lean': config.fhir_lean
+                },
+                DocumentType.NDJSON: {'lean': config.fhir_lean},
+                DocumentType.CCDA: {'streaming': True}
+            },
+            cache=cache
+        )
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Fraction of cache lookups served from the cache."""
+        return self.cache_hits / self.cache_lookups if self.cache_lookups else 0.0
+
+    def register(self, doc_type: DocumentType, ingestor_cls: Type[BaseIngestor]) -> None:
+        """
+        Register the ingestor class used for a document type.
+
+        Args:
+            doc_type: Document type handled by the ingestor
+            ingestor_cls: Importable BaseIngestor subclass
+        """
+        self.ingestors[doc_type] = ingestor_cls
+
+    def imap(self, jobs: Iterable[IngestJob]) -> Iterator[IngestResult]:
+        """
+        Ingest files in parallel, yielding results in input order.
+
+        Only a bounded number of batches is in flight at once, so callers can
+        consume results as a stream without holding every payload in memory.
+
+        Args:
+            jobs: (document type, path) pairs
+
+        Yields:
+            IngestResult for each job, in the same order as `jobs`
+        """
+        for result in self._imap_batches(self._iter_batches(jobs)):
+            if self.cache is not None and (result.data is not None or result.cached):
+                self.cache_lookups += 1
+                self.cache_hits += result.cached
+            yield result
+
+        if self.cache is not None:
+            self.cache.evict()
+
+    def _imap_batches(self, batches: Iterator[List]) -> Iterator[IngestResult]:
+        """Run batches inline or across the process pool, preserving order."""
+        if self.max_workers == 1:
+            for batch in batches:
+                yield from _ingest_batch(batch, self.cache)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            try:
+                for batch in batches:
+                    pending.append(executor.submit(_ingest_batch, batch, self.cache))
+                    if len(pending) >= self.max_workers * 2:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            except GeneratorExit:
+                # The consumer stopped early: drop batches that have not started
+                for future in pending:
+                    future.cancel()
+                raise
+
+    def ingest(self, jobs: Iterable[IngestJob]) -> List[IngestResult]:
+        """
+        Ingest files in parallel.
+
+        Args:
+            jobs: (document type, path) pairs
+
+        Returns:
+            List of IngestResult in input order
+        """
+        return list(self.imap(jobs))
+
+    def _iter_batches(
+        self,
+        jobs: Iterable[IngestJob]
+    ) -> Iterator[List[Tuple[Type[BaseIngestor], Dict[str, Any], DocumentType, Path]]]:
+        """Group jobs into batches of `batch_size`."""
+        batch = []
+        for doc_type, filepath in jobs:
+            if doc_type not in self.ingestors:
+                raise ValueError(f"No ingestor registered for {doc_type.value}")
+            options = self.ingestor_options.get(doc_type, {})
+            batch.append((self.ingestors[doc_type], options, doc_type, Path(filepath)))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -0,0 +1,134 @@
+"""Persistent index of FHIR resource versions already ingested."""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+from dr_nexus.utils import json_codec
+
+
+logger = logging.getLogger(__name__)
+
+
+def resource_key(resource: Dict[str, Any]) -> Optional[str]:
+    """
+    Identify one version of a FHIR resource.
+
+    The version is `meta.versionId`, or `meta.lastUpdated` when the server
+    does not version resources.
+
+    Args:
+        resource: FHIR resource
+
+    Returns:
+        "ResourceType/id/version", or None if the resource has no id or no
+        version (its content cannot be assumed unchanged)
+    """
+    meta = resource.get('meta')
+    if not isinstance(meta, dict) or not resource.get('id'):
+        return None
+    version = meta.get('versionId') or meta.get('lastUpdated')
+    if not version:
+        return None
+    return f"{resource.get('resourceType')}/{resource['id']}/{version}"
+
+
+class SeenResourceIndex:
+    """
+    Set of FHIR resource versions already merged into a knowledge base.
+
+    Overlapping downloads repeat the same resources; ingestors consult the
+    index to skip them before building any model. Keys found while ingesting
+    are staged and only become permanent with `commit`, once the knowledge
+    base holding them has been saved, so a failed merge never hides a
+    resource from the next attempt.
+
+    The index is stored as JSON together with a scope (normally the
+    knowledge base path); an index saved for another scope is not reused.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: Optional[Path] = None, scope: str = '') -> None:
+        """
+        Initialize the index, loading it from `path` if it exists.
+
+        Args:
+            path: Where the index is read from and written to (None keeps it in memory)
+            scope: What the index describes; a saved index with another scope is ignored
+        """
+        self.path = Path(path) if path else None
+        self.scope = scope
+        self._keys: Set[str] = self._load()
+        self._staged: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys or key in self._staged
+
+    def stage(self, keys: Iterable[str]) -> None:
+        """
+        Mark keys as seen until the next `commit` or `rollback`.
+
+        Args:
+            keys: Keys from `resource_key`
+        """
+        self._staged.update(keys)
+
+    def commit(self) -> None:
+        """Make staged keys permanent and save the index."""
+        if not self._staged:
+            return
+        self._keys |= self._staged
+        self._staged = set()
+        self.save()
+
+    def rollback(self) -> None:
+        """Forget keys staged since the last commit."""
+        self._staged = set()
+
+    def clear(self) -> None:
+        """Forget every key, for example when the knowledge base is recreated."""
+        self._keys = set()
+        self._staged = set()
+        self.save()
+
+    def save(self) -> None:
+        """Write the committed keys atomically."""
+        if self.path is None:
+            return
+
+        index = {
+            'version': self.FORMAT_VERSION,
+            'scope': self.scope,
+            'keys': sorted(self._keys),
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json_codec.dumps(index))
+            os.replace(tmp_name, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to write seen-resource index {self.path}: {e}")
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def _load(self) -> Set[str]:
+        """Load saved keys if the index exists and matches this scope."""
+        if self.path is None or not self.path.exists():
+            return set()
+
+        try:
+            index = json_codec.load_file(self.path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable seen-resource index {self.path}: {e}")
+            return set()
+
+        if index.get('version') != self.FORMAT_VERSION or index.get('scope') != self.scope:
+            return set()
+        return set(index.get('keys', []))
@@ -0,0 +1,98 @@
+"""Compact references to FHIR resources in their source files."""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from dr_nexus.utils import json_codec
+
+
+def make_source_ref(
+    source_file: str,
+    resource: Dict[str, Any],
+    entry: Optional[int] = None,
+    offset: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Describe where a resource can be read back from.
+
+    Args:
+        source_file: File the resource was read from
+        resource: FHIR resource
+        entry: Index of the resource's entry in a Bundle
+        offset: Byte offset of the resource's line in an NDJSON file
+
+    Returns:
+        Source reference with `source_file`, `resource_type`, `id` and
+        either `entry` or `offset`
+    """
+    source_ref = {
+        'source_file': source_file,
+        'resource_type': resource.get('resourceType'),
+        'id': resource.get('id'),
+    }
+    if offset is not None:
+        source_ref['offset'] = offset
+    else:
+        source_ref['entry'] = entry
+    return source_ref
+
+
+def fetch_resource(source_ref: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Read the original FHIR resource a source reference points at.
+
+    NDJSON references seek straight to the resource's line. Bundle references
+    use the entry index, falling back to a search by type and id if the
+    bundle was rewritten since.
+
+    Args:
+        source_ref: Reference from `make_source_ref` (as stored under
+            'source_ref' by a lean FHIRIngestor)
+
+    Returns:
+        FHIR resource
+
+    Raises:
+        FileNotFoundError: If the source file no longer exists
+        ValueError: If the file no longer holds the resource
+    """
+    filepath = Path(source_ref['source_file'])
+
+    if 'offset' in source_ref:
+        with open(filepath, 'rb') as f:
+            f.seek(source_ref['offset'])
+            line = f.readline()
+        try:
+            resource = json_codec.loads(line)
+        except json_codec.JSONDecodeError:
+            resource = None
+        if _matches(resource, source_ref):
+            return resource
+    else:
+        bundle = json_codec.load_file(filepath)
+        entries = bundle.get('entry', []) if isinstance(bundle, dict) else []
+
+        entry = source_ref.get('entry')
+        if isinstance(entry, int) and 0 <= entry < len(entries):
+            resource = entries[entry].get('resource')
+            if _matches(resource, source_ref):
+                return resource
+
+        if source_ref.get('id') is not None:
+            for candidate in entries:
+                resource = candidate.get('resource')
+                if _matches(resource, source_ref):
+                    return resource
+
+    raise ValueError(
+        f"{source_ref.get('resource_type')}/{source_ref.get('id')} not found in {filepath}"
+    )
+
+
+def _matches(resource: Any, source_ref: Dict[str, Any]) -> bool:
+    """Check that a resource is the one a source reference describes."""
+    return (
+        isinstance(resource, dict)
+        and resource.get('resourceType') == source_ref.get('resource_type')
+        and resource.get('id') == source_ref.get('id')
+    )
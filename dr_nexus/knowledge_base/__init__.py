@@ -1,8 +1,14 @@
 """Knowledge base management and merging."""
 
-from dr_nexus.knowledge_base.kb_schema import KnowledgeBase, Metadata, PatientProfile
-from dr_nexus.knowledge_base.kb_loader import KBLoader
-from dr_nexus.knowledge_base.kb_merger import KBMerger
+from typing import TYPE_CHECKING
+
+from dr_nexus.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from dr_nexus.knowledge_base.kb_schema import KnowledgeBase, Metadata, PatientProfile
+    from dr_nexus.knowledge_base.kb_loader import KBLoader
+    from dr_nexus.knowledge_base.kb_merger import KBMerger
+    from dr_nexus.knowledge_base.checkpoint import CheckpointJournal
 
 __all__ = [
     "KnowledgeBase",
@@ -10,4 +16,14 @@ __all__ = [
     "PatientProfile",
     "KBLoader",
     "KBMerger",
+    "CheckpointJournal",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "KnowledgeBase": "dr_nexus.knowledge_base.kb_schema",
+    "Metadata": "dr_nexus.knowledge_base.kb_schema",
+    "PatientProfile": "dr_nexus.knowledge_base.kb_schema",
+    "KBLoader": "dr_nexus.knowledge_base.kb_loader",
+    "KBMerger": "dr_nexus.knowledge_base.kb_merger",
+    "CheckpointJournal": "dr_nexus.knowledge_base.checkpoint",
+})
@@ -0,0 +1,200 @@
+"""Append-only checkpoint journal for resumable knowledge base builds."""
+
+import logging
+import os
+import pickle
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Big-endian payload length preceding every record
+_LENGTH = struct.Struct('>I')
+
+
+class CheckpointJournal:
+    """
+    Journal of documents processed by a build and their extracted payloads.
+
+    Each record is a length-prefixed, zlib-compressed pickle appended and
+    flushed as soon as a document is processed, so a crash loses at most the
+    record being written. A torn record at the end of the file is dropped
+    when the journal is resumed.
+
+    The first record describes the run (for example the data directory); a
+    journal written for a different run is never resumed. Payloads are read
+    back lazily by offset, so resuming does not hold every payload in memory.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initialize the journal.
+
+        Args:
+            path: Journal file path
+        """
+        self.path = Path(path)
+        self._file = None
+        self._index: Dict[Tuple[str, str], Tuple[Tuple[int, int], int]] = {}
+
+    def __enter__(self) -> 'CheckpointJournal':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def start(self, run_info: Dict[str, Any]) -> None:
+        """
+        Start a new journal, discarding any previous one.
+
+        Args:
+            run_info: Description of the run, compared on resume
+        """
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._index = {}
+        self._file = open(self.path, 'wb')
+        self._append({'kind': 'run', 'run_info': run_info})
+
+    def resume(self, run_info: Dict[str, Any]) -> int:
+        """
+        Reopen an existing journal for the same run and keep appending to it.
+
+        Starts a new journal instead if none exists, it is unreadable, or it
+        was written for a different run.
+
+        Args:
+            run_info: Description of the run, compared with the journal's
+
+        Returns:
+            Number of documents recovered from the journal
+        """
+        self.close()
+        self._index = {}
+
+        if not self.path.exists():
+            self.start(run_info)
+            return 0
+
+        good_end = 0
+        header = None
+        with open(self.path, 'rb') as f:
+            for offset, end, record in self._iter_records(f):
+                if header is None:
+                    header = record
+                elif record.get('kind') == 'document':
+                    key = (record['stage'], record['source'])
+                    self._index[key] = (record['fingerprint'], offset)
+                good_end = end
+
+        if header is None or header.get('kind') != 'run' or header.get('run_info') != run_info:
+            logger.info(f"Checkpoint journal {self.path} belongs to another run, starting over")
+            self.start(run_info)
+            return 0
+
+        # Drop a torn record left by a crash mid-write
+        self._file = open(self.path, 'r+b')
+        self._file.truncate(good_end)
+        self._file.seek(good_end)
+
+        logger.info(f"Resuming from checkpoint journal with {len(self._index)} documents")
+        return len(self._index)
+
+    def contains(self, stage: str, source: Path) -> bool:
+        """Check whether an unchanged source file has been checkpointed."""
+        entry = self._index.get((stage, str(source)))
+        return entry is not None and entry[0] == self._fingerprint(source)
+
+    def get(self, stage: str, source: Path) -> Optional[Dict[str, Any]]:
+        """
+        Load a checkpointed payload if the source file is unchanged.
+
+        Args:
+            stage: Build stage that processed the document (e.g. 'fhir')
+            source: Source document path
+
+        Returns:
+            Extracted payload, or None if missing or the file has changed
+        """
+        if not self.contains(stage, source):
+            return None
+
+        offset = self._index[(stage, str(source))][1]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            record = next(self._iter_records(f), None)
+        return record[2]['data'] if record else None
+
+    def record(self, stage: str, source: Path, data: Dict[str, Any]) -> None:
+        """
+        Append a processed document to the journal.
+
+        Args:
+            stage: Build stage that processed the document
+            source: Source document path
+            data: Extracted payload
+        """
+        if self._file is None:
+            raise RuntimeError("Checkpoint journal is not open")
+
+        offset = self._file.tell()
+        fingerprint = self._fingerprint(source)
+        self._append({
+            'kind': 'document',
+            'stage': stage,
+            'source': str(source),
+            'fingerprint': fingerprint,
+            'data': data,
+        })
+        self._index[(stage, str(source))] = (fingerprint, offset)
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the journal after a successful build."""
+        self.close()
+        self._index = {}
+        self.path.unlink(missing_ok=True)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Write one record and flush it to the OS."""
+        payload = zlib.compress(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        self._file.write(_LENGTH.pack(len(payload)) + payload)
+        self._file.flush()
+
+    @staticmethod
+    def _iter_records(f) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Yield (start offset, end offset, record) until EOF or a torn record."""
+        while True:
+            offset = f.tell()
+            prefix = f.read(_LENGTH.size)
+            if len(prefix) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(prefix)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            try:
+                record = pickle.loads(zlib.decompress(payload))
+            except (zlib.error, pickle.UnpicklingError, EOFError, AttributeError):
+                return
+            yield offset, f.tell(), record
+
+    @staticmethod
+    def _fingerprint(source: Path) -> Tuple[int, int]:
+        """Size and modification time identifying a version of a source file."""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return (-1, -1)
+        return (stat.st_size, stat.st_mtime_ns)
@@ -1,6 +1,5 @@
 """Knowledge base loader."""
 
-import json
 from pathlib import Path
 from typing import Optional
 import logging
@@ -8,6 +7,7 @@ import logging
 from pydantic import ValidationError
 
 from dr_nexus.knowledge_base.kb_schema import KnowledgeBase
+from dr_nexus.utils import json_codec
 
 
 logger = logging.getLogger(__name__)
@@ -29,7 +29,7 @@ class KBLoader:
 
         Raises:
             ValidationError: If JSON doesn't match schema
-            json.JSONDecodeError: If JSON is malformed
+            json_codec.JSONDecodeError: If JSON is malformed
         """
         if not filepath.exists():
             logger.warning(f"Knowledge base file not found: {filepath}")
@@ -37,11 +37,12 @@ class KBLoader:
 
         logger.info(f"Loading knowledge base from: {filepath}")
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json_codec.load_file(filepath)
 
         try:
-            kb = KnowledgeBase(**data)
+            # Validation allocates as heavily as decoding
+            with json_codec.paused_gc():
+                kb = KnowledgeBase.model_validate(data)
             logger.info(f"Loaded KB with {len(kb.timeline)} timeline events")
             return kb
         except ValidationError as e:
@@ -99,6 +100,6 @@ class KBLoader:
         try:
             kb = KBLoader.load(filepath)
             return kb is not None
-        except (ValidationError, json.JSONDecodeError) as e:
+        except (ValidationError, json_codec.JSONDecodeError) as e:
             logger.error(f"Validation failed: {e}")
             return False
@@ -9,6 +9,7 @@ from dr_nexus.models.condition import Condition
 from dr_nexus.models.timeline import TimelineEvent
 from dr_nexus.models.symptom import Symptom
 from dr_nexus.models.action_item import ActionItem, UnresolvedQuestion
+from dr_nexus.utils.temporal import HOUR, epoch_key
 
 
 logger = logging.getLogger(__name__)
@@ -238,7 +239,7 @@ class KBMerger:
                 self.logger.debug(f"Duplicate event skipped: {event.summary}")
 
         # Sort chronologically
-        merged.sort(key=lambda e: e.date)
+        merged.sort(key=lambda e: epoch_key(e.date))
 
         return merged
 
@@ -248,7 +249,7 @@ class KBMerger:
 
         Uses date (rounded to hour), type, and first 100 chars of summary.
         """
-        date_key = event.date.replace(minute=0, second=0, microsecond=0)
+        date_key = epoch_key(event.date) // HOUR
         summary_key = event.summary[:100].lower().strip()
         return (date_key, event.event_type, summary_key)
 
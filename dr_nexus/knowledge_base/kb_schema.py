@@ -1,15 +1,17 @@
 """Knowledge Base schema definitions."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
+from dr_nexus.extractors.timeline_index import TimelineIndex
 from dr_nexus.models.patient import PatientDemographics
 from dr_nexus.models.condition import Condition, ImplantedDevice, Allergy
 from dr_nexus.models.timeline import TimelineEvent
 from dr_nexus.models.symptom import Symptom
 from dr_nexus.models.action_item import ActionItem, UnresolvedQuestion
+from dr_nexus.utils.temporal import epoch_key
 
 
 class Metadata(BaseModel):
@@ -74,9 +76,39 @@ class KnowledgeBase(BaseModel):
         description="Unresolved questions and conflicts"
     )
 
+    # Timeline index and the (list, length) it was built from
+    _timeline_index: Optional[TimelineIndex] = PrivateAttr(default=None)
+    _indexed_timeline: Optional[Tuple[List[TimelineEvent], int]] = PrivateAttr(default=None)
+
+    def timeline_index(self) -> TimelineIndex:
+        """
+        Get an index over the timeline for date-range and filtered lookups.
+
+        The index is built on first use and reused until `timeline` is
+        replaced or changes length. Call `reset_timeline_index` after
+        editing events in place.
+
+        Returns:
+            TimelineIndex over the timeline events
+        """
+        indexed = self._indexed_timeline
+        if (
+            self._timeline_index is None
+            or indexed[0] is not self.timeline
+            or indexed[1] != len(self.timeline)
+        ):
+            self._timeline_index = TimelineIndex(self.timeline)
+            self._indexed_timeline = (self.timeline, len(self.timeline))
+        return self._timeline_index
+
+    def reset_timeline_index(self) -> None:
+        """Drop the timeline index so the next lookup rebuilds it."""
+        self._timeline_index = None
+        self._indexed_timeline = None
+
     def sort_timeline(self) -> None:
         """Sort timeline events chronologically."""
-        self.timeline.sort(key=lambda e: e.date)
+        self.timeline.sort(key=lambda e: epoch_key(e.date))
 
     def get_active_conditions(self) -> List[Condition]:
         """Get list of active conditions."""
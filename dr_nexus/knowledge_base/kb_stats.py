@@ -0,0 +1,63 @@
+"""Knowledge base statistics read directly from the JSON file."""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict
+
+from dr_nexus.utils import json_codec
+
+
+def read_stats(filepath: Path) -> Dict[str, Any]:
+    """
+    Summarize a knowledge base file without building its models.
+
+    Reads the saved JSON directly rather than going through `KBLoader.load`,
+    which imports pydantic and validates every record. This keeps frequent
+    callers (such as monitoring `dr-nexus stats`) fast; use
+    `KBLoader.validate` to check a file against the schema.
+
+    Args:
+        filepath: Path to knowledge base JSON file
+
+    Returns:
+        Dictionary of summary values
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a knowledge base
+    """
+    data = json_codec.load_file(filepath)
+
+    try:
+        metadata = data['metadata']
+        profile = data['patient_profile']
+        demographics = profile['demographics']
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Not a knowledge base: missing {e}") from e
+
+    age = demographics.get('age')
+    if age is None and demographics.get('date_of_birth'):
+        dob = date.fromisoformat(demographics['date_of_birth'])
+        today = date.today()
+        age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+    generated_at = metadata.get('generated_at')
+    if generated_at:
+        generated_at = datetime.fromisoformat(generated_at)
+
+    return {
+        'version': metadata.get('version'),
+        'generated_at': generated_at,
+        'source_files_count': metadata.get('source_files_count'),
+        'patient_name': demographics.get('name'),
+        'age': age,
+        'timeline_events': len(data.get('timeline', [])),
+        'chronic_conditions': len(profile.get('chronic_conditions', [])),
+        'active_symptoms': sum(
+            1 for s in data.get('symptom_registry', []) if s.get('status') == 'active'
+        ),
+        'pending_actions': sum(
+            1 for a in data.get('action_items', []) if a.get('status') == 'pending'
+        ),
+        'unresolved_questions': len(data.get('unresolved_questions', [])),
+    }
@@ -0,0 +1,292 @@
+"""Continuous incremental ingestion of new medical records into a live knowledge base."""
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dr_nexus.extractors.timeline_builder import TimelineBuilder
+from dr_nexus.ingestors.discovery import FileDiscovery
+from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+from dr_nexus.ingestors.ndjson_ingestor import NDJSONIngestor
+from dr_nexus.ingestors.parallel import ParallelIngestionEngine
+from dr_nexus.ingestors.seen_index import SeenResourceIndex
+from dr_nexus.knowledge_base.kb_loader import KBLoader
+from dr_nexus.knowledge_base.kb_merger import KBMerger
+from dr_nexus.models.document import DocumentType
+from dr_nexus.output.json_generator import JSONGenerator
+
+
+logger = logging.getLogger(__name__)
+
+# Discovery categories the watcher ingests, mapped to engine document types
+_ENGINE_CATEGORIES = {
+    'fhir': DocumentType.FHIR_BUNDLE,
+    'ccda': DocumentType.CCDA,
+}
+
+
+class KBWatcher:
+    """
+    Poll a data directory and merge new or modified documents into a knowledge base.
+
+    Each poll is a manifest-backed discovery scan, so only directories whose
+    contents changed are listed again. Changes are collected until the
+    directory has been quiet for `debounce_seconds` (or `max_batch` files are
+    waiting), then ingested together, merged with `KBMerger.merge` and saved.
+    Removed files are logged but never removed from the knowledge base.
+
+    With a SeenResourceIndex, FHIR resource versions already merged are
+    skipped at ingestion. FHIR bundles are then ingested in this process,
+    where the index lives, rather than through the engine's workers.
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        kb_path: Path,
+        discovery: FileDiscovery,
+        engine: Optional[ParallelIngestionEngine] = None,
+        poll_interval: float = 2.0,
+        debounce_seconds: float = 3.0,
+        max_batch: int = 100,
+        full_scan_interval: float = 300.0,
+        seen_index: Optional[SeenResourceIndex] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            data_dir: Directory to watch
+            kb_path: Knowledge base JSON file to update
+            discovery: File discovery with a manifest dedicated to this watcher
+            engine: Ingestion engine (defaults to a single inline worker)
+            poll_interval: Seconds between polls
+            debounce_seconds: Quiet period after the last change before a batch is applied
+            max_batch: Number of waiting files that triggers a batch immediately
+            full_scan_interval: Seconds between full scans, which also catch files
+                rewritten in place (0 disables them)
+            seen_index: Index of FHIR resource versions already in the knowledge base
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        self.data_dir = Path(data_dir)
+        self.kb_path = Path(kb_path)
+        self.discovery = discovery
+        self.engine = engine or ParallelIngestionEngine(max_workers=1)
+        self.poll_interval = poll_interval
+        self.debounce_seconds = debounce_seconds
+        self.max_batch = max(1, max_batch)
+        self.full_scan_interval = full_scan_interval
+        self.seen_index = seen_index
+        self.clock = clock
+        self.sleep = sleep
+        self.merger = KBMerger()
+
+        self.pending: Dict[Path, str] = {}
+        self._last_change: Optional[float] = None
+        self._last_full_scan: Optional[float] = None
+
+    def start(self) -> int:
+        """
+        Take the initial snapshot of the data directory.
+
+        Every directory is listed. If this watcher's manifest already exists,
+        files added or modified since the previous session are queued;
+        otherwise the current tree is taken as already reflected in the
+        knowledge base.
+
+        Returns:
+            Number of files queued for ingestion
+        """
+        has_manifest = self.discovery.manifest_path is not None and self.discovery.manifest_path.exists()
+        queued = self._scan(full=True)
+        if not has_manifest:
+            self.pending.clear()
+            self._last_change = None
+            logger.info(f"Watching {self.data_dir} (baseline snapshot taken)")
+            return 0
+
+        logger.info(f"Watching {self.data_dir} ({queued} files changed since last session)")
+        return queued
+
+    def poll(self) -> int:
+        """
+        Scan once and apply the pending batch if it is due.
+
+        Returns:
+            Number of files applied to the knowledge base by this poll
+        """
+        now = self.clock()
+        full = bool(self.full_scan_interval) and (
+            self._last_full_scan is None or now - self._last_full_scan >= self.full_scan_interval
+        )
+        self._scan(full=full)
+
+        if self._batch_due(self.clock()):
+            return self.flush()
+        return 0
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """
+        Poll until interrupted.
+
+        Args:
+            max_polls: Stop after this many polls (None runs forever)
+        """
+        self.start()
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.exception(f"Watch cycle failed, will retry: {e}")
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    self.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            logger.info("Watch interrupted")
+        finally:
+            if self.pending:
+                self.flush()
+
+    def flush(self) -> int:
+        """
+        Ingest all pending files and merge them into the knowledge base.
+
+        Returns:
+            Number of files ingested
+        """
+        batch = {path: category for path, category in self.pending.items() if path.exists()}
+        self.pending.clear()
+        self._last_change = None
+        if not batch:
+            return 0
+
+        logger.info(f"Applying {len(batch)} new or modified files")
+        if self.seen_index is not None and not self.kb_path.exists():
+            # A new knowledge base holds none of the resources seen before
+            self.seen_index.clear()
+        new_data, ingested = self._ingest(batch)
+        if not ingested:
+            return 0
+
+        try:
+            kb = KBLoader.load_or_create_new(self.kb_path)
+            merged = self.merger.merge(kb, new_data)
+            JSONGenerator.save(merged, self.kb_path, pretty=True)
+        except Exception:
+            # Keep the batch so the next poll retries it
+            self.pending.update(batch)
+            self._last_change = self.clock()
+            if self.seen_index is not None:
+                self.seen_index.rollback()
+            raise
+
+        if self.seen_index is not None:
+            self.seen_index.commit()
+
+        logger.info(
+            f"Knowledge base updated from {ingested} files: "
+            f"{len(merged.timeline) - len(kb.timeline)} new timeline events"
+        )
+        return ingested
+
+    def _scan(self, full: bool) -> int:
+        """Run discovery and queue added or changed files of supported types."""
+        files = self.discovery.scan(self.data_dir, full=full)
+        now = self.clock()
+        if full:
+            self._last_full_scan = now
+
+        categories = {f.path: f.category for f in files}
+        changes = self.discovery.changes
+        queued = 0
+        for path in changes.added + changes.changed:
+            category = categories.get(path)
+            if category in _ENGINE_CATEGORIES or category == 'ndjson':
+                self.pending[path] = category
+                queued += 1
+
+        for path in changes.removed:
+            self.pending.pop(path, None)
+            logger.info(f"Source file removed (history kept in knowledge base): {path}")
+
+        if queued:
+            self._last_change = now
+            logger.debug(f"Queued {queued} files, {len(self.pending)} pending")
+        return queued
+
+    def _batch_due(self, now: float) -> bool:
+        """Check whether the pending batch should be applied."""
+        if not self.pending:
+            return False
+        if len(self.pending) >= self.max_batch:
+            return True
+        return self._last_change is None or now - self._last_change >= self.debounce_seconds
+
+    def _ingest(self, batch: Dict[Path, str]) -> Tuple[Dict[str, Any], int]:
+        """Ingest a batch of files into merge-ready data."""
+        builder = TimelineBuilder()
+        new_data: Dict[str, Any] = {'conditions': [], 'devices': [], 'timeline_events': []}
+        ingested = 0
+
+        def add(data: Dict[str, Any], fhir_shaped: bool) -> None:
+            new_data['conditions'].extend(data.get('conditions', []))
+            new_data['devices'].extend(data.get('devices', []))
+            if fhir_shaped and data.get('patient') and 'patient' not in new_data:
+                new_data['patient'] = data['patient']
+            try:
+                if fhir_shaped:
+                    builder.build_from_fhir_data(data)
+                else:
+                    builder.build_from_ccda_data(data)
+            except Exception as e:
+                logger.error(f"Failed to build timeline from {data.get('source_file')}: {e}")
+
+        # The engine's workers and cache cannot consult the seen index
+        inline_fhir = self.seen_index is not None
+        jobs = [
+            (_ENGINE_CATEGORIES[category], path)
+            for path, category in batch.items()
+            if category in _ENGINE_CATEGORIES and not (inline_fhir and category == 'fhir')
+        ]
+        for result in self.engine.imap(jobs):
+            if result.error:
+                logger.error(f"Failed to process {result.filepath}: {result.error}")
+            elif not result.skipped:
+                add(result.data, result.document_type == DocumentType.FHIR_BUNDLE)
+                ingested += 1
+
+        if inline_fhir:
+            fhir_options = self.engine.ingestor_options.get(DocumentType.FHIR_BUNDLE, {})
+            fhir_ingestor = FHIRIngestor(seen_index=self.seen_index, **fhir_options)
+            for path, category in batch.items():
+                if category != 'fhir':
+                    continue
+                try:
+                    add(fhir_ingestor.ingest(path), True)
+                    ingested += 1
+                except Exception as e:
+                    logger.error(f"Failed to process {path}: {e}")
+
+        ndjson_files = [path for path, category in batch.items() if category == 'ndjson']
+        if ndjson_files:
+            ndjson_ingestor = NDJSONIngestor(
+                max_workers=self.engine.max_workers,
+                seen_index=self.seen_index,
+                **self.engine.ingestor_options.get(DocumentType.NDJSON, {})
+            )
+            for export_file in NDJSONIngestor.group_exports(ndjson_files):
+                try:
+                    add(ndjson_ingestor.ingest(export_file), True)
+                    ingested += 1
+                except Exception as e:
+                    logger.error(f"Failed to process {export_file}: {e}")
+
+        new_data['timeline_events'] = builder.events
+        new_data['source_files_count'] = ingested
+        return new_data, ingested
@@ -1,10 +1,15 @@
 """Data models for Dr. Nexus medical knowledge base."""
 
-from dr_nexus.models.patient import PatientDemographics, ContactInfo
-from dr_nexus.models.condition import Condition, ConditionStatus
-from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
-from dr_nexus.models.symptom import Symptom, SymptomStatus
-from dr_nexus.models.document import DocumentMetadata, DocumentType
+from typing import TYPE_CHECKING
+
+from dr_nexus.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from dr_nexus.models.patient import PatientDemographics, ContactInfo
+    from dr_nexus.models.condition import Condition, ConditionStatus
+    from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
+    from dr_nexus.models.symptom import Symptom, SymptomStatus
+    from dr_nexus.models.document import DocumentMetadata, DocumentType
 
 __all__ = [
     "PatientDemographics",
@@ -19,3 +24,17 @@ __all__ = [
     "DocumentMetadata",
     "DocumentType",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "PatientDemographics": "dr_nexus.models.patient",
+    "ContactInfo": "dr_nexus.models.patient",
+    "Condition": "dr_nexus.models.condition",
+    "ConditionStatus": "dr_nexus.models.condition",
+    "TimelineEvent": "dr_nexus.models.timeline",
+    "EventType": "dr_nexus.models.timeline",
+    "ClinicalSignificance": "dr_nexus.models.timeline",
+    "Symptom": "dr_nexus.models.symptom",
+    "SymptomStatus": "dr_nexus.models.symptom",
+    "DocumentMetadata": "dr_nexus.models.document",
+    "DocumentType": "dr_nexus.models.document",
+})
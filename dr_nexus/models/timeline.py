@@ -4,7 +4,9 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from dr_nexus.utils.temporal import to_utc_naive
 
 
 class EventType(str, Enum):
@@ -48,6 +50,12 @@ class TimelineEvent(BaseModel):
         description="Medical codes (ICD-10, CPT, SNOMED, etc.)"
     )
 
+    @field_validator('date')
+    @classmethod
+    def _canonical_date(cls, value: datetime) -> datetime:
+        """Store dates as naive UTC so events from any source compare."""
+        return to_utc_naive(value)
+
     model_config = {
         "json_schema_extra": {
             "examples": [
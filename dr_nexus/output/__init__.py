@@ -1,5 +1,16 @@
 """Output generation modules."""
 
-from dr_nexus.output.json_generator import JSONGenerator
+from typing import TYPE_CHECKING
 
-__all__ = ["JSONGenerator"]
+from dr_nexus.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from dr_nexus.output.json_generator import JSONGenerator
+
+__all__ = [
+    "JSONGenerator",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "JSONGenerator": "dr_nexus.output.json_generator",
+})
@@ -1,11 +1,13 @@
 """Generate JSON output for knowledge base."""
 
-import json
+import os
+import tempfile
 from pathlib import Path
 from datetime import datetime
 import logging
 
 from dr_nexus.knowledge_base.kb_schema import KnowledgeBase
+from dr_nexus.utils import json_codec
 
 
 logger = logging.getLogger(__name__)
@@ -19,6 +21,11 @@ class JSONGenerator:
         """
         Save knowledge base to JSON file.
 
+        The file is written by pydantic's JSON encoder. Values round-trip
+        exactly, but floats use its shortest notation: 1e-05 is written
+        as 0.00001, unlike the standard library json module. Compact output
+        (pretty=False) also has no spaces after separators.
+
         Args:
             kb: KnowledgeBase object
             filepath: Path to save JSON file
@@ -29,15 +36,20 @@ class JSONGenerator:
         # Ensure directory exists
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        # Convert to dict
-        kb_dict = kb.model_dump(mode='json')
+        # Serialize straight from the models; building an intermediate dict
+        # costs more than encoding it
+        payload = kb.model_dump_json(indent=2 if pretty else None).encode('utf-8')
 
-        # Save to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            if pretty:
-                json.dump(kb_dict, f, indent=2, ensure_ascii=False, default=str)
-            else:
-                json.dump(kb_dict, f, ensure_ascii=False, default=str)
+        # Write to a temporary file and swap it in, so readers of a live KB
+        # never see a partially written file
+        fd, tmp_name = tempfile.mkstemp(dir=filepath.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_name, filepath)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
 
         file_size = filepath.stat().st_size
         logger.info(f"Knowledge base saved ({file_size:,} bytes)")
@@ -77,9 +89,8 @@ class JSONGenerator:
             True if valid JSON, False otherwise
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                json.load(f)
+            json_codec.load_file(filepath)
             return True
-        except (json.JSONDecodeError, FileNotFoundError) as e:
+        except (json_codec.JSONDecodeError, FileNotFoundError) as e:
             logger.error(f"JSON validation failed: {e}")
             return False
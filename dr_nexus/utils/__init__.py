@@ -1,6 +1,19 @@
 """Utility modules."""
 
-from dr_nexus.utils.config import Config
-from dr_nexus.utils.logging_config import setup_logging
+from typing import TYPE_CHECKING
 
-__all__ = ["Config", "setup_logging"]
+from dr_nexus.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from dr_nexus.utils.config import Config
+    from dr_nexus.utils.logging_config import setup_logging
+
+__all__ = [
+    "Config",
+    "setup_logging",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "Config": "dr_nexus.utils.config",
+    "setup_logging": "dr_nexus.utils.logging_config",
+})
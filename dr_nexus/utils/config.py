@@ -40,6 +40,16 @@ class Config(BaseSettings):
     enable_ultrathink: bool = Field(default=True, alias="ENABLE_ULTRATHINK")
     batch_size: int = Field(default=10, alias="BATCH_SIZE")
     max_workers: int = Field(default=4, alias="MAX_WORKERS")
+    fhir_stream_threshold_mb: int = Field(default=64, alias="FHIR_STREAM_THRESHOLD_MB")
+    # Keep references to source FHIR resources instead of copying them into the KB
+    fhir_lean: bool = Field(default=False, alias="FHIR_LEAN")
+    enable_cache: bool = Field(default=True, alias="ENABLE_CACHE")
+    cache_max_mb: int = Field(default=512, alias="CACHE_MAX_MB")
+    watch_poll_seconds: float = Field(default=2.0, alias="WATCH_POLL_SECONDS")
+    watch_debounce_seconds: float = Field(default=3.0, alias="WATCH_DEBOUNCE_SECONDS")
+    watch_max_batch: int = Field(default=100, alias="WATCH_MAX_BATCH")
+    # Full-corpus C-CDA throughput the build is expected to sustain on each worker core
+    ccda_target_docs_per_sec_per_core: float = Field(default=25.0, alias="CCDA_TARGET_DOCS_PER_SEC_PER_CORE")
 
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
@@ -55,10 +65,37 @@ class Config(BaseSettings):
         extra="ignore"
     )
 
+    @property
+    def cache_dir(self) -> Path:
+        """Directory for the parsed-document cache."""
+        return self.knowledge_base_dir / "cache"
+
+    @property
+    def file_manifest_path(self) -> Path:
+        """Manifest of the data directory written by file discovery."""
+        return self.cache_dir / "file_manifest.json"
+
+    @property
+    def watch_manifest_path(self) -> Path:
+        """Manifest of the watched directory, separate from the build's."""
+        return self.cache_dir / "watch_manifest.json"
+
+    @property
+    def watch_seen_index_path(self) -> Path:
+        """FHIR resource versions the watcher has merged into the knowledge base."""
+        return self.cache_dir / "watch_seen_resources.json"
+
+    @property
+    def checkpoint_dir(self) -> Path:
+        """Directory for build checkpoint journals."""
+        return self.knowledge_base_dir / "checkpoints"
+
     def ensure_directories(self) -> None:
         """Ensure all configured directories exist."""
         self.knowledge_base_dir.mkdir(parents=True, exist_ok=True)
         (self.knowledge_base_dir / "history").mkdir(parents=True, exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
         self.logs_dir.mkdir(parents=True, exist_ok=True)
 
 
@@ -0,0 +1,109 @@
+"""JSON encoding and decoding, using orjson when it is installed."""
+
+import gc
+import json
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+# Name of the active backend, for logs and diagnostics
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# Raised for malformed input by either backend (orjson's error subclasses it)
+JSONDecodeError = json.JSONDecodeError
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+JSONInput = Union[bytes, bytearray, memoryview, str]
+
+
+def loads(data: JSONInput) -> Any:
+    """
+    Decode a JSON document.
+
+    Args:
+        data: UTF-8 bytes (a leading byte order mark is ignored) or text
+
+    Returns:
+        Decoded value
+
+    Raises:
+        JSONDecodeError: If the document is malformed
+    """
+    if not isinstance(data, str) and data[:3] == _UTF8_BOM:
+        data = memoryview(data)[3:]
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Encode a value as UTF-8 JSON.
+
+    Args:
+        obj: Value to encode
+        indent: Pretty-print with two-space indentation
+        default: Called for values the encoder does not support
+
+    Returns:
+        Encoded document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(
+        obj, indent=2 if indent else None, ensure_ascii=False, default=default
+    ).encode('utf-8')
+
+
+def load_file(filepath: Path) -> Any:
+    """
+    Decode a JSON file.
+
+    The file is memory-mapped and decoded straight from the mapping, so a
+    large document is never copied into an intermediate string. Garbage
+    collection is paused meanwhile: decoding only allocates, and collecting
+    repeatedly over millions of new objects dominates the cost otherwise.
+
+    Args:
+        filepath: Path to JSON file
+
+    Returns:
+        Decoded value
+
+    Raises:
+        OSError: If the file cannot be read
+        JSONDecodeError: If the file is not valid JSON
+    """
+    with open(filepath, 'rb') as f, paused_gc():
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return loads(f.read())
+        with mapping, memoryview(mapping) as view:
+            return loads(view)
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause cyclic garbage collection while building large object graphs."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
@@ -0,0 +1,39 @@
+"""Deferred imports for package-level re-exports."""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str,
+    exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build PEP 562 `__getattr__` and `__dir__` functions for a package.
+
+    Re-exported names are imported from their defining module on first
+    access and then cached on the package, so importing a package (or one
+    of its submodules) does not import every sibling module.
+
+    Args:
+        package: The package's `__name__`
+        exports: Mapping of exported name to the module that defines it
+
+    Returns:
+        Tuple of (__getattr__, __dir__) to assign in the package
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,187 @@
+"""Date and time normalization shared by ingestors and the timeline."""
+
+import re
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Every datetime leaving this module is naive and in UTC. Mixing naive and
+# aware datetimes makes comparisons raise, so offsets are applied here once
+# and dropped.
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Microseconds per hour, for bucketing epoch keys
+HOUR = 3600 * 1000 * 1000
+
+_MISSING = object()
+
+# HL7 v3 TS: YYYY[MM[DD[HH[MM[SS[.S...]]]]]][+/-ZZZZ]
+_HL7_TS = re.compile(
+    r'(\d{4})(\d{2})?(\d{2})?(\d{2})?(\d{2})?(\d{2})?(?:\.(\d{1,6})\d*)?(?:([+-])(\d{2})(\d{2}))?'
+)
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """
+    Convert a datetime to the canonical form: naive, in UTC.
+
+    Args:
+        value: Naive (assumed to be UTC already) or aware datetime
+
+    Returns:
+        Naive UTC datetime
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def normalize_datetime(value: Any) -> Optional[datetime]:
+    """
+    Normalize a date or time value to a naive UTC datetime.
+
+    Accepts ISO 8601 / FHIR values, including partial dates ("2020",
+    "2020-05") and a trailing Z, HL7 TS values ("20200515103000-0500",
+    "202005"), and date or datetime objects. Partial dates fall on the first
+    day of their period. Parsed strings are memoized.
+
+    Args:
+        value: Value to normalize
+
+    Returns:
+        Naive UTC datetime, or None if the value is missing or unparseable
+    """
+    if isinstance(value, str):
+        return _parse_text(value)
+    if isinstance(value, datetime):
+        return to_utc_naive(value)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return None
+
+
+def normalize_date(value: Any) -> Optional[date]:
+    """
+    Normalize a date or time value to a date (in UTC for timestamps).
+
+    Args:
+        value: Any value accepted by `normalize_datetime`
+
+    Returns:
+        date, or None if the value is missing or unparseable
+    """
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    normalized = normalize_datetime(value)
+    return normalized.date() if normalized is not None else None
+
+
+def normalize_datetimes(values: Iterable[Any]) -> List[Optional[datetime]]:
+    """
+    Normalize a batch of values, parsing each distinct string once.
+
+    Args:
+        values: Values accepted by `normalize_datetime`
+
+    Returns:
+        Normalized datetimes (None for unparseable values), in input order
+    """
+    parsed: Dict[str, Optional[datetime]] = {}
+    normalized = []
+    for value in values:
+        if isinstance(value, str):
+            result = parsed.get(value, _MISSING)
+            if result is _MISSING:
+                result = parsed[value] = _parse_text(value)
+            normalized.append(result)
+        else:
+            normalized.append(normalize_datetime(value))
+    return normalized
+
+
+def epoch_key(value: datetime) -> int:
+    """
+    Integer sort key for a datetime: microseconds since 1970-01-01 UTC.
+
+    Keys order exactly like the datetimes they come from, whether those
+    are naive (taken as UTC) or aware.
+
+    Args:
+        value: datetime
+
+    Returns:
+        Microseconds since the Unix epoch
+    """
+    if value.tzinfo is not None:
+        value = to_utc_naive(value)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_key(key: int) -> datetime:
+    """
+    Convert an epoch key back to a naive UTC datetime.
+
+    Args:
+        key: Microseconds since the Unix epoch
+
+    Returns:
+        Naive UTC datetime
+    """
+    return _EPOCH + timedelta(microseconds=key)
+
+
+def utc_now() -> datetime:
+    """Current time as a naive UTC datetime."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=1 << 16)
+def _parse_text(text: str) -> Optional[datetime]:
+    """Parse an ISO 8601 or HL7 TS string (memoized)."""
+    text = text.strip()
+    if len(text) < 4:
+        return None
+
+    if len(text) > 4 and text[4] == '-':
+        return _parse_iso(text)
+    return _parse_hl7(text)
+
+
+def _parse_iso(text: str) -> Optional[datetime]:
+    """Parse an ISO 8601 date or dateTime, including FHIR partial dates."""
+    try:
+        if len(text) == 7:
+            # FHIR partial date YYYY-MM
+            return datetime(int(text[:4]), int(text[5:7]), 1)
+        return to_utc_naive(datetime.fromisoformat(text))
+    except ValueError:
+        return None
+
+
+def _parse_hl7(text: str) -> Optional[datetime]:
+    """Parse an HL7 TS value; the offset is applied only when a time is present."""
+    match = _HL7_TS.fullmatch(text)
+    if match is None:
+        return None
+
+    year, month, day, hour, minute, second, fraction, sign, off_hours, off_minutes = match.groups()
+    try:
+        parsed = datetime(
+            int(year),
+            int(month or 1),
+            int(day or 1),
+            int(hour or 0),
+            int(minute or 0),
+            int(second or 0),
+            int(fraction.ljust(6, '0')) if fraction else 0
+        )
+    except ValueError:
+        return None
+
+    if sign and hour:
+        offset = timedelta(hours=int(off_hours), minutes=int(off_minutes))
+        parsed = parsed - offset if sign == '+' else parsed + offset
+    return parsed
@@ -1,21 +1,35 @@
 """Initial knowledge base build script."""
 
 import sys
+import time
 import argparse
+import itertools
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
 import logging
 
+from tqdm import tqdm
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dr_nexus.utils.config import get_config
 from dr_nexus.utils.logging_config import setup_logging
-from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
-from dr_nexus.ingestors.ccda_ingestor import CCDAIngestor
+from dr_nexus.ingestors.ndjson_ingestor import NDJSONIngestor
+from dr_nexus.ingestors.cache import ParsedDocumentCache
+from dr_nexus.ingestors.discovery import (
+    DEFAULT_IGNORE_PATTERNS,
+    DiscoveredFile,
+    FileDiscovery,
+    rank_documents,
+)
+from dr_nexus.ingestors.parallel import ParallelIngestionEngine
+from dr_nexus.models.document import DocumentType
 from dr_nexus.extractors.timeline_builder import TimelineBuilder
 from dr_nexus.knowledge_base.kb_schema import KnowledgeBase, Metadata, PatientProfile
 from dr_nexus.knowledge_base.kb_loader import KBLoader
+from dr_nexus.knowledge_base.checkpoint import CheckpointJournal
 from dr_nexus.analysis.ultrathink import UltrathinkAnalyzer
 from dr_nexus.output.json_generator import JSONGenerator
 from dr_nexus.models.patient import PatientDemographics, Gender
@@ -23,96 +37,327 @@ from dr_nexus.models.patient import PatientDemographics, Gender
 
 logger = logging.getLogger(__name__)
 
-
-def find_medical_files(data_dir: Path):
+# HL7 AdministrativeGender codes used by C-CDA documents
+HL7_GENDER_CODES = {
+    'M': Gender.MALE,
+    'F': Gender.FEMALE,
+    'UN': Gender.OTHER,
+}
+
+# Document types for discovery categories, which double as checkpoint stages
+CATEGORY_DOCUMENT_TYPES = {
+    'fhir': DocumentType.FHIR_BUNDLE,
+    'ndjson': DocumentType.NDJSON,
+    'ccda': DocumentType.CCDA,
+}
+
+
+def ingest_files(
+    engine: ParallelIngestionEngine,
+    doc_type: DocumentType,
+    files: list,
+    label: str,
+    journal: CheckpointJournal = None,
+    progress: tqdm = None
+):
     """
-    Recursively find all medical files in data directory.
+    Ingest files of one type through the parallel engine.
 
-    Args:
-        data_dir: Root data directory
-
-    Returns:
-        Dictionary of files by type
+    Yields extracted data for each successfully ingested file while a
+    progress bar tracks every file (including failures and skips). When a
+    checkpoint journal is given, files it already holds are replayed from it
+    without re-parsing and every newly ingested file is recorded in it.
+    A caller-owned progress bar can be passed to share one across calls.
     """
-    files = {
-        'fhir': [],
-        'ccda': [],
-        'ndjson': [],
-        'pdf': [],
-        'images': []
-    }
-
-    # FHIR files
-    for fhir_file in data_dir.rglob("*FHIR*.json"):
-        if fhir_file.is_file():
-            files['fhir'].append(fhir_file)
-
-    # C-CDA XML files
-    for xml_file in data_dir.rglob("*.xml"):
-        if xml_file.is_file() and xml_file.stat().st_size > 1000:  # Skip small XML
-            files['ccda'].append(xml_file)
-
-    # NDJSON files
-    for ndjson_file in data_dir.rglob("*.ndjson"):
-        if ndjson_file.is_file():
-            files['ndjson'].append(ndjson_file)
+    stage = doc_type.value
+
+    if progress is None:
+        bar = tqdm(total=len(files), desc=label, unit="doc", disable=None)
+    else:
+        bar = nullcontext(progress)
+
+    with bar as progress:
+        pending = []
+        for filepath in files:
+            data = journal.get(stage, filepath) if journal is not None else None
+            if data is None:
+                pending.append(filepath)
+                continue
+            progress.update(1)
+            logger.info(f"Restored {label} file from checkpoint: {filepath.name}")
+            yield data
+
+        for result in engine.imap((doc_type, f) for f in pending):
+            progress.update(1)
+            if result.error:
+                logger.error(f"Failed to process {result.filepath}: {result.error}")
+            elif result.skipped:
+                logger.debug(f"Skipped non-{label} file: {result.filepath.name}")
+            else:
+                logger.info(f"Processed {label} file: {result.filepath.name}")
+                if journal is not None:
+                    journal.record(stage, result.filepath, result.data)
+                yield result.data
+
+
+def process_fhir_files(
+    fhir_files: list,
+    timeline_builder: TimelineBuilder,
+    engine: ParallelIngestionEngine = None,
+    journal: CheckpointJournal = None
+):
+    """Process all FHIR files."""
+    engine = engine or ParallelIngestionEngine(max_workers=1)
+    all_data = []
 
-    # PDF files
-    for pdf_file in data_dir.rglob("*.pdf"):
-        if pdf_file.is_file():
-            files['pdf'].append(pdf_file)
+    for data in ingest_files(engine, DocumentType.FHIR_BUNDLE, fhir_files, 'FHIR', journal):
+        all_data.append(data)
 
-    # Images
-    for img_file in data_dir.rglob("*.jpg"):
-        if img_file.is_file():
-            files['images'].append(img_file)
+        # Build timeline from FHIR data
+        try:
+            timeline_builder.build_from_fhir_data(data)
+        except Exception as e:
+            logger.error(f"Failed to build timeline from {data.get('source_file')}: {e}")
 
-    return files
+    return all_data
 
 
-def process_fhir_files(fhir_files: list, timeline_builder: TimelineBuilder):
-    """Process all FHIR files."""
-    ingestor = FHIRIngestor()
+def process_ndjson_files(
+    ndjson_files: list,
+    timeline_builder: TimelineBuilder,
+    max_workers: int = 1,
+    journal: CheckpointJournal = None,
+    ingestor_options: dict = None
+):
+    """Process all FHIR Bulk Data exports and standalone NDJSON files."""
+    ingestor = NDJSONIngestor(max_workers=max_workers, **(ingestor_options or {}))
     all_data = []
 
-    for fhir_file in fhir_files:
-        logger.info(f"Processing FHIR file: {fhir_file.name}")
+    for export_file in NDJSONIngestor.group_exports(ndjson_files):
         try:
-            data = ingestor.ingest(fhir_file)
+            # Exports are checkpointed by their manifest (or standalone NDJSON file)
+            data = journal.get(DocumentType.NDJSON.value, export_file) if journal is not None else None
+            if data is None:
+                logger.info(f"Processing NDJSON export: {export_file}")
+                data = ingestor.ingest(export_file)
+                if journal is not None:
+                    journal.record(DocumentType.NDJSON.value, export_file, data)
+            else:
+                logger.info(f"Restored NDJSON export from checkpoint: {export_file}")
             all_data.append(data)
 
-            # Build timeline from FHIR data
+            # Bulk Data output has the same shape as a FHIR Bundle
             timeline_builder.build_from_fhir_data(data)
 
         except Exception as e:
-            logger.error(f"Failed to process {fhir_file}: {e}")
+            logger.error(f"Failed to process {export_file}: {e}")
 
     return all_data
 
 
-def process_ccda_files(ccda_files: list, timeline_builder: TimelineBuilder):
-    """Process all C-CDA files."""
-    ingestor = CCDAIngestor()
-    all_data = []
+def process_ccda_files(
+    ccda_files: list,
+    timeline_builder: TimelineBuilder,
+    engine: ParallelIngestionEngine = None,
+    target_docs_per_sec_per_core: float = None,
+    journal: CheckpointJournal = None
+):
+    """
+    Process all C-CDA files.
 
-    for ccda_file in ccda_files:
-        logger.info(f"Processing C-CDA file: {ccda_file.name}")
-        try:
-            if ingestor.can_ingest(ccda_file):
-                data = ingestor.ingest(ccda_file)
-                all_data.append(data)
+    Each document is streamed into the timeline as soon as its worker
+    returns it, and only a small summary (source file, metadata, patient) is
+    kept, so memory stays flat across the full corpus.
 
-                # Build timeline from C-CDA data
-                timeline_builder.build_from_ccda_data(data)
+    Args:
+        ccda_files: C-CDA file paths
+        timeline_builder: Timeline receiving the extracted events
+        engine: Ingestion engine (defaults to a single inline worker)
+        target_docs_per_sec_per_core: Throughput target logged against
+        journal: Optional checkpoint journal to replay from and record into
 
-        except Exception as e:
-            logger.error(f"Failed to process {ccda_file}: {e}")
+    Returns:
+        List of per-document summaries
+    """
+    engine = engine or ParallelIngestionEngine(max_workers=1)
+    summaries = []
+    # Documents replayed from the journal are not parsed, so leave them out
+    # of the throughput
+    ingested = len(ccda_files)
+    if journal is not None:
+        ingested -= sum(journal.contains(DocumentType.CCDA.value, f) for f in ccda_files)
+    start = time.perf_counter()
+
+    for data in ingest_files(engine, DocumentType.CCDA, ccda_files, 'C-CDA', journal):
+        summaries.append(add_ccda_document(data, timeline_builder))
+
+    elapsed = time.perf_counter() - start
+    if ingested and elapsed > 0:
+        per_core = ingested / elapsed / engine.max_workers
+        logger.info(
+            f"C-CDA throughput: {ingested / elapsed:.1f} docs/s "
+            f"({per_core:.1f} docs/s per core, {engine.max_workers} workers)"
+        )
+        if target_docs_per_sec_per_core and per_core < target_docs_per_sec_per_core:
+            logger.warning(
+                f"C-CDA throughput below target of {target_docs_per_sec_per_core:g} docs/s per core"
+            )
+
+    return summaries
+
+
+def add_ccda_document(data: dict, timeline_builder: TimelineBuilder):
+    """Add one C-CDA document to the timeline and return its summary."""
+    try:
+        timeline_builder.build_from_ccda_data(data)
+    except Exception as e:
+        logger.error(f"Failed to build timeline from {data.get('source_file')}: {e}")
 
-    return all_data
+    return {
+        'source_file': data.get('source_file'),
+        'metadata': data.get('metadata'),
+        'patient': data.get('patient'),
+    }
+
+
+def plan_documents(discovered: list):
+    """
+    Rank discovered documents for a time-budgeted build.
+
+    NDJSON files belonging to one Bulk Data export are ranked and processed
+    together as their manifest, with the export's total size and newest mtime.
+
+    Args:
+        discovered: Output of FileDiscovery.scan
+
+    Returns:
+        FHIR, NDJSON export and C-CDA units in processing order
+    """
+    units = []
+    exports = {}
+    for f in discovered:
+        if f.category == 'ndjson':
+            export_file = NDJSONIngestor.group_exports([f.path])[0]
+            exports.setdefault(export_file, []).append(f)
+        else:
+            units.append(f)
+
+    for export_file, parts in exports.items():
+        units.append(DiscoveredFile(
+            export_file,
+            sum(p.size for p in parts),
+            max(p.mtime_ns for p in parts),
+            'ndjson'
+        ))
+
+    return rank_documents(units)
+
+
+def process_ranked_documents(
+    units: list,
+    timeline_builder: TimelineBuilder,
+    engine: ParallelIngestionEngine,
+    journal: CheckpointJournal,
+    deadline: float,
+    snapshot=None,
+    snapshot_interval: float = 60.0,
+    max_workers: int = 1
+):
+    """
+    Process documents in rank order until the time budget runs out.
 
+    Consecutive units of the same type go through the engine together. The
+    deadline is checked after every document, so at least one new document
+    is processed and the budget is overrun by at most the documents already
+    in flight. Everything processed is in the checkpoint journal; the next
+    budgeted run replays it without counting against its budget and
+    continues where this one stopped.
 
-def build_knowledge_base(fhir_data: list, ccda_data: list, timeline_builder: TimelineBuilder):
-    """Build knowledge base from processed data."""
+    Args:
+        units: Output of plan_documents
+        timeline_builder: Timeline receiving the extracted events
+        engine: Ingestion engine
+        journal: Checkpoint journal to replay from and record into
+        deadline: time.monotonic() value at which to stop
+        snapshot: Called with (fhir_data, ccda_data) to save a partial knowledge base
+        snapshot_interval: Seconds between snapshots
+        max_workers: Worker count for NDJSON exports
+
+    Returns:
+        Tuple of (FHIR and NDJSON data, C-CDA summaries, whether every unit
+        was processed)
+    """
+    fhir_data = []
+    ccda_data = []
+    labels = {'fhir': 'FHIR', 'ccda': 'C-CDA'}
+    ndjson_options = engine.ingestor_options.get(DocumentType.NDJSON)
+    next_snapshot = time.monotonic() + snapshot_interval
+
+    with tqdm(total=len(units), desc="Documents", unit="doc", disable=None) as progress:
+
+        def documents(category, paths):
+            """Yield extracted data for a run of same-type units."""
+            if category == 'ndjson':
+                for export_file in paths:
+                    # Adds the export to the timeline itself
+                    yield from process_ndjson_files(
+                        [export_file], timeline_builder, max_workers, journal, ndjson_options
+                    )
+                    progress.update(1)
+            else:
+                doc_type = CATEGORY_DOCUMENT_TYPES[category]
+                yield from ingest_files(engine, doc_type, paths, labels[category], journal, progress)
+
+        def add(category, data):
+            if category == 'ccda':
+                ccda_data.append(add_ccda_document(data, timeline_builder))
+            else:
+                fhir_data.append(data)
+            if category == 'fhir':
+                try:
+                    timeline_builder.build_from_fhir_data(data)
+                except Exception as e:
+                    logger.error(f"Failed to build timeline from {data.get('source_file')}: {e}")
+
+        # Documents finished by an earlier run are replayed outside the budget
+        restored = [
+            u for u in units
+            if journal.contains(CATEGORY_DOCUMENT_TYPES[u.category].value, u.path)
+        ]
+        restored_paths = {u.path for u in restored}
+        fresh = [u for u in units if u.path not in restored_paths]
+
+        for category, group in itertools.groupby(restored, key=lambda u: u.category):
+            for data in documents(category, [u.path for u in group]):
+                add(category, data)
+
+        for category, group in itertools.groupby(fresh, key=lambda u: u.category):
+            for data in documents(category, [u.path for u in group]):
+                add(category, data)
+
+                now = time.monotonic()
+                if now >= deadline:
+                    return fhir_data, ccda_data, False
+                if snapshot is not None and now >= next_snapshot:
+                    snapshot(fhir_data, ccda_data)
+                    next_snapshot = time.monotonic() + snapshot_interval
+
+    return fhir_data, ccda_data, True
+
+
+def build_knowledge_base(
+    fhir_data: list,
+    ccda_data: list,
+    timeline_builder: TimelineBuilder,
+    snapshot: bool = False
+):
+    """
+    Build knowledge base from processed data.
+
+    The final build deduplicates the builder in place. A snapshot streams a
+    deduplicated copy of the timeline instead, so partial saves during a
+    build do not rebuild the builder's index each time.
+    """
     logger.info("Building knowledge base")
 
     # Extract patient demographics (prefer FHIR)
@@ -133,7 +378,7 @@ def build_knowledge_base(fhir_data: list, ccda_data: list, timeline_builder: Tim
                     patient_id=p.get('id', 'unknown'),
                     name=p.get('name', 'Unknown'),
                     date_of_birth=datetime.strptime(p['birth_date'], '%Y-%m-%d').date() if p.get('birth_date') else date(1900, 1, 1),
-                    gender=Gender(p.get('gender', 'unknown').lower()) if p.get('gender') else Gender.UNKNOWN
+                    gender=HL7_GENDER_CODES.get((p.get('gender') or '').upper(), Gender.UNKNOWN)
                 )
                 break
 
@@ -147,6 +392,11 @@ def build_knowledge_base(fhir_data: list, ccda_data: list, timeline_builder: Tim
     for data in fhir_data:
         all_devices.extend(data.get('devices', []))
 
+    # Collect all allergies
+    all_allergies = []
+    for data in fhir_data:
+        all_allergies.extend(data.get('allergies', []))
+
     # Create KB
     kb = KnowledgeBase(
         metadata=Metadata(
@@ -158,15 +408,20 @@ def build_knowledge_base(fhir_data: list, ccda_data: list, timeline_builder: Tim
         patient_profile=PatientProfile(
             demographics=patient_demographics,
             chronic_conditions=all_conditions,
-            implanted_devices=all_devices
+            implanted_devices=all_devices,
+            allergies=all_allergies
         ),
-        timeline=timeline_builder.deduplicate_events()
+        timeline=(
+            list(timeline_builder.iter_events(tolerance_hours=24)) if snapshot
+            else timeline_builder.deduplicate_events()
+        )
     )
 
     logger.info(f"Knowledge base created:")
     logger.info(f"  - {len(kb.timeline)} timeline events")
     logger.info(f"  - {len(kb.patient_profile.chronic_conditions)} conditions")
     logger.info(f"  - {len(kb.patient_profile.implanted_devices)} devices")
+    logger.info(f"  - {len(kb.patient_profile.allergies)} allergies")
 
     return kb
 
@@ -191,6 +446,12 @@ def main():
         default=True,
         help="Enable Ultrathink analysis"
     )
+    parser.add_argument(
+        "--no-ultrathink",
+        dest="enable_ultrathink",
+        action="store_false",
+        help="Disable Ultrathink analysis"
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -202,6 +463,42 @@ def main():
         action="store_true",
         help="Skip creating backup"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every document instead of using the parsed-document cache"
+    )
+    parser.add_argument(
+        "--ignore",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Glob pattern of files or directories to skip (repeatable)"
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Re-list every directory instead of reusing the file manifest"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted build from its checkpoint journal"
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Process the most valuable documents first and stop after this long; "
+             "the next run with a budget continues where this one stopped"
+    )
+    parser.add_argument(
+        "--snapshot-interval",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Seconds between partial knowledge base saves during a time-budgeted build"
+    )
 
     args = parser.parse_args()
 
@@ -220,6 +517,7 @@ def main():
     logger.info("="*60)
 
     start_time = datetime.now()
+    journal = CheckpointJournal(config.checkpoint_dir / "build.journal")
 
     try:
         # Ensure directories exist
@@ -227,7 +525,12 @@ def main():
 
         # Find all medical files
         logger.info(f"Scanning for medical files in: {config.data_dir}")
-        files = find_medical_files(config.data_dir)
+        discovery = FileDiscovery(
+            ignore_patterns=list(DEFAULT_IGNORE_PATTERNS) + args.ignore,
+            manifest_path=config.file_manifest_path
+        )
+        discovered = discovery.scan(config.data_dir, full=args.full_scan)
+        files = FileDiscovery.group(discovered)
 
         logger.info(f"Found files:")
         logger.info(f"  - FHIR: {len(files['fhir'])}")
@@ -239,20 +542,116 @@ def main():
         # Initialize timeline builder
         timeline_builder = TimelineBuilder()
 
-        # Process FHIR files
-        logger.info("\nProcessing FHIR files...")
-        fhir_data = process_fhir_files(files['fhir'], timeline_builder)
+        # Ingest documents across worker processes, reusing cached parses
+        cache = None
+        if config.enable_cache and not args.no_cache:
+            cache = ParsedDocumentCache(config.cache_dir, config.cache_max_mb * 1024 * 1024)
+
+        engine = ParallelIngestionEngine.from_config(config, cache)
+
+        # Record every processed document so an interrupted build can resume.
+        # Journaled payloads are only reusable with the ingestors that wrote them
+        ingestors = {**engine.ingestors, DocumentType.NDJSON: NDJSONIngestor}
+        run_info = {
+            'data_dir': str(Path(config.data_dir).resolve()),
+            'fhir_lean': config.fhir_lean,
+            'ingestors': {
+                doc_type.value: f"{cls.__module__}.{cls.__qualname__}:{cls.VERSION}"
+                for doc_type, cls in ingestors.items()
+            }
+        }
+        budgeted = args.time_budget is not None
+        if args.resume or budgeted:
+            journal.resume(run_info)
+        else:
+            journal.start(run_info)
 
-        # Process C-CDA files
-        logger.info("\nProcessing C-CDA files...")
-        ccda_data = process_ccda_files(files['ccda'][:10], timeline_builder)  # Limit to first 10 for speed
+        output_path = Path(args.output)
+        backed_up = False
+
+        def save(kb):
+            """Save the knowledge base, backing up the previous one before the first write."""
+            nonlocal backed_up
+            if not backed_up and output_path.exists() and not args.no_backup:
+                logger.info("\nBacking up existing knowledge base...")
+                backup_dir = config.knowledge_base_dir / "history"
+                existing_kb = KBLoader.load(output_path)
+                if existing_kb:
+                    JSONGenerator.create_backup(existing_kb, backup_dir)
+            backed_up = True
+            JSONGenerator.save(kb, output_path, pretty=True)
+
+        remaining = []
+        if budgeted:
+            units = plan_documents(discovered)
+
+            def save_snapshot(fhir_data, ccda_data):
+                done = len(fhir_data) + len(ccda_data)
+                logger.info(f"Saving partial knowledge base ({done} of {len(units)} documents)")
+                kb = build_knowledge_base(fhir_data, ccda_data, timeline_builder, snapshot=True)
+                kb.metadata.changelog = f"Partial build: {done} of {len(units)} documents"
+                save(kb)
+
+            logger.info(f"\nProcessing {len(units)} documents by priority within {args.time_budget:g}s...")
+            fhir_data, ccda_data, complete = process_ranked_documents(
+                units,
+                timeline_builder,
+                engine,
+                journal,
+                deadline=time.monotonic() + args.time_budget,
+                snapshot=save_snapshot,
+                snapshot_interval=args.snapshot_interval,
+                max_workers=config.max_workers
+            )
+            if not complete:
+                remaining = [
+                    u for u in units
+                    if not journal.contains(CATEGORY_DOCUMENT_TYPES[u.category].value, u.path)
+                ]
+        else:
+            # Process FHIR files
+            logger.info("\nProcessing FHIR files...")
+            fhir_data = process_fhir_files(files['fhir'], timeline_builder, engine, journal)
+
+            # Process FHIR Bulk Data exports
+            logger.info("\nProcessing NDJSON files...")
+            fhir_data.extend(
+                process_ndjson_files(
+                    files['ndjson'],
+                    timeline_builder,
+                    config.max_workers,
+                    journal,
+                    engine.ingestor_options.get(DocumentType.NDJSON)
+                )
+            )
+
+            # Process C-CDA files
+            logger.info("\nProcessing C-CDA files...")
+            ccda_data = process_ccda_files(
+                files['ccda'],
+                timeline_builder,
+                engine,
+                target_docs_per_sec_per_core=config.ccda_target_docs_per_sec_per_core,
+                journal=journal
+            )
+
+        if cache is not None:
+            logger.info(
+                f"Parse cache: {engine.cache_hits}/{engine.cache_lookups} hits "
+                f"({engine.cache_hit_rate:.0%} hit rate)"
+            )
 
         # Build knowledge base
         logger.info("\nBuilding knowledge base...")
         kb = build_knowledge_base(fhir_data, ccda_data, timeline_builder)
-
-        # Run Ultrathink analysis
-        if args.enable_ultrathink and config.anthropic_api_key:
+        if remaining:
+            processed = len(fhir_data) + len(ccda_data)
+            kb.metadata.changelog = f"Partial build: {processed} of {processed + len(remaining)} documents"
+
+        # Run Ultrathink analysis (on complete knowledge bases only)
+        if remaining:
+            logger.info("Skipping Ultrathink analysis until the build is complete")
+        elif args.enable_ultrathink and config.anthropic_api_key:
             logger.info("\nRunning Ultrathink analysis...")
             try:
                 analyzer = UltrathinkAnalyzer(config.anthropic_api_key, config.anthropic_model)
@@ -273,18 +672,9 @@ def main():
         else:
             logger.info("Skipping Ultrathink analysis (disabled or no API key)")
 
-        # Create backup if existing file exists
-        output_path = Path(args.output)
-        if output_path.exists() and not args.no_backup:
-            logger.info("\nBacking up existing knowledge base...")
-            backup_dir = config.knowledge_base_dir / "history"
-            existing_kb = KBLoader.load(output_path)
-            if existing_kb:
-                JSONGenerator.create_backup(existing_kb, backup_dir)
-
         # Save knowledge base
         logger.info(f"\nSaving knowledge base to: {output_path}")
-        JSONGenerator.save(kb, output_path, pretty=True)
+        save(kb)
 
         # Calculate duration
         duration = (datetime.now() - start_time).total_seconds()
@@ -293,9 +683,19 @@ def main():
         # Save again with updated duration
         JSONGenerator.save(kb, output_path, pretty=True)
 
-        logger.info("\n" + "="*60)
-        logger.info("Knowledge Base Build Complete!")
-        logger.info("="*60)
+        if remaining:
+            # Keep the checkpoints so the next budgeted run continues from here
+            logger.info("\n" + "="*60)
+            logger.info("Time Budget Reached - Partial Knowledge Base Saved")
+            logger.info("="*60)
+            logger.info(f"Documents remaining: {len(remaining)} (run again with --time-budget to continue)")
+        else:
+            # The knowledge base is saved, so the checkpoints are no longer needed
+            journal.remove()
+
+            logger.info("\n" + "="*60)
+            logger.info("Knowledge Base Build Complete!")
+            logger.info("="*60)
         logger.info(f"Duration: {duration:.2f} seconds")
         logger.info(f"Timeline events: {len(kb.timeline)}")
         logger.info(f"Conditions: {len(kb.patient_profile.chronic_conditions)}")
@@ -306,8 +706,13 @@ def main():
 
     except Exception as e:
         logger.exception(f"Build failed: {e}")
+        if journal.path.exists():
+            logger.info("Run again with --resume to continue from the last checkpoint")
         return 1
 
+    finally:
+        journal.close()
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -90,3 +90,199 @@ def sample_knowledge_base(sample_patient_demographics, sample_condition):
 def temp_json_file(tmp_path):
     """Temporary JSON file path for testing."""
     return tmp_path / "test_kb.json"
+
+
+@pytest.fixture
+def sample_fhir_bundle():
+    """Minimal FHIR R4 Bundle covering the extracted resource types."""
+    return {
+        "resourceType": "Bundle",
+        "type": "collection",
+        "entry": [
+            {
+                "fullUrl": "urn:uuid:patient-1",
+                "resource": {
+                    "resourceType": "Patient",
+                    "id": "patient-1",
+                    "name": [{"given": ["John"], "family": "Doe"}],
+                    "birthDate": "1990-01-01",
+                    "gender": "male"
+                }
+            },
+            {
+                "resource": {
+                    "resourceType": "Condition",
+                    "id": "cond-1",
+                    "code": {
+                        "text": "Hypertension",
+                        "coding": [{"system": "http://hl7.org/fhir/sid/icd-10-cm", "code": "I10"}]
+                    },
+                    "clinicalStatus": {"coding": [{"code": "active"}]},
+                    "onsetDateTime": "2020-01-01"
+                }
+            },
+            {
+                "resource": {
+                    "resourceType": "Encounter",
+                    "id": "enc-1",
+                    "type": [{"text": "Office visit"}],
+                    "period": {"start": "2020-05-15T10:30:00Z"},
+                    "participant": [{"individual": {"reference": "Practitioner/prac-1"}}],
+                    "location": [{"location": {"reference": "Location/loc-1"}}]
+                }
+            },
+            {
+                "resource": {
+                    "resourceType": "Procedure",
+                    "id": "proc-1",
+                    "code": {
+                        "text": "ACDF C5-C6",
+                        "coding": [{"system": "http://www.ama-assn.org/go/cpt", "code": "22551"}]
+                    },
+                    "performedDateTime": "2020-06-01T08:00:00Z",
+                    "performer": [
+                        {"actor": {"reference": "https://fhir.example.org/r4/Practitioner/prac-1"}}
+                    ],
+                    "location": {"reference": "Location/unknown", "display": "Surgery center"}
+                }
+            },
+            {
+                "resource": {
+                    "resourceType": "Observation",
+                    "id": "obs-1",
+                    "code": {"text": "Hemoglobin"},
+                    "valueQuantity": {"value": 13.5, "unit": "g/dL"},
+                    "effectiveDateTime": "2020-05-15T10:45:00Z",
+                    "status": "final"
+                }
+            },
+            {
+                "resource": {
+                    "resourceType": "AllergyIntolerance",
+                    "id": "allergy-1",
+                    "code": {"coding": [{"display": "Penicillin"}]},
+                    "reaction": [{"manifestation": [{"text": "Hives"}], "severity": "moderate"}],
+                    "onsetDateTime": "2015-03-01"
+                }
+            },
+            {
+                "resource": {
+                    "resourceType": "Immunization",
+                    "id": "imm-1",
+                    "vaccineCode": {
+                        "text": "Influenza",
+                        "coding": [{"system": "http://hl7.org/fhir/sid/cvx", "code": "140"}]
+                    },
+                    "occurrenceDateTime": "2020-10-01",
+                    "status": "completed"
+                }
+            },
+            {
+                "resource": {
+                    "resourceType": "Practitioner",
+                    "id": "prac-1",
+                    "name": [{"given": ["Jane"], "family": "Smith", "prefix": ["Dr."]}]
+                }
+            },
+            {
+                "fullUrl": "urn:uuid:location-1",
+                "resource": {
+                    "resourceType": "Location",
+                    "id": "loc-1",
+                    "name": "Phoebe Putney Memorial Hospital"
+                }
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def fhir_bundle_file(tmp_path, sample_fhir_bundle):
+    """Sample FHIR Bundle written to disk."""
+    import json
+
+    filepath = tmp_path / "Sample FHIR Resources.json"
+    filepath.write_text(json.dumps(sample_fhir_bundle, indent=2), encoding="utf-8")
+    return filepath
+
+
+SAMPLE_CCDA = """<?xml version="1.0" encoding="UTF-8"?>
+<ClinicalDocument xmlns="urn:hl7-org:v3" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+  <id root="2.16.840.1.113883.19" extension="doc-1"/>
+  <code code="34133-9" codeSystem="2.16.840.1.113883.6.1"/>
+  <title>Summary of Care</title>
+  <effectiveTime value="20200601120000-0500"/>
+  <recordTarget><patientRole><id extension="MRN-1"/>
+    <addr><streetAddressLine>1 Main St</streetAddressLine><city>Albany</city><state>GA</state><postalCode>31701</postalCode></addr>
+    <telecom use="HP" value="tel:+1-555-0100"/>
+    <patient><name><given>John</given><family>Doe</family></name><administrativeGenderCode code="M"/><birthTime value="19900101"/></patient>
+  </patientRole></recordTarget>
+  <author><time value="20200601"/><assignedAuthor><id/><assignedPerson><name><given>Jane</given><family>Smith</family></name></assignedPerson></assignedAuthor></author>
+  <custodian><assignedCustodian><representedCustodianOrganization><name>Phoebe Putney</name></representedCustodianOrganization></assignedCustodian></custodian>
+  <component><structuredBody>
+    <component><section>
+      <templateId root="2.16.840.1.113883.10.20.22.2.5.1"/>
+      <code code="11450-4" codeSystem="2.16.840.1.113883.6.1"/>
+      <title>Problems</title>
+      <entry><act><entryRelationship><observation>
+        <code code="55607006"/><statusCode code="completed"/>
+        <effectiveTime><low value="20190301"/></effectiveTime>
+        <value xsi:type="CD" code="I10" codeSystem="2.16.840.1.113883.6.90" displayName="Essential hypertension"/>
+      </observation></entryRelationship></act></entry>
+    </section></component>
+    <component><section>
+      <code code="10160-0"/><title>Medications</title>
+      <entry><substanceAdministration>
+        <effectiveTime xsi:type="PIVL_TS" operator="A"><period value="12" unit="h"/></effectiveTime>
+        <routeCode displayName="Oral"/>
+        <doseQuantity value="10" unit="mg"/>
+        <consumable><manufacturedProduct><manufacturedMaterial><code code="314076" displayName="Lisinopril 10 MG"/></manufacturedMaterial></manufacturedProduct></consumable>
+      </substanceAdministration></entry>
+    </section></component>
+    <component><section>
+      <code code="48765-2"/><title>Allergies</title>
+      <entry><act><entryRelationship><observation>
+        <participant><participantRole><playingEntity><code displayName="Penicillin"/></playingEntity></participantRole></participant>
+        <entryRelationship><observation><value displayName="Hives"/></observation></entryRelationship>
+      </observation></entryRelationship></act></entry>
+    </section></component>
+    <component><section>
+      <code code="47519-4"/><title>Procedures</title>
+      <entry><procedure><code code="22551" codeSystem="2.16.840.1.113883.6.12" displayName="ACDF C5-C6"/><effectiveTime value="20200601083000"/></procedure></entry>
+    </section></component>
+    <component><section>
+      <code code="30954-2"/><title>Results</title>
+      <entry><organizer><component><observation>
+        <code code="718-7" displayName="Hemoglobin"/>
+        <effectiveTime value="20200601090000"/>
+        <value xsi:type="PQ" value="13.5" unit="g/dL"/>
+        <referenceRange><observationRange><value xsi:type="IVL_PQ"><low value="12"/><high value="17"/></value></observationRange></referenceRange>
+      </observation></component></organizer></entry>
+    </section></component>
+    <component><section>
+      <code code="8716-3"/><title>Vitals</title>
+      <entry><organizer><component><observation>
+        <code code="8480-6" displayName="Systolic BP"/><effectiveTime value="20200601091500"/><value value="128" unit="mm[Hg]"/>
+      </observation></component></organizer></entry>
+    </section></component>
+    <component><section>
+      <code code="46240-8"/><title>Encounters</title>
+      <entry><encounter><code displayName="Office visit"/><effectiveTime><low value="20200601080000"/></effectiveTime></encounter></entry>
+    </section></component>
+    <component><section>
+      <code code="11369-6"/><title>Immunizations</title>
+      <entry><substanceAdministration><effectiveTime value="20191001"/>
+        <consumable><manufacturedProduct><manufacturedMaterial><code displayName="Influenza vaccine"/></manufacturedMaterial></manufacturedProduct></consumable>
+      </substanceAdministration></entry>
+    </section></component>
+  </structuredBody></component>
+</ClinicalDocument>
+"""
+
+
+@pytest.fixture
+def ccda_file(tmp_path):
+    """Sample C-CDA document written to disk."""
+    filepath = tmp_path / "summary_of_care.xml"
+    filepath.write_text(SAMPLE_CCDA, encoding="utf-8")
+    return filepath
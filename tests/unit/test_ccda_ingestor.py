@@ -0,0 +1,119 @@
+"""Unit tests for CCDAIngestor."""
+
+import pickle
+
+import pytest
+
+from dr_nexus.ingestors.ccda_ingestor import CCDAIngestor
+
+
+class TestCCDAIngestor:
+    """Test suite for CCDAIngestor."""
+
+    def test_ingest_extracts_sections(self, ccda_file):
+        """Test extraction of each supported section."""
+        result = CCDAIngestor().ingest(ccda_file)
+
+        assert result['metadata']['title'] == "Summary of Care"
+        assert result['metadata']['organization'] == "Phoebe Putney"
+        assert result['patient']['name'] == "John Doe"
+        assert result['patient']['birth_date'] == "1990-01-01"
+        assert result['problems'][0]['name'] == "Essential hypertension"
+        assert result['medications'][0]['frequency'] == "Every 12 h"
+        assert result['allergies'][0] == {'allergen': 'Penicillin', 'reaction': 'Hives'}
+        assert result['procedures'][0]['code'] == "22551"
+        assert result['results'][0]['reference_range'] == "12-17"
+        assert result['vitals'][0]['value'] == "128"
+        assert result['encounters'][0]['type'] == "Office visit"
+        assert result['immunizations'][0]['vaccine'] == "Influenza vaccine"
+
+    def test_streaming_matches_full_parse(self, ccda_file):
+        """Test that iterparse mode extracts the same data."""
+        full = CCDAIngestor().ingest(ccda_file)
+        streamed = CCDAIngestor(streaming=True).ingest(ccda_file)
+
+        full.pop('sections')
+        assert streamed == full
+
+    def test_streaming_payload_holds_no_elements(self, ccda_file):
+        """Test that the streaming payload keeps no parsed tree alive."""
+        streamed = CCDAIngestor(streaming=True).ingest(ccda_file)
+
+        assert 'sections' not in streamed
+        assert b'xml.etree' not in pickle.dumps(streamed)
+
+    def test_nested_sections_are_walked_once(self, tmp_path):
+        """Test that nested subsections inherit classification without double counting."""
+        filepath = tmp_path / "nested.xml"
+        filepath.write_text(NESTED_CCDA, encoding="utf-8")
+
+        for streaming in (False, True):
+            result = CCDAIngestor(streaming=streaming).ingest(filepath)
+
+            assert [p['name'] for p in result['problems']] == ["Asthma", "Gout"]
+            assert [v['vaccine'] for v in result['immunizations']] == ["Tdap"]
+
+    def test_classifies_by_template_id(self, tmp_path):
+        """Test that a section without a LOINC code is classified by its templateId."""
+        filepath = tmp_path / "nested.xml"
+        filepath.write_text(NESTED_CCDA, encoding="utf-8")
+
+        result = CCDAIngestor().ingest(filepath)
+
+        assert len(result['sections']['immunizations']) == 1
+        assert len(result['sections']['problems']) == 2
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_lxml_backend_matches_etree(self, ccda_file, streaming):
+        """Test that the lxml and ElementTree backends extract identical data."""
+        etree_result = CCDAIngestor(streaming=streaming, backend='etree').ingest(ccda_file)
+        lxml_result = CCDAIngestor(streaming=streaming, backend='lxml').ingest(ccda_file)
+
+        etree_result.pop('sections', None)
+        lxml_result.pop('sections', None)
+        assert lxml_result == etree_result
+
+    def test_lxml_backend_does_not_expand_entities(self, tmp_path):
+        """Test that the lxml parser leaves external entities unresolved."""
+        secret = tmp_path / "secret.txt"
+        secret.write_text("leaked", encoding="utf-8")
+        filepath = tmp_path / "xxe.xml"
+        filepath.write_text(
+            f'''<?xml version="1.0"?>
+<!DOCTYPE ClinicalDocument [<!ENTITY xxe SYSTEM "file://{secret}">]>
+<ClinicalDocument xmlns="urn:hl7-org:v3"><title>&xxe;</title></ClinicalDocument>
+''',
+            encoding="utf-8"
+        )
+
+        result = CCDAIngestor(backend='lxml').ingest(filepath)
+
+        assert result['metadata'].get('title') != "leaked"
+
+    def test_rejects_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            CCDAIngestor(backend='sax')
+
+
+NESTED_CCDA = """<?xml version="1.0" encoding="UTF-8"?>
+<ClinicalDocument xmlns="urn:hl7-org:v3">
+  <title>Nested</title>
+  <component><structuredBody>
+    <component><section>
+      <code code="11450-4"/>
+      <entry><observation><value displayName="Asthma"/></observation></entry>
+      <component><section>
+        <title>Resolved problems</title>
+        <entry><observation><value displayName="Gout"/></observation></entry>
+      </section></component>
+    </section></component>
+    <component><section>
+      <templateId root="2.16.840.1.113883.10.20.22.2.2.1"/>
+      <entry><substanceAdministration><consumable><manufacturedProduct><manufacturedMaterial>
+        <code displayName="Tdap"/>
+      </manufacturedMaterial></manufacturedProduct></consumable></substanceAdministration></entry>
+    </section></component>
+  </structuredBody></component>
+</ClinicalDocument>
+"""
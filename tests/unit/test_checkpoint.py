@@ -0,0 +1,85 @@
+"""Unit tests for CheckpointJournal."""
+
+import os
+
+from dr_nexus.knowledge_base.checkpoint import CheckpointJournal
+
+
+RUN_INFO = {'data_dir': '/data'}
+
+
+class TestCheckpointJournal:
+    """Test suite for CheckpointJournal."""
+
+    def test_resume_restores_recorded_documents(self, tmp_path, fhir_bundle_file):
+        """Test that recorded payloads are restored after reopening the journal."""
+        path = tmp_path / "build.journal"
+        journal = CheckpointJournal(path)
+        journal.start(RUN_INFO)
+        journal.record('fhir_bundle', fhir_bundle_file, {'conditions': [{'name': 'Hypertension'}]})
+        journal.close()
+
+        resumed = CheckpointJournal(path)
+        assert resumed.resume(RUN_INFO) == 1
+        assert resumed.contains('fhir_bundle', fhir_bundle_file)
+        assert resumed.get('fhir_bundle', fhir_bundle_file) == {'conditions': [{'name': 'Hypertension'}]}
+        assert resumed.get('ccda', fhir_bundle_file) is None
+        resumed.close()
+
+    def test_torn_tail_is_dropped(self, tmp_path, fhir_bundle_file, ccda_file):
+        """Test that a record cut off by a crash is discarded and appending continues."""
+        path = tmp_path / "build.journal"
+        journal = CheckpointJournal(path)
+        journal.start(RUN_INFO)
+        journal.record('fhir_bundle', fhir_bundle_file, {'n': 1})
+        journal.record('ccda', ccda_file, {'n': 2})
+        journal.close()
+
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        resumed = CheckpointJournal(path)
+        assert resumed.resume(RUN_INFO) == 1
+        resumed.record('ccda', ccda_file, {'n': 3})
+        resumed.close()
+
+        reopened = CheckpointJournal(path)
+        assert reopened.resume(RUN_INFO) == 2
+        assert reopened.get('ccda', ccda_file) == {'n': 3}
+        reopened.close()
+
+    def test_changed_source_is_not_restored(self, tmp_path, fhir_bundle_file):
+        """Test that a document modified since it was checkpointed is re-processed."""
+        path = tmp_path / "build.journal"
+        with CheckpointJournal(path) as journal:
+            journal.start(RUN_INFO)
+            journal.record('fhir_bundle', fhir_bundle_file, {'n': 1})
+
+        fhir_bundle_file.write_text(fhir_bundle_file.read_text() + "\n")
+
+        with CheckpointJournal(path) as resumed:
+            resumed.resume(RUN_INFO)
+            assert not resumed.contains('fhir_bundle', fhir_bundle_file)
+            assert resumed.get('fhir_bundle', fhir_bundle_file) is None
+
+    def test_other_run_starts_over(self, tmp_path, fhir_bundle_file):
+        """Test that a journal from a different run is not resumed."""
+        path = tmp_path / "build.journal"
+        with CheckpointJournal(path) as journal:
+            journal.start(RUN_INFO)
+            journal.record('fhir_bundle', fhir_bundle_file, {'n': 1})
+
+        with CheckpointJournal(path) as resumed:
+            assert resumed.resume({'data_dir': '/other'}) == 0
+            assert resumed.get('fhir_bundle', fhir_bundle_file) is None
+
+    def test_remove_deletes_journal(self, tmp_path):
+        """Test that a finished build removes its journal."""
+        path = tmp_path / "build.journal"
+        journal = CheckpointJournal(path)
+        journal.start(RUN_INFO)
+        journal.remove()
+
+        assert not path.exists()
+        with CheckpointJournal(path) as resumed:
+            assert resumed.resume(RUN_INFO) == 0
@@ -0,0 +1,102 @@
+"""Unit tests for the command-line interface and its startup imports."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from dr_nexus.cli import cli
+from dr_nexus.knowledge_base.kb_stats import read_stats
+from dr_nexus.output.json_generator import JSONGenerator
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Top-level packages a read-only command must not import
+HEAVY_MODULES = ('pydantic', 'pydantic_settings', 'anthropic', 'lxml', 'tqdm', 'scripts')
+
+# Startup budget for `--help` on top of a bare interpreter start. Lazy imports
+# keep it near 0.1 s; the bound is loose so only a regression to eager
+# imports trips it on a slow machine
+HELP_STARTUP_BUDGET_SECONDS = 1.0
+
+
+def _run_python(*args):
+    """Run a Python subprocess from the repository root and return its output."""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    completed = subprocess.run(
+        [sys.executable, *args], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return completed.stdout
+
+
+def _timed(func, *args):
+    """Return the wall time of a call, in seconds."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+class TestCLI:
+    """Test suite for the dr-nexus CLI."""
+
+    def test_stats_matches_loaded_knowledge_base(self, sample_knowledge_base, temp_json_file):
+        """Test that stats read from raw JSON agree with the validated model."""
+        JSONGenerator.save(sample_knowledge_base, temp_json_file)
+
+        stats = read_stats(temp_json_file)
+
+        assert stats['version'] == sample_knowledge_base.metadata.version
+        assert stats['generated_at'] == sample_knowledge_base.metadata.generated_at
+        assert stats['patient_name'] == sample_knowledge_base.patient_profile.demographics.name
+        assert stats['age'] == sample_knowledge_base.patient_profile.demographics.age
+        assert stats['chronic_conditions'] == 1
+
+    def test_stats_command(self, sample_knowledge_base, temp_json_file):
+        """Test the stats command output."""
+        JSONGenerator.save(sample_knowledge_base, temp_json_file)
+
+        result = CliRunner().invoke(cli, ['stats', str(temp_json_file)])
+
+        assert result.exit_code == 0
+        assert "Patient: John Doe" in result.output
+        assert "Chronic conditions: 1" in result.output
+
+    @pytest.mark.parametrize("entry_point", [
+        "from dr_nexus.cli import cli\n"
+        "cli(['stats', path], standalone_mode=False)\n",
+        "import runpy\n"
+        "sys.argv = ['dr-nexus', 'stats', path]\n"
+        "try:\n"
+        "    runpy.run_module('dr_nexus.cli', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n",
+    ], ids=['cli', 'module'])
+    def test_stats_does_not_import_heavy_modules(self, sample_knowledge_base, temp_json_file, entry_point):
+        """Test that stats loads neither the models, the config nor the ingestors."""
+        JSONGenerator.save(sample_knowledge_base, temp_json_file)
+        code = (
+            f"import sys\npath = {str(temp_json_file)!r}\n"
+            f"{entry_point}"
+            "print(' '.join(sys.modules))\n"
+        )
+
+        stdout = _run_python('-c', code)
+        loaded = stdout.splitlines()[-1].split()
+
+        assert "Patient: John Doe" in stdout
+        assert not [m for m in loaded if m.split('.')[0] in HEAVY_MODULES]
+        assert not [m for m in loaded if m.startswith('dr_nexus.ingestors')]
+        assert 'dr_nexus.utils.config' not in loaded
+
+    @pytest.mark.timing
+    def test_help_startup_time(self):
+        """Test that `python -m dr_nexus.cli --help` starts well within a generous budget."""
+        baseline = min(_timed(_run_python, '-c', 'pass') for _ in range(3))
+        elapsed = min(_timed(_run_python, '-m', 'dr_nexus.cli', '--help') for _ in range(3))
+
+        assert elapsed - baseline < HELP_STARTUP_BUDGET_SECONDS
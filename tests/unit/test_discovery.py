@@ -0,0 +1,146 @@
+"""Unit tests for single-pass file discovery."""
+
+import json
+import os
+
+from pathlib import Path
+
+from dr_nexus.ingestors.discovery import DiscoveredFile, FileDiscovery, classify_file, rank_documents
+
+
+def _write(path, content="x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+class TestFileDiscovery:
+    """Test suite for FileDiscovery."""
+
+    def test_classifies_files_in_one_walk(self, tmp_path, ccda_file):
+        """Test that every category is found with the same rules as the old globs."""
+        data = tmp_path / "data"
+        fhir = _write(data / "a" / "US Core FHIR Resources.json", "{}")
+        ccda = _write(data / "b" / "summary.xml", ccda_file.read_text())
+        _write(data / "b" / "stub.xml", "<x/>")
+        ndjson = _write(data / "export" / "Patient.ndjson", '{"resourceType": "Patient"}\n')
+        pdf = _write(data / "notes.pdf", "%PDF-1.4")
+        jpg = _write(data / "scan.jpg")
+        sniffed = _write(data / "b" / "DOC0001", ccda_file.read_text())
+
+        grouped = FileDiscovery.group(FileDiscovery().scan(data))
+
+        assert grouped['fhir'] == [fhir]
+        assert grouped['ccda'] == [sniffed, ccda]
+        assert grouped['ndjson'] == [ndjson]
+        assert grouped['pdf'] == [pdf]
+        assert grouped['images'] == [jpg]
+
+    def test_ignore_patterns(self, tmp_path):
+        """Test that ignore patterns match names and root-relative paths."""
+        data = tmp_path / "data"
+        kept = _write(data / "keep" / "a.pdf")
+        _write(data / ".git" / "b.pdf")
+        _write(data / "archive" / "old" / "c.pdf")
+        _write(data / "keep" / "d.pdf.tmp")
+
+        files = FileDiscovery(['.*', '*.tmp', 'archive/*']).scan(data)
+
+        assert [f.path for f in files] == [kept]
+
+    def test_manifest_reuses_unchanged_directories(self, tmp_path):
+        """Test that a second scan only lists directories whose contents changed."""
+        data = tmp_path / "data"
+        _write(data / "a" / "one.pdf")
+        _write(data / "b" / "two.pdf")
+        manifest = tmp_path / "manifest.json"
+        for directory in (data, data / "a", data / "b"):
+            os.utime(directory, (1_600_000_000, 1_600_000_000))
+
+        first = FileDiscovery(manifest_path=manifest)
+        first.scan(data)
+        assert first.directories_listed == 3
+
+        new_file = _write(data / "b" / "three.pdf")
+        os.remove(data / "a" / "one.pdf")
+        (data / "a").touch()
+
+        second = FileDiscovery(manifest_path=manifest)
+        files = second.scan(data)
+
+        assert second.directories_reused == 1
+        assert second.changes.added == [new_file]
+        assert second.changes.removed == [data / "a" / "one.pdf"]
+        assert sorted(f.path.name for f in files) == ["three.pdf", "two.pdf"]
+
+    def test_full_scan_finds_in_place_changes(self, tmp_path):
+        """Test that a full scan reports files rewritten in place."""
+        data = tmp_path / "data"
+        report = _write(data / "report.pdf", "v1")
+        manifest = tmp_path / "manifest.json"
+        FileDiscovery(manifest_path=manifest).scan(data)
+
+        dir_stat = os.stat(data)
+        report.write_text("version two", encoding="utf-8")
+        os.utime(data, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+        discovery = FileDiscovery(manifest_path=manifest)
+        discovery.scan(data, full=True)
+
+        assert discovery.changes.changed == [report]
+
+    def test_recently_modified_directory_is_listed_again(self, tmp_path):
+        """Test that a directory changed within the racy window is not trusted."""
+        data = tmp_path / "data"
+        _write(data / "one.pdf")
+        manifest = tmp_path / "manifest.json"
+        FileDiscovery(manifest_path=manifest).scan(data)
+
+        # Same directory mtime as the first scan saw, but a new file
+        mtime_ns = os.stat(data).st_mtime_ns
+        added = _write(data / "two.pdf")
+        os.utime(data, ns=(mtime_ns, mtime_ns))
+
+        discovery = FileDiscovery(manifest_path=manifest)
+        discovery.scan(data)
+
+        assert discovery.changes.added == [added]
+
+    def test_classify_file_sniffs_misnamed_json(self, tmp_path, sample_fhir_bundle):
+        """Test that NDJSON saved as .json and bundles with other extensions are sniffed."""
+        ndjson = _write(
+            tmp_path / "patients.json",
+            '{"resourceType": "Patient", "id": "1"}\n{"resourceType": "Patient", "id": "2"}\n'
+        )
+        bundle = _write(tmp_path / "export.txt", json.dumps(sample_fhir_bundle))
+        renamed = _write(tmp_path / "records.dat", json.dumps(sample_fhir_bundle, indent=2))
+        bundle_as_ndjson = _write(tmp_path / "bundle.ndjson", json.dumps(sample_fhir_bundle, indent=2))
+        notes = _write(tmp_path / "notes.txt", "Patient called about refill")
+
+        assert classify_file(ndjson, ndjson.stat().st_size) == 'ndjson'
+        assert classify_file(bundle, bundle.stat().st_size) == 'fhir'
+        assert classify_file(renamed, renamed.stat().st_size) == 'fhir'
+        assert classify_file(bundle_as_ndjson, bundle_as_ndjson.stat().st_size) == 'fhir'
+        assert classify_file(notes, notes.stat().st_size) is None
+
+    def test_classify_file_skips_small_xml(self, tmp_path):
+        """Test the C-CDA size threshold."""
+        assert classify_file(tmp_path / "small.xml", 1000) is None
+        assert classify_file(tmp_path / "large.xml", 1001) == 'ccda'
+
+
+class TestRankDocuments:
+    """Test suite for rank_documents."""
+
+    def test_recent_structured_and_large_first(self):
+        """Test ordering by day, then FHIR before C-CDA, then size."""
+        day = 86400 * 10**9
+        old_fhir = DiscoveredFile(Path("old FHIR.json"), 500, 1 * day, 'fhir')
+        new_small_ccda = DiscoveredFile(Path("small.xml"), 2000, 5 * day + 10, 'ccda')
+        new_large_ccda = DiscoveredFile(Path("large.xml"), 9000, 5 * day, 'ccda')
+        new_export = DiscoveredFile(Path("export/manifest.json"), 100, 5 * day + 20, 'ndjson')
+        pdf = DiscoveredFile(Path("notes.pdf"), 10**6, 6 * day, 'pdf')
+
+        ranked = rank_documents([old_fhir, new_small_ccda, pdf, new_large_ccda, new_export])
+
+        assert ranked == [new_export, new_large_ccda, new_small_ccda, old_fhir]
@@ -0,0 +1,126 @@
+"""Unit tests for near-duplicate event detection."""
+
+from datetime import datetime, timedelta
+
+from dr_nexus.extractors.event_dedup import (
+    NearDuplicateFilter,
+    estimate_similarity,
+    fingerprint,
+    is_conflicting,
+)
+from dr_nexus.models.timeline import TimelineEvent, EventType
+
+
+def make_event(summary, date=datetime(2020, 1, 15, 9, 55), **fields):
+    """Build an encounter event with the given summary."""
+    return TimelineEvent(
+        date=date,
+        event_type=fields.pop('event_type', EventType.ENCOUNTER),
+        summary=summary,
+        **fields
+    )
+
+
+class TestFingerprint:
+    """Test suite for fingerprints and their comparison."""
+
+    def test_similarity(self):
+        """Test that rewording scores high and different summaries score low."""
+        visit = fingerprint(make_event("Office visit with Dr. Smith"))
+        exam = fingerprint(make_event("Annual physical exam"))
+
+        assert estimate_similarity(visit, fingerprint(make_event("OFFICE VISIT with Dr Smith."))) == 1.0
+        assert estimate_similarity(exam, fingerprint(make_event("Annual physical examination"))) >= 0.7
+        assert estimate_similarity(visit, fingerprint(make_event("Emergency room visit"))) < 0.5
+
+    def test_conflicts(self):
+        """Test that numbers, types and same-system codes must agree."""
+        lab = make_event("Hemoglobin: 13.5 g/dL", event_type=EventType.LAB_RESULT, codes={'loinc': '718-7'})
+
+        def conflicts(**fields):
+            return is_conflicting(fingerprint(lab), fingerprint(lab.model_copy(update=fields)))
+
+        assert conflicts(summary="Hemoglobin: 13.9 g/dL")
+        assert conflicts(event_type=EventType.VITAL_SIGNS)
+        assert conflicts(codes={'loinc': '4544-3'})
+        assert not conflicts(summary="Hemoglobin 13.5 g/dl")
+        assert not conflicts(codes={'loinc': '718-7', 'snomed': '271026005'})
+        assert not conflicts(codes={})
+
+    def test_same_document_conflicts(self):
+        """Test that events from one source document always conflict."""
+        lab = make_event("Glucose: 100 mg/dL", event_type=EventType.LAB_RESULT, source_document="labs.xml")
+        other = lab.model_copy(update={'source_document': "summary.xml"})
+
+        assert is_conflicting(fingerprint(lab), fingerprint(lab))
+        assert not is_conflicting(fingerprint(lab), fingerprint(other))
+        assert not is_conflicting(fingerprint(make_event("Office visit")), fingerprint(make_event("Office visit")))
+
+
+class TestNearDuplicateFilter:
+    """Test suite for NearDuplicateFilter."""
+
+    def test_tolerance_window(self):
+        """Test that duplicates are found across hour boundaries but not past the window."""
+        duplicates = NearDuplicateFilter(tolerance_hours=24)
+        first = make_event("Office visit")
+
+        assert not duplicates.is_duplicate(first)
+        assert duplicates.is_duplicate(make_event("Office Visit", first.date + timedelta(minutes=10)))
+        assert duplicates.is_duplicate(make_event("office visit", first.date + timedelta(hours=24)))
+        assert not duplicates.is_duplicate(make_event("Office visit", first.date + timedelta(hours=25)))
+
+    def test_short_tolerance(self):
+        """Test that the tolerance is honored rather than bucketing by the hour."""
+        duplicates = NearDuplicateFilter(tolerance_hours=0.25)
+        first = make_event("Office visit", datetime(2020, 1, 15, 9, 0))
+
+        assert not duplicates.is_duplicate(first)
+        assert not duplicates.is_duplicate(make_event("Office visit", datetime(2020, 1, 15, 9, 30)))
+        assert duplicates.is_duplicate(make_event("Office visit", datetime(2020, 1, 15, 9, 40)))
+
+    def test_distinct_events_kept(self):
+        """Test that different events within the window are all kept."""
+        duplicates = NearDuplicateFilter()
+        events = [
+            make_event("Office visit"),
+            make_event("Emergency room visit"),
+            make_event("Office visit", event_type=EventType.PROCEDURE),
+            make_event("Glucose: 98 mg/dL", event_type=EventType.LAB_RESULT),
+            make_event("Glucose: 104 mg/dL", event_type=EventType.LAB_RESULT),
+        ]
+
+        assert not any(duplicates.is_duplicate(e) for e in events)
+
+    def test_serial_readings_kept(self):
+        """Test that repeated readings from one document are never merged."""
+        duplicates = NearDuplicateFilter(tolerance_hours=24)
+        readings = [
+            make_event(
+                "Glucose: 100 mg/dL",
+                datetime(2020, 1, 15) + timedelta(hours=6 * i),
+                event_type=EventType.LAB_RESULT,
+                source_document="labs.xml"
+            )
+            for i in range(4)
+        ]
+
+        assert not any(duplicates.is_duplicate(e) for e in readings)
+        assert duplicates.is_duplicate(readings[1].model_copy(update={'source_document': "summary.xml"}))
+
+    def test_window_expiry_at_scale(self):
+        """Test that a long sweep keeps the window small and keeps later repeats."""
+        duplicates = NearDuplicateFilter(tolerance_hours=12)
+        start = datetime(2020, 1, 1)
+
+        kept = [
+            event for event in (
+                make_event(f"Visit type {hour % 3}", start + timedelta(hours=hour))
+                for hour in range(24 * 30)
+            )
+            if not duplicates.is_duplicate(event)
+        ]
+
+        # Each type recurs every 3 hours, so one is kept every 15 hours
+        assert len(kept) == 3 * (24 * 30 // 15)
+        assert len(duplicates._kept) <= 3
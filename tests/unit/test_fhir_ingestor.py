@@ -0,0 +1,138 @@
+"""Unit tests for FHIRIngestor."""
+
+import io
+import json
+
+import pytest
+
+from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+from dr_nexus.ingestors.json_stream import iter_top_level
+from dr_nexus.models.timeline import EventType
+
+
+class TestFHIRIngestor:
+    """Test suite for FHIRIngestor."""
+
+    def test_ingest_extracts_resources(self, fhir_bundle_file):
+        """Test extraction of the supported resource types."""
+        result = FHIRIngestor().ingest(fhir_bundle_file)
+
+        assert result['patient'].name == "John Doe"
+        assert result['conditions'][0].icd10_code == "I10"
+        assert result['encounters'][0].event_type == EventType.ENCOUNTER
+        assert result['procedures'][0].codes == {'cpt': '22551'}
+        assert result['observations'][0]['value'] == 13.5
+        assert len(result['practitioners']) == 1
+
+    def test_ingest_extracts_allergies_and_immunizations(self, fhir_bundle_file):
+        """Test extraction of resource types added through extraction plans."""
+        result = FHIRIngestor().ingest(fhir_bundle_file)
+
+        allergy = result['allergies'][0]
+        assert allergy.allergen == "Penicillin"
+        assert allergy.reaction == "Hives"
+        assert allergy.severity == "moderate"
+        assert allergy.onset_date.isoformat() == "2015-03-01"
+
+        immunization = result['immunizations'][0]
+        assert immunization['vaccine'] == "Influenza"
+        assert immunization['cvx_code'] == "140"
+        assert immunization['raw']['id'] == "imm-1"
+        assert result['medication_statements'] == []
+        assert result['diagnostic_reports'] == []
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_references_are_resolved(self, fhir_bundle_file, streaming):
+        """Test that providers and locations are resolved, including forward references."""
+        result = FHIRIngestor(streaming=streaming).ingest(fhir_bundle_file)
+
+        encounter = result['encounters'][0]
+        assert encounter.provider == "Dr. Jane Smith"
+        assert encounter.location == "Phoebe Putney Memorial Hospital"
+
+        procedure = result['procedures'][0]
+        assert procedure.provider == "Dr. Jane Smith"
+        assert procedure.location == "Surgery center"
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_lean_mode_keeps_source_refs(self, fhir_bundle_file, streaming):
+        """Test that lean mode replaces raw resources with source references."""
+        full = FHIRIngestor(streaming=streaming).ingest(fhir_bundle_file)
+        lean = FHIRIngestor(streaming=streaming, lean=True).ingest(fhir_bundle_file)
+
+        observation = lean['observations'][0]
+        assert 'raw' not in observation
+        assert observation['source_ref'] == {
+            'source_file': str(fhir_bundle_file),
+            'resource_type': 'Observation',
+            'id': 'obs-1',
+            'entry': 4,
+        }
+        assert {k: v for k, v in observation.items() if k != 'source_ref'} == \
+            {k: v for k, v in full['observations'][0].items() if k != 'raw'}
+
+        encounter = lean['encounters'][0]
+        assert encounter.details == {'source_ref': {
+            'source_file': str(fhir_bundle_file),
+            'resource_type': 'Encounter',
+            'id': 'enc-1',
+            'entry': 2,
+        }}
+        assert encounter.provider == "Dr. Jane Smith"
+        assert encounter.location == "Phoebe Putney Memorial Hospital"
+        assert lean['procedures'][0].location == "Surgery center"
+
+    def test_streaming_matches_full_load(self, fhir_bundle_file):
+        """Test that streaming mode produces the same result as a full load."""
+        full = FHIRIngestor().ingest(fhir_bundle_file)
+        streamed = FHIRIngestor(streaming=True).ingest(fhir_bundle_file)
+
+        assert streamed.keys() == full.keys()
+        assert streamed['patient'] == full['patient']
+        assert streamed['conditions'] == full['conditions']
+        assert [e.summary for e in streamed['encounters']] == \
+            [e.summary for e in full['encounters']]
+        assert streamed['observations'] == full['observations']
+
+    def test_stream_threshold(self, fhir_bundle_file):
+        """Test that bundles above the size threshold are streamed."""
+        ingestor = FHIRIngestor(stream_threshold_bytes=1)
+        assert ingestor._should_stream(fhir_bundle_file)
+
+        ingestor = FHIRIngestor(stream_threshold_bytes=fhir_bundle_file.stat().st_size + 1)
+        assert not ingestor._should_stream(fhir_bundle_file)
+
+    def test_streaming_rejects_non_bundle(self, tmp_path):
+        """Test that streaming mode rejects non-Bundle resources."""
+        filepath = tmp_path / "patient.json"
+        filepath.write_text(json.dumps({"resourceType": "Patient", "id": "x"}))
+
+        with pytest.raises(ValueError):
+            FHIRIngestor(streaming=True).ingest(filepath)
+
+
+class TestIterTopLevel:
+    """Test suite for the incremental JSON reader."""
+
+    def test_streams_array_items_across_chunks(self, sample_fhir_bundle):
+        """Test that items are decoded correctly when split across reads."""
+        text = json.dumps(sample_fhir_bundle)
+
+        members = list(iter_top_level(io.StringIO(text), chunk_size=7))
+
+        entries = [value for key, value in members if key == 'entry']
+        assert entries == sample_fhir_bundle['entry']
+        assert ('resourceType', 'Bundle') in members
+        assert ('type', 'collection') in members
+
+    def test_trailing_number(self):
+        """Test that numbers ending exactly at a chunk boundary are not truncated."""
+        members = list(iter_top_level(io.StringIO('{"total": 12345}'), chunk_size=13))
+
+        assert members == [('total', 12345)]
+
+    def test_empty_array(self):
+        """Test that empty streamed arrays yield nothing."""
+        members = list(iter_top_level(io.StringIO('{"entry": [], "id": "b"}')))
+
+        assert members == [('id', 'b')]
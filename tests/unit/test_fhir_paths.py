@@ -0,0 +1,127 @@
+"""Unit tests for compiled FHIR extraction plans."""
+
+from datetime import datetime
+
+import pytest
+
+from dr_nexus.ingestors.fhir_paths import (
+    ExtractionPlan,
+    PathField,
+    compile_path,
+    parse_fhir_datetime,
+)
+
+
+CONDITION = {
+    "resourceType": "Condition",
+    "code": {
+        "text": "Hypertension",
+        "coding": [
+            {"system": "http://snomed.info/sct", "code": "38341003"},
+            {"system": "http://hl7.org/fhir/sid/ICD-10-CM", "code": "I10"}
+        ]
+    },
+    "category": [
+        {"coding": [{"code": "problem-list-item"}]},
+        {"coding": [{"code": "encounter-diagnosis"}]}
+    ],
+    "onsetDateTime": "2020-01-01T08:00:00Z"
+}
+
+
+class TestCompilePath:
+    """Test suite for FHIR path compilation."""
+
+    def test_child_elements_are_flattened(self):
+        """Test that repeating elements along a path are flattened."""
+        assert compile_path('category.coding.code')(CONDITION) == \
+            ['problem-list-item', 'encounter-diagnosis']
+
+    def test_index(self):
+        """Test that an index selects from the flattened collection."""
+        assert compile_path('category[1].coding[0].code')(CONDITION) == ['encounter-diagnosis']
+        assert compile_path('category.coding[1].code')(CONDITION) == ['encounter-diagnosis']
+        assert compile_path('category[2].coding.code')(CONDITION) == []
+
+    def test_where(self):
+        """Test equality and case-insensitive contains filters."""
+        assert compile_path("code.coding.where(system ~ 'icd-10').code")(CONDITION) == ['I10']
+        assert compile_path(
+            "code.coding.where(system = 'http://snomed.info/sct').code"
+        )(CONDITION) == ['38341003']
+        assert compile_path("code.coding.where(system = 'icd-10').code")(CONDITION) == []
+
+    def test_alternatives(self):
+        """Test that the first alternative selecting anything wins."""
+        assert compile_path('code.display | code.text')(CONDITION) == ['Hypertension']
+        assert compile_path('code.text | onsetDateTime')(CONDITION) == ['Hypertension']
+
+    def test_missing_and_mistyped_elements(self):
+        """Test that absent elements and primitives along a path select nothing."""
+        assert compile_path('subject.reference')(CONDITION) == []
+        assert compile_path('onsetDateTime.value')(CONDITION) == []
+
+    @pytest.mark.parametrize('expression', ['', 'code..text', 'code.where(system)', 'code[x]'])
+    def test_invalid_expression(self, expression):
+        """Test that malformed expressions are rejected at compile time."""
+        with pytest.raises(ValueError):
+            compile_path(expression)
+
+
+class TestExtractionPlan:
+    """Test suite for ExtractionPlan."""
+
+    def test_extract(self):
+        """Test defaults, conversion and multi-valued fields."""
+        plan = ExtractionPlan({
+            'name': PathField('code.text'),
+            'icd10': PathField("code.coding.where(system ~ 'icd-10').code"),
+            'abatement': PathField('abatementDateTime', 'unknown'),
+            'onset': PathField('onsetDateTime', convert=parse_fhir_datetime),
+            'codes': PathField('code.coding.code', many=True),
+        })
+
+        fields = plan.extract(CONDITION)
+
+        assert fields == {
+            'name': 'Hypertension',
+            'icd10': 'I10',
+            'abatement': 'unknown',
+            'onset': datetime(2020, 1, 1, 8, 0),
+            'codes': ['38341003', 'I10'],
+        }
+
+    def test_single_values_follow_flattening(self):
+        """Test that single-valued fields take the first value of the flattened collection."""
+        condition = dict(CONDITION, category=[{"text": "no coding"}, *CONDITION['category']])
+        plan = ExtractionPlan({
+            'first': PathField('category.coding.code'),
+            'second': PathField('category.coding[1].code'),
+            'direct': PathField('category[1].coding[0].code'),
+            'icd10': PathField("code.coding.where(system ~ 'icd-10').code | code.text"),
+        })
+
+        assert plan.extract(condition) == {
+            'first': 'problem-list-item',
+            'second': 'encounter-diagnosis',
+            'direct': 'problem-list-item',
+            'icd10': 'I10',
+        }
+
+    def test_failed_conversion_uses_default(self):
+        """Test that a value the converter rejects falls back to the default."""
+        plan = ExtractionPlan({'onset': PathField('onsetDateTime', 'n/a', parse_fhir_datetime)})
+
+        assert plan.extract({"onsetDateTime": "not a date"}) == {'onset': 'n/a'}
+
+    def test_extract_all_preserves_order(self):
+        """Test bulk extraction over a batch of resources."""
+        plan = ExtractionPlan({'id': PathField('id'), 'text': PathField('code.text', '')})
+        resources = [{"id": str(i), "code": {"text": f"c{i}"}} for i in range(3)] + [{"id": "x"}]
+
+        assert plan.extract_all(resources) == [
+            {'id': '0', 'text': 'c0'},
+            {'id': '1', 'text': 'c1'},
+            {'id': '2', 'text': 'c2'},
+            {'id': 'x', 'text': ''},
+        ]
@@ -0,0 +1,65 @@
+"""Unit tests for FHIR reference resolution."""
+
+import pytest
+
+from dr_nexus.ingestors.fhir_references import ReferenceIndex, display_name, reference_key
+
+
+PRACTITIONER = {
+    "resourceType": "Practitioner",
+    "id": "prac-1",
+    "name": [{"given": ["Jane"], "family": "Smith", "prefix": ["Dr."]}]
+}
+
+
+class TestReferenceIndex:
+    """Test suite for ReferenceIndex."""
+
+    @pytest.mark.parametrize('reference, expected', [
+        ("Practitioner/1", "Practitioner/1"),
+        ("https://example.org/fhir/Practitioner/1", "Practitioner/1"),
+        ("Practitioner/1/_history/3", "Practitioner/1"),
+        ("urn:uuid:abc", "urn:uuid:abc"),
+    ])
+    def test_reference_key(self, reference, expected):
+        """Test normalization of literal references."""
+        assert reference_key(reference) == expected
+
+    def test_display_name(self):
+        """Test names of practitioners, organizations and locations."""
+        assert display_name(PRACTITIONER) == "Dr. Jane Smith"
+        assert display_name({"name": [{"text": "Smith, Jane"}]}) == "Smith, Jane"
+        assert display_name({"resourceType": "Location", "name": "Main Clinic"}) == "Main Clinic"
+        assert display_name({"resourceType": "Location"}) is None
+
+    def test_resolve_by_id_and_full_url(self):
+        """Test lookups by ResourceType/id, absolute URL and fullUrl."""
+        index = ReferenceIndex(['Practitioner'])
+        index.add(PRACTITIONER, "urn:uuid:1234")
+        index.add({"resourceType": "Observation", "id": "obs-1"})
+
+        assert index.resolve("Practitioner/prac-1") is PRACTITIONER
+        assert index.resolve("http://example.org/fhir/Practitioner/prac-1") is PRACTITIONER
+        assert index.resolve("urn:uuid:1234") is PRACTITIONER
+        assert index.resolve("Observation/obs-1") is None
+        assert index.resolve("#contained") is None
+        assert len(index) == 2
+
+    def test_describe_falls_back_to_display(self):
+        """Test that unresolved references use their display text."""
+        index = ReferenceIndex(['Practitioner'])
+        index.add(PRACTITIONER)
+
+        assert index.describe({"reference": "Practitioner/prac-1", "display": "J"}) == "Dr. Jane Smith"
+        assert index.describe({"reference": "Practitioner/other", "display": "Dr. Who"}) == "Dr. Who"
+        assert index.describe({"reference": "Practitioner/other"}) is None
+        assert index.describe(None) is None
+
+    def test_describe_sees_resources_added_later(self):
+        """Test that cached names are refreshed when the index grows."""
+        index = ReferenceIndex(['Practitioner'])
+        assert index.describe({"reference": "Practitioner/prac-1"}) is None
+
+        index.add(PRACTITIONER)
+
+        assert index.describe({"reference": "Practitioner/prac-1"}) == "Dr. Jane Smith"
@@ -0,0 +1,112 @@
+"""Unit tests for header-based format detection."""
+
+import json
+
+import pytest
+
+from dr_nexus.ingestors.format_detection import FormatDetector, detect_format
+from dr_nexus.models.document import DocumentType
+
+
+CCDA_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<?xml-stylesheet type="text/xsl" href="CDA.xsl"?>\n'
+    '<!-- exported from portal -->\n'
+    '<ClinicalDocument xmlns="urn:hl7-org:v3" xmlns:sdtc="urn:hl7-org:sdtc">'
+    '<realmCode code="US"/></ClinicalDocument>'
+)
+
+
+class TestFormatDetection:
+    """Test suite for format detection."""
+
+    def test_fhir_bundle_without_extension(self, tmp_path, sample_fhir_bundle):
+        """Test that bundles are detected regardless of extension."""
+        filepath = tmp_path / "export"
+        filepath.write_text(json.dumps(sample_fhir_bundle, indent=2))
+
+        assert detect_format(filepath) == DocumentType.FHIR_BUNDLE
+
+    def test_nested_resource_type_is_ignored(self, tmp_path):
+        """Test that a nested resourceType does not decide the document type."""
+        filepath = tmp_path / "patient.json"
+        filepath.write_text(json.dumps({
+            "contained": [{"resourceType": "Bundle"}],
+            "resourceType": "Patient"
+        }))
+
+        assert detect_format(filepath) == DocumentType.OTHER
+
+    def test_truncated_bundle_header(self, tmp_path, sample_fhir_bundle):
+        """Test detection when the sniffed header cuts the bundle short."""
+        filepath = tmp_path / "big.json"
+        bundle = dict(sample_fhir_bundle)
+        bundle['entry'] = bundle['entry'] * 200
+        filepath.write_text(json.dumps(bundle))
+
+        assert detect_format(filepath) == DocumentType.FHIR_BUNDLE
+
+    def test_ccda_with_wrong_extension(self, tmp_path):
+        """Test that C-CDA is detected from its root element."""
+        filepath = tmp_path / "document.txt"
+        filepath.write_text(CCDA_HEADER)
+
+        assert detect_format(filepath) == DocumentType.CCDA
+
+    @pytest.mark.parametrize("content,expected", [
+        (b'%PDF-1.7\n...', DocumentType.PDF),
+        (b'\xff\xd8\xff\xe0JFIF', DocumentType.IMAGE),
+        (b'<!DOCTYPE html><html></html>', DocumentType.HTML),
+        (b'{"resourceType": "Patient"}\n{"resourceType": "Patient"}\n', DocumentType.NDJSON),
+        (b'{\n  "transactionTime": "2025-01-01", "output": []\n}', DocumentType.NDJSON),
+    ])
+    def test_sniffed_types(self, tmp_path, content, expected):
+        """Test magic-number and content sniffers."""
+        filepath = tmp_path / "unknown"
+        filepath.write_bytes(content)
+
+        assert detect_format(filepath) == expected
+
+    @pytest.mark.parametrize("name,expected", [
+        ("patient.json", DocumentType.OTHER),
+        ("patient", DocumentType.OTHER),
+        ("patient.ndjson", DocumentType.NDJSON),
+    ])
+    def test_single_minified_resource(self, tmp_path, name, expected):
+        """Test that one resource on one line is NDJSON only by its extension."""
+        filepath = tmp_path / name
+        filepath.write_text(json.dumps({"resourceType": "Patient", "id": "p1"}) + "\n")
+
+        assert detect_format(filepath) == expected
+
+    def test_ndjson_with_long_first_line(self, tmp_path):
+        """Test that an extensionless NDJSON file is found past a first line longer than the window."""
+        line = json.dumps({"resourceType": "Observation", "note": [{"text": "x" * 20000}]})
+        filepath = tmp_path / "export"
+        filepath.write_text(f"{line}\n{line}\n")
+
+        assert detect_format(filepath) == DocumentType.NDJSON
+
+        filepath.write_text(line)
+        assert detect_format(filepath) == DocumentType.OTHER
+
+    def test_extension_fallback(self, tmp_path):
+        """Test that an empty file falls back to its extension."""
+        filepath = tmp_path / "empty.ndjson"
+        filepath.write_bytes(b'')
+
+        assert detect_format(filepath) == DocumentType.NDJSON
+
+    def test_custom_sniffer_registration(self, tmp_path):
+        """Test that registered sniffers run in priority order."""
+        filepath = tmp_path / "note.txt"
+        filepath.write_text("CLINICAL NOTE")
+
+        detector = FormatDetector()
+        detector.register(lambda head, path: DocumentType.OTHER, priority=50)
+        detector.register(
+            lambda head, path: DocumentType.HTML if head.startswith(b'CLINICAL') else None,
+            priority=10
+        )
+
+        assert detector.detect(filepath) == DocumentType.HTML
@@ -0,0 +1,56 @@
+"""Unit tests for the JSON codec."""
+
+import json
+
+import pytest
+
+from dr_nexus.knowledge_base.kb_loader import KBLoader
+from dr_nexus.output.json_generator import JSONGenerator
+from dr_nexus.utils import json_codec
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def backend(request, monkeypatch):
+    """Run a test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == 'json':
+        monkeypatch.setattr(json_codec, 'orjson', None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+class TestJSONCodec:
+    """Test suite for json_codec."""
+
+    def test_round_trip(self, backend):
+        """Test that encoded values decode unchanged, including non-ASCII text."""
+        value = {"name": "Zoë", "values": [1, 2.5, None, True], "nested": {"a": []}}
+
+        encoded = json_codec.dumps(value, indent=True)
+
+        assert json.loads(encoded) == value
+        assert "Zoë".encode('utf-8') in encoded
+        assert json_codec.loads(encoded) == value
+
+    def test_load_file_skips_bom(self, tmp_path, backend):
+        """Test that files with a UTF-8 byte order mark decode."""
+        filepath = tmp_path / "bom.json"
+        filepath.write_bytes(b'\xef\xbb\xbf{"a": 1}')
+
+        assert json_codec.load_file(filepath) == {"a": 1}
+
+    @pytest.mark.parametrize('content', [b'', b'{"a": ', b'not json'])
+    def test_malformed_file_raises(self, tmp_path, backend, content):
+        """Test that empty and malformed files raise JSONDecodeError."""
+        filepath = tmp_path / "bad.json"
+        filepath.write_bytes(content)
+
+        with pytest.raises(json_codec.JSONDecodeError):
+            json_codec.load_file(filepath)
+
+    def test_knowledge_base_round_trip(self, sample_knowledge_base, temp_json_file, backend):
+        """Test that a saved knowledge base loads back equal."""
+        JSONGenerator.save(sample_knowledge_base, temp_json_file)
+
+        assert JSONGenerator.validate_json(temp_json_file)
+        assert KBLoader.load(temp_json_file) == sample_knowledge_base
@@ -22,6 +22,21 @@ class TestKBLoader:
         assert loaded_kb.metadata.version == sample_knowledge_base.metadata.version
         assert loaded_kb.patient_profile.demographics.name == sample_knowledge_base.patient_profile.demographics.name
 
+    @pytest.mark.parametrize("pretty", [True, False])
+    def test_float_round_trip(self, sample_knowledge_base, sample_timeline_event, temp_json_file, pretty):
+        """Test that small, large and fractional floats load back unchanged."""
+        sample_knowledge_base.metadata.processing_duration_seconds = 1e-05
+        sample_knowledge_base.timeline = [
+            sample_timeline_event.model_copy(update={'details': {'values': [1e-05, 0.1, 1e20, 13.5]}})
+        ]
+
+        JSONGenerator.save(sample_knowledge_base, temp_json_file, pretty=pretty)
+        loaded_kb = KBLoader.load(temp_json_file)
+
+        assert loaded_kb.metadata.processing_duration_seconds == 1e-05
+        assert loaded_kb.timeline[0].details == {'values': [1e-05, 0.1, 1e20, 13.5]}
+        assert '0.00001' in temp_json_file.read_text()
+
     def test_load_nonexistent_kb(self, tmp_path):
         """Test loading a nonexistent file returns None."""
         nonexistent_file = tmp_path / "does_not_exist.json"
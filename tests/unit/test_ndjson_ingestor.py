@@ -0,0 +1,95 @@
+"""Unit tests for NDJSONIngestor."""
+
+import json
+
+import pytest
+
+from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+from dr_nexus.ingestors.ndjson_ingestor import NDJSONIngestor
+
+
+@pytest.fixture
+def bulk_export_dir(tmp_path, sample_fhir_bundle):
+    """Bulk Data export with one NDJSON file per resource type."""
+    export_dir = tmp_path / "bulk"
+    export_dir.mkdir()
+
+    by_type = {}
+    for entry in sample_fhir_bundle['entry']:
+        resource = entry['resource']
+        by_type.setdefault(resource['resourceType'], []).append(resource)
+
+    outputs = []
+    for rtype, resources in by_type.items():
+        (export_dir / f"{rtype}.ndjson").write_text(
+            "\n".join(json.dumps(r) for r in resources) + "\n",
+            encoding="utf-8"
+        )
+        outputs.append({"type": rtype, "url": f"https://example.org/bulk/{rtype}.ndjson"})
+
+    manifest = {"transactionTime": "2025-01-01T00:00:00Z", "output": outputs, "error": []}
+    (export_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return export_dir
+
+
+class TestNDJSONIngestor:
+    """Test suite for NDJSONIngestor."""
+
+    def test_can_ingest(self, bulk_export_dir, fhir_bundle_file):
+        """Test detection of manifests and NDJSON files."""
+        ingestor = NDJSONIngestor()
+
+        assert ingestor.can_ingest(bulk_export_dir / "manifest.json")
+        assert ingestor.can_ingest(bulk_export_dir / "Patient.ndjson")
+        assert not ingestor.can_ingest(fhir_bundle_file)
+
+    def test_manifest_matches_bundle_output(self, bulk_export_dir, fhir_bundle_file):
+        """Test that a Bulk Data export yields the same shape as a FHIR Bundle."""
+        bundle_result = FHIRIngestor().ingest(fhir_bundle_file)
+        ndjson_result = NDJSONIngestor(chunk_size=1).ingest(bulk_export_dir / "manifest.json")
+
+        assert ndjson_result.keys() == bundle_result.keys()
+        assert ndjson_result['patient'] == bundle_result['patient']
+        assert ndjson_result['conditions'] == bundle_result['conditions']
+        assert ndjson_result['observations'] == bundle_result['observations']
+        assert len(ndjson_result['encounters']) == 1
+        assert ndjson_result['encounters'][0].location == "Phoebe Putney Memorial Hospital"
+        assert ndjson_result['procedures'][0].provider == "Dr. Jane Smith"
+
+    def test_process_pool_preserves_order(self, tmp_path):
+        """Test that chunks extracted in worker processes keep file order."""
+        filepath = tmp_path / "Observation.ndjson"
+        observations = [
+            {"resourceType": "Observation", "id": f"obs-{i}", "code": {"text": f"Test {i}"}}
+            for i in range(25)
+        ]
+        filepath.write_text("\n".join(json.dumps(o) for o in observations), encoding="utf-8")
+
+        result = NDJSONIngestor(max_workers=2, chunk_size=4).ingest(filepath)
+
+        assert [o['name'] for o in result['observations']] == [f"Test {i}" for i in range(25)]
+
+    def test_malformed_lines_are_skipped(self, tmp_path):
+        """Test that malformed lines do not abort the file."""
+        filepath = tmp_path / "Condition.ndjson"
+        filepath.write_text(
+            '{"resourceType": "Condition", "code": {"text": "A"}}\n'
+            'not json\n'
+            '{"resourceType": "Condition", "code": {"text": "B"}}\n',
+            encoding="utf-8"
+        )
+
+        result = NDJSONIngestor().ingest(filepath)
+
+        assert [c.name for c in result['conditions']] == ["A", "B"]
+
+    def test_group_exports(self, bulk_export_dir, tmp_path):
+        """Test that NDJSON files in an export collapse to the manifest."""
+        standalone = tmp_path / "extra.ndjson"
+        standalone.write_text("")
+
+        inputs = NDJSONIngestor.group_exports(
+            sorted(bulk_export_dir.glob("*.ndjson")) + [standalone]
+        )
+
+        assert inputs == [bulk_export_dir / "manifest.json", standalone]
@@ -0,0 +1,82 @@
+"""Unit tests for ParallelIngestionEngine."""
+
+import json
+
+import pytest
+
+from dr_nexus.ingestors.parallel import ParallelIngestionEngine
+from dr_nexus.models.document import DocumentType
+
+
+@pytest.fixture
+def bundle_files(tmp_path, sample_fhir_bundle):
+    """Several FHIR Bundles with distinct patients."""
+    files = []
+    for i in range(7):
+        bundle = json.loads(json.dumps(sample_fhir_bundle))
+        bundle['entry'][0]['resource']['id'] = f"patient-{i}"
+        filepath = tmp_path / f"bundle_{i}_FHIR.json"
+        filepath.write_text(json.dumps(bundle))
+        files.append(filepath)
+    return files
+
+
+class TestParallelIngestionEngine:
+    """Test suite for ParallelIngestionEngine."""
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_results_in_input_order(self, bundle_files, max_workers):
+        """Test that results come back in input order across batches."""
+        engine = ParallelIngestionEngine(max_workers=max_workers, batch_size=3)
+
+        results = engine.ingest((DocumentType.FHIR_BUNDLE, f) for f in bundle_files)
+
+        assert [r.filepath for r in results] == bundle_files
+        assert [r.data['patient'].patient_id for r in results] == \
+            [f"patient-{i}" for i in range(7)]
+
+    def test_errors_and_skips_are_isolated(self, tmp_path, bundle_files):
+        """Test that a bad file does not lose the rest of its batch."""
+        not_a_bundle = tmp_path / "notes_FHIR.json"
+        not_a_bundle.write_text(json.dumps({"resourceType": "Patient"}))
+        truncated = tmp_path / "broken_FHIR.json"
+        truncated.write_text('{"resourceType": "Bundle", "entry": [')
+
+        engine = ParallelIngestionEngine(max_workers=1, batch_size=10)
+        results = engine.ingest([
+            (DocumentType.FHIR_BUNDLE, not_a_bundle),
+            (DocumentType.FHIR_BUNDLE, truncated),
+            (DocumentType.FHIR_BUNDLE, bundle_files[0]),
+        ])
+
+        assert results[0].skipped
+        assert results[1].error is not None
+        assert results[2].data['patient'] is not None
+
+    def test_ingestor_options(self, bundle_files):
+        """Test that per-type constructor options reach the ingestor."""
+        engine = ParallelIngestionEngine(
+            max_workers=1,
+            ingestor_options={DocumentType.FHIR_BUNDLE: {'streaming': True}}
+        )
+
+        results = engine.ingest([(DocumentType.FHIR_BUNDLE, bundle_files[0])])
+
+        assert results[0].data['conditions'][0].name == "Hypertension"
+
+    def test_default_ccda_crosses_workers(self, ccda_file):
+        """Test that a full C-CDA parse with default options survives a worker pool."""
+        engine = ParallelIngestionEngine(max_workers=2)
+
+        results = engine.ingest([(DocumentType.CCDA, ccda_file)])
+
+        assert results[0].error is None
+        assert results[0].data['patient']['name'] == "John Doe"
+        assert len(results[0].data['sections']['problems']) == 1
+
+    def test_unregistered_type(self, tmp_path):
+        """Test that unsupported document types are rejected."""
+        engine = ParallelIngestionEngine(max_workers=1)
+
+        with pytest.raises(ValueError):
+            engine.ingest([(DocumentType.PDF, tmp_path / "scan.pdf")])
@@ -0,0 +1,104 @@
+"""Unit tests for ParsedDocumentCache."""
+
+import os
+
+from dr_nexus.ingestors.cache import ParsedDocumentCache
+from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+from dr_nexus.ingestors.parallel import ParallelIngestionEngine
+from dr_nexus.models.document import DocumentType
+
+
+class TestParsedDocumentCache:
+    """Test suite for ParsedDocumentCache."""
+
+    def test_round_trip(self, tmp_path, fhir_bundle_file):
+        """Test storing and loading ingestor output."""
+        cache = ParsedDocumentCache(tmp_path / "cache")
+        data = FHIRIngestor().ingest(fhir_bundle_file)
+        key = cache.make_key(fhir_bundle_file, FHIRIngestor)
+
+        assert cache.get(key) is None
+        cache.put(key, data)
+
+        cached = cache.get(key)
+        assert cached['patient'] == data['patient']
+        assert cached['conditions'] == data['conditions']
+
+    def test_unpicklable_payload_is_skipped(self, tmp_path):
+        """Test that a payload that cannot be pickled is not cached."""
+        cache = ParsedDocumentCache(tmp_path / "cache")
+
+        cache.put("ab" * 32, {'callback': lambda: None})
+
+        assert cache.get("ab" * 32) is None
+
+    def test_key_depends_on_content_version_and_options(self, tmp_path, fhir_bundle_file):
+        """Test that content, path, ingestor version and options all change the key."""
+        cache = ParsedDocumentCache(tmp_path / "cache")
+        key = cache.make_key(fhir_bundle_file, FHIRIngestor)
+
+        assert cache.make_key(fhir_bundle_file, FHIRIngestor, {'streaming': True}) != key
+
+        class PatchedIngestor(FHIRIngestor):
+            VERSION = FHIRIngestor.VERSION + "-patched"
+
+        assert cache.make_key(fhir_bundle_file, PatchedIngestor) != key
+
+        copy = tmp_path / "copy_FHIR.json"
+        copy.write_bytes(fhir_bundle_file.read_bytes())
+        assert cache.make_key(copy, FHIRIngestor) != key
+
+        fhir_bundle_file.write_text(fhir_bundle_file.read_text() + " ")
+        assert cache.make_key(fhir_bundle_file, FHIRIngestor) != key
+
+    def test_identical_files_keep_their_own_paths(self, tmp_path, fhir_bundle_file):
+        """Test that a copy of a cached file is not served the original's paths."""
+        cache = ParsedDocumentCache(tmp_path / "cache")
+        copy = tmp_path / "copy_FHIR.json"
+        copy.write_bytes(fhir_bundle_file.read_bytes())
+        engine = ParallelIngestionEngine(
+            max_workers=1,
+            cache=cache,
+            ingestor_options={DocumentType.FHIR_BUNDLE: {'lean': True}}
+        )
+
+        original, copied = engine.ingest([
+            (DocumentType.FHIR_BUNDLE, fhir_bundle_file),
+            (DocumentType.FHIR_BUNDLE, copy),
+        ])
+
+        assert not copied.cached
+        assert original.data['source_file'] == str(fhir_bundle_file)
+        assert copied.data['source_file'] == str(copy)
+        assert copied.data['observations'][0]['source_ref']['source_file'] == str(copy)
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that least-recently-used entries are evicted first."""
+        cache = ParsedDocumentCache(tmp_path / "cache", max_bytes=0)
+        for i, key in enumerate(["aa01", "aa02", "aa03"]):
+            cache.put(key, {'payload': os.urandom(2000)})
+            os.utime(cache._entry_path(key), (1000 + i, 1000 + i))
+
+        entry_size = cache._entry_path("aa01").stat().st_size
+        cache.max_bytes = entry_size * 2 + 10
+        cache.get("aa01")  # Refresh the oldest entry
+
+        assert cache.evict() == 1
+        assert cache.get("aa02") is None
+        assert cache.get("aa01") is not None
+        assert cache.get("aa03") is not None
+
+    def test_engine_reports_hit_rate(self, tmp_path, fhir_bundle_file):
+        """Test that a second run is served from the cache."""
+        cache = ParsedDocumentCache(tmp_path / "cache")
+        jobs = [(DocumentType.FHIR_BUNDLE, fhir_bundle_file)]
+
+        first = ParallelIngestionEngine(max_workers=1, cache=cache)
+        assert not first.ingest(jobs)[0].cached
+        assert first.cache_hit_rate == 0.0
+
+        second = ParallelIngestionEngine(max_workers=1, cache=cache)
+        result = second.ingest(jobs)[0]
+        assert result.cached
+        assert result.data['patient'].name == "John Doe"
+        assert second.cache_hit_rate == 1.0
@@ -0,0 +1,107 @@
+"""Unit tests for the seen-resource index and skipping at ingestion."""
+
+import json
+
+import pytest
+
+from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+from dr_nexus.ingestors.ndjson_ingestor import NDJSONIngestor
+from dr_nexus.ingestors.seen_index import SeenResourceIndex, resource_key
+
+
+@pytest.fixture
+def versioned_bundle(sample_fhir_bundle):
+    """Sample bundle whose resources carry meta.versionId."""
+    bundle = json.loads(json.dumps(sample_fhir_bundle))
+    for entry in bundle['entry']:
+        entry['resource']['meta'] = {'versionId': '1'}
+    return bundle
+
+
+def _write(path, bundle):
+    path.write_text(json.dumps(bundle), encoding="utf-8")
+    return path
+
+
+class TestSeenResourceIndex:
+    """Test suite for SeenResourceIndex."""
+
+    def test_resource_key(self):
+        """Test keys from versionId, lastUpdated, or neither."""
+        assert resource_key({"resourceType": "Condition", "id": "c", "meta": {"versionId": "2"}}) == \
+            "Condition/c/2"
+        assert resource_key(
+            {"resourceType": "Condition", "id": "c", "meta": {"lastUpdated": "2024-01-01T00:00:00Z"}}
+        ) == "Condition/c/2024-01-01T00:00:00Z"
+        assert resource_key({"resourceType": "Condition", "id": "c"}) is None
+        assert resource_key({"resourceType": "Condition", "meta": {"versionId": "2"}}) is None
+
+    def test_commit_persists_and_rollback_discards(self, tmp_path):
+        """Test that only committed keys survive a reload."""
+        path = tmp_path / "seen.json"
+        index = SeenResourceIndex(path, scope="kb")
+        index.stage(["Condition/c/1"])
+        index.commit()
+        index.stage(["Condition/c/2"])
+        assert "Condition/c/2" in index
+        index.rollback()
+
+        reloaded = SeenResourceIndex(path, scope="kb")
+
+        assert "Condition/c/1" in reloaded
+        assert "Condition/c/2" not in reloaded
+        assert len(SeenResourceIndex(path, scope="other kb")) == 0
+
+
+class TestSkipSeenResources:
+    """Test suite for skipping seen resources in the FHIR ingestors."""
+
+    def test_overlapping_bundles(self, tmp_path, versioned_bundle):
+        """Test that a second copy of a bundle only yields the always-kept resources."""
+        index = SeenResourceIndex()
+        ingestor = FHIRIngestor(seen_index=index)
+
+        first = ingestor.ingest(_write(tmp_path / "a.json", versioned_bundle))
+        second = ingestor.ingest(_write(tmp_path / "b.json", versioned_bundle))
+
+        assert len(first['conditions']) == 1
+        assert second['conditions'] == []
+        assert second['observations'] == []
+        assert ingestor.skipped_resources == 6
+        assert second['patient'] == first['patient']
+        assert len(second['practitioners']) == 1
+
+    def test_new_version_is_not_skipped(self, tmp_path, versioned_bundle):
+        """Test that an updated resource is extracted again."""
+        index = SeenResourceIndex()
+        FHIRIngestor(seen_index=index).ingest(_write(tmp_path / "a.json", versioned_bundle))
+
+        versioned_bundle['entry'][1]['resource']['meta'] = {'versionId': '2'}
+        result = FHIRIngestor(seen_index=index).ingest(_write(tmp_path / "b.json", versioned_bundle))
+
+        assert [c.icd10_code for c in result['conditions']] == ["I10"]
+        assert result['encounters'] == []
+
+    def test_failed_document_is_not_staged(self, tmp_path, versioned_bundle):
+        """Test that resources of a document that failed to ingest are not marked seen."""
+        index = SeenResourceIndex()
+        # A patient without a birth date fails model validation
+        del versioned_bundle['entry'][0]['resource']['birthDate']
+
+        with pytest.raises(ValueError):
+            FHIRIngestor(seen_index=index).ingest(_write(tmp_path / "a.json", versioned_bundle))
+
+        assert "Condition/cond-1/1" not in index
+
+    def test_ndjson_export(self, tmp_path, versioned_bundle):
+        """Test skipping duplicates within an NDJSON export and across exports."""
+        index = SeenResourceIndex()
+        ndjson = tmp_path / "Observation.ndjson"
+        observation = versioned_bundle['entry'][4]['resource']
+        ndjson.write_text(json.dumps(observation) + "\n" + json.dumps(observation) + "\n")
+
+        first = NDJSONIngestor(seen_index=index).ingest(ndjson)
+        second = NDJSONIngestor(seen_index=index).ingest(ndjson)
+
+        assert len(first['observations']) == 1
+        assert second['observations'] == []
@@ -0,0 +1,59 @@
+"""Unit tests for source references and fetching resources back."""
+
+import json
+
+import pytest
+
+from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
+from dr_nexus.ingestors.ndjson_ingestor import NDJSONIngestor
+from dr_nexus.ingestors.source_refs import fetch_resource, make_source_ref
+
+
+class TestFetchResource:
+    """Test suite for fetch_resource."""
+
+    def test_fetch_from_bundle(self, fhir_bundle_file, sample_fhir_bundle):
+        """Test that lean references fetch the original bundle resources."""
+        result = FHIRIngestor(lean=True).ingest(fhir_bundle_file)
+
+        assert fetch_resource(result['observations'][0]['source_ref']) == \
+            sample_fhir_bundle['entry'][4]['resource']
+        assert fetch_resource(result['procedures'][0].details['source_ref']) == \
+            sample_fhir_bundle['entry'][3]['resource']
+
+    def test_fetch_from_rewritten_bundle(self, fhir_bundle_file, sample_fhir_bundle):
+        """Test that a moved entry is found by resource type and id."""
+        source_ref = make_source_ref(
+            str(fhir_bundle_file), sample_fhir_bundle['entry'][4]['resource'], entry=4
+        )
+        sample_fhir_bundle['entry'].reverse()
+        fhir_bundle_file.write_text(json.dumps(sample_fhir_bundle), encoding="utf-8")
+
+        assert fetch_resource(source_ref)['id'] == "obs-1"
+
+    def test_fetch_from_ndjson(self, tmp_path):
+        """Test that NDJSON references seek to the resource's line."""
+        filepath = tmp_path / "Observation.ndjson"
+        observations = [
+            {"resourceType": "Observation", "id": f"obs-{i}", "code": {"text": f"Tëst {i}"}}
+            for i in range(5)
+        ]
+        lines = [json.dumps(o, ensure_ascii=False) for o in observations]
+        filepath.write_bytes(
+            b'\xef\xbb\xbf' + "\n\n".join(lines).encode('utf-8') + b"\n"
+        )
+
+        result = NDJSONIngestor(chunk_size=2, lean=True).ingest(filepath)
+
+        fetched = [fetch_resource(o['source_ref']) for o in result['observations']]
+        assert fetched == observations
+        assert result['observations'][0]['source_ref']['source_file'] == str(filepath)
+
+    def test_missing_resource(self, fhir_bundle_file):
+        """Test that a resource no longer in its file raises ValueError."""
+        source_ref = make_source_ref(
+            str(fhir_bundle_file), {"resourceType": "Observation", "id": "gone"}, entry=4
+        )
+
+        with pytest.raises(ValueError):
+            fetch_resource(source_ref)
@@ -0,0 +1,74 @@
+"""Unit tests for date and time normalization."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from dr_nexus.utils.temporal import (
+    HOUR,
+    epoch_key,
+    from_epoch_key,
+    normalize_date,
+    normalize_datetime,
+    normalize_datetimes,
+)
+
+
+class TestNormalizeDatetime:
+    """Test suite for normalize_datetime."""
+
+    @pytest.mark.parametrize('value, expected', [
+        ("2020-05-15T10:30:00Z", datetime(2020, 5, 15, 10, 30)),
+        ("2020-05-15T10:30:00.250+02:00", datetime(2020, 5, 15, 8, 30, 0, 250000)),
+        ("2020-05-15", datetime(2020, 5, 15)),
+        ("2020-05", datetime(2020, 5, 1)),
+        ("2020", datetime(2020, 1, 1)),
+        ("20200515103000-0500", datetime(2020, 5, 15, 15, 30)),
+        ("20200515103000.5+0100", datetime(2020, 5, 15, 9, 30, 0, 500000)),
+        ("20200515", datetime(2020, 5, 15)),
+        ("202005", datetime(2020, 5, 1)),
+        (" 20200515 ", datetime(2020, 5, 15)),
+    ])
+    def test_formats(self, value, expected):
+        """Test FHIR, ISO and HL7 formats, including partial dates and offsets."""
+        assert normalize_datetime(value) == expected
+
+    @pytest.mark.parametrize('value', ["", "n/a", "2020-13-01", "20201345", "2020-05-15T25:00", None, 42])
+    def test_invalid_values(self, value):
+        """Test that missing or invalid values yield None."""
+        assert normalize_datetime(value) is None
+
+    def test_objects(self):
+        """Test that datetimes become naive UTC and dates start at midnight."""
+        aware = datetime(2020, 5, 15, 10, 30, tzinfo=timezone(timedelta(hours=-4)))
+
+        assert normalize_datetime(aware) == datetime(2020, 5, 15, 14, 30)
+        assert normalize_datetime(datetime(2020, 5, 15, 10, 30)) == datetime(2020, 5, 15, 10, 30)
+        assert normalize_datetime(date(2020, 5, 15)) == datetime(2020, 5, 15)
+
+    def test_normalize_date(self):
+        """Test dates from timestamps (in UTC), partial dates and date objects."""
+        assert normalize_date("2020-05-15T23:30:00-05:00") == date(2020, 5, 16)
+        assert normalize_date("1990") == date(1990, 1, 1)
+        assert normalize_date(date(2020, 5, 15)) == date(2020, 5, 15)
+        assert normalize_date("garbage") is None
+
+    def test_batch_matches_single(self):
+        """Test that batch normalization matches value-by-value normalization."""
+        values = ["2020-05-15T10:30:00Z", "20200515", None, "2020-05-15T10:30:00Z", "bad"]
+
+        assert normalize_datetimes(values) == [normalize_datetime(v) for v in values]
+
+
+class TestEpochKey:
+    """Test suite for epoch keys."""
+
+    def test_round_trip_and_order(self):
+        """Test that keys round-trip and order like naive and aware datetimes."""
+        naive = datetime(2020, 5, 15, 10, 30, 0, 1)
+        aware = datetime(2020, 5, 15, 6, 30, tzinfo=timezone(timedelta(hours=-4)))
+
+        assert from_epoch_key(epoch_key(naive)) == naive
+        assert epoch_key(aware) < epoch_key(naive)
+        assert epoch_key(datetime(1970, 1, 1, 1)) == HOUR
+        assert epoch_key(datetime(1969, 12, 31, 23)) == -HOUR
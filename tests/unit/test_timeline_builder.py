@@ -1,9 +1,13 @@
 """Unit tests for TimelineBuilder."""
 
+import json
+
 import pytest
 from datetime import datetime
 
 from dr_nexus.extractors.timeline_builder import TimelineBuilder
+from dr_nexus.ingestors.ccda_ingestor import CCDAIngestor
+from dr_nexus.ingestors.fhir_ingestor import FHIRIngestor
 from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
 
 
@@ -56,6 +60,94 @@ class TestTimelineBuilder:
         assert sorted_events[1] == event3  # Feb
         assert sorted_events[2] == event1  # Mar
 
+    def test_sort_mixed_sources(self, fhir_bundle_file, ccda_file):
+        """Test that zoned FHIR times and offset-free C-CDA dates sort together."""
+        builder = TimelineBuilder()
+        builder.build_from_fhir_data(FHIRIngestor().ingest(fhir_bundle_file))
+        builder.build_from_ccda_data(CCDAIngestor().ingest(ccda_file))
+
+        dates = [e.date for e in builder.events]
+        assert all(d.tzinfo is None for d in dates)
+        assert dates == sorted(dates)
+        assert datetime(2020, 5, 15, 10, 30) in dates
+
+    def test_incremental_adds_match_full_sort(self):
+        """Test that batches added between reads merge like one stable sort."""
+        builder = TimelineBuilder()
+        added = []
+
+        for batch in range(4):
+            events = [
+                TimelineEvent(
+                    date=datetime(2020, 1 + (i * 7 + batch * 3) % 12, 1),
+                    event_type=EventType.ENCOUNTER,
+                    summary=f"Event {batch}-{i}"
+                )
+                for i in range(10)
+            ]
+            builder.add_events(events)
+            added.extend(events)
+            assert len(builder.events) == len(added)
+
+        assert builder.events == sorted(added, key=lambda e: e.date)
+
+    def test_events_copy_keeps_index_consistent(self, sample_timeline_event):
+        """Test that changing the returned events list does not corrupt the builder."""
+        builder = TimelineBuilder()
+        builder.add_events([sample_timeline_event] * 2)
+
+        builder.events.append(sample_timeline_event)
+
+        assert len(builder) == 2
+        assert len(builder.index.epoch_keys) == len(builder.events) == 2
+
+    def test_iter_events_streams_without_changing_builder(self, fhir_bundle_file, ccda_file):
+        """Test that streaming matches the ordered and deduplicated timelines."""
+        builder = TimelineBuilder()
+        builder.build_from_fhir_data(FHIRIngestor().ingest(fhir_bundle_file))
+        ordered = list(builder.events)
+        builder.build_from_ccda_data(CCDAIngestor().ingest(ccda_file))
+        builder.build_from_ccda_data(CCDAIngestor().ingest(ccda_file))
+        count = len(builder)
+
+        streamed = list(builder.iter_events())
+        deduplicated = list(builder.iter_events(tolerance_hours=24))
+
+        assert len(builder) == count
+        assert all(event in streamed for event in ordered)
+        assert streamed == builder.events
+        assert len(deduplicated) < count
+        assert builder.deduplicate_events() == deduplicated
+
+    def test_build_returns_document_events(self, fhir_bundle_file, ccda_file):
+        """Test that each build call returns only the events of its document."""
+        builder = TimelineBuilder()
+        fhir_events = builder.build_from_fhir_data(FHIRIngestor().ingest(fhir_bundle_file))
+        ccda_events = builder.build_from_ccda_data(CCDAIngestor().ingest(ccda_file))
+
+        assert fhir_events and ccda_events
+        assert len(builder) == len(fhir_events) + len(ccda_events)
+        assert all(e.source_document == str(ccda_file) for e in ccda_events)
+
+    def test_lab_result_provider_from_performer(self, tmp_path, sample_fhir_bundle):
+        """Test that a lab event takes its provider from the Observation's performer."""
+        observation = next(
+            e['resource'] for e in sample_fhir_bundle['entry']
+            if e['resource']['resourceType'] == 'Observation'
+        )
+        observation['performer'] = [{"reference": "urn:uuid:p1"}]
+        sample_fhir_bundle['entry'].append({
+            "fullUrl": "urn:uuid:p1",
+            "resource": {"resourceType": "Practitioner", "id": "p1", "name": [{"text": "Dr. Lab"}]}
+        })
+        filepath = tmp_path / "labs_FHIR.json"
+        filepath.write_text(json.dumps(sample_fhir_bundle))
+
+        events = TimelineBuilder().build_from_fhir_data(FHIRIngestor().ingest(filepath))
+
+        labs = [e for e in events if e.event_type == EventType.LAB_RESULT]
+        assert [e.provider for e in labs] == ["Dr. Lab"]
+
     def test_deduplicate_events(self):
         """Test deduplication of similar events."""
         builder = TimelineBuilder()
@@ -83,6 +175,44 @@ class TestTimelineBuilder:
         # Should keep event1 and event3, remove event2 as duplicate
         assert len(deduplicated) == 2
 
+    def test_deduplicate_honors_tolerance(self):
+        """Test that duplicates across an hour boundary depend on tolerance_hours."""
+        events = [
+            TimelineEvent(
+                date=datetime(2020, 1, 15, 9, 55),
+                event_type=EventType.ENCOUNTER,
+                summary="Office visit with Dr. Smith"
+            ),
+            TimelineEvent(
+                date=datetime(2020, 1, 15, 10, 5),
+                event_type=EventType.ENCOUNTER,
+                summary="Office Visit with Dr Smith."
+            ),
+        ]
+
+        builder = TimelineBuilder()
+        builder.add_events(events)
+        assert builder.deduplicate_events(tolerance_hours=0.1) == events
+        assert builder.deduplicate_events(tolerance_hours=1) == events[:1]
+        assert len(builder) == 1
+
+    def test_deduplicate_keeps_serial_readings(self):
+        """Test that same-value readings from one document all survive deduplication."""
+        readings = [
+            TimelineEvent(
+                date=datetime(2020, 1, 15, 6 * i),
+                event_type=EventType.LAB_RESULT,
+                summary="Glucose: 100 mg/dL",
+                source_document="labs.xml"
+            )
+            for i in range(4)
+        ]
+
+        builder = TimelineBuilder()
+        builder.add_events(readings)
+
+        assert builder.deduplicate_events() == readings
+
     def test_get_events_by_type(self):
         """Test filtering events by type."""
         builder = TimelineBuilder()
@@ -134,6 +264,13 @@ class TestTimelineBuilder:
         assert len(events) == 1
         assert events[0] == event2
 
+        # Bounds are inclusive
+        events = builder.get_events_by_date_range(
+            datetime(2020, 6, 15),
+            datetime(2020, 12, 31)
+        )
+        assert events == [event2, event3]
+
     def test_get_critical_events(self):
         """Test filtering critical significance events."""
         builder = TimelineBuilder()
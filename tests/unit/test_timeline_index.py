@@ -0,0 +1,93 @@
+"""Unit tests for TimelineIndex."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from dr_nexus.extractors.timeline_index import TimelineIndex
+from dr_nexus.knowledge_base.kb_loader import KBLoader
+from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
+from dr_nexus.output.json_generator import JSONGenerator
+
+
+@pytest.fixture
+def random_events():
+    """Events with random dates (including ties), types, significance and codes."""
+    rng = random.Random(7)
+    return [
+        TimelineEvent(
+            date=datetime(2020, 1, 1) + timedelta(days=rng.randrange(60)),
+            event_type=rng.choice(list(EventType)),
+            summary=f"Event {i}",
+            clinical_significance=rng.choice(list(ClinicalSignificance)),
+            codes=rng.choice([{}, {'cpt': '22551'}, {'icd10': 'I10', 'snomed': '38341003'}])
+        )
+        for i in range(300)
+    ]
+
+
+class TestTimelineIndex:
+    """Test suite for TimelineIndex."""
+
+    def test_lookups_match_scans(self, random_events):
+        """Test that every lookup matches a stable sort followed by a filter."""
+        index = TimelineIndex(random_events)
+        ordered = sorted(random_events, key=lambda e: e.date)
+        start, end = datetime(2020, 1, 10), datetime(2020, 2, 5)
+
+        assert index.events == ordered
+        assert index.between(start, end) == [e for e in ordered if start <= e.date <= end]
+        assert index.by_type(EventType.PROCEDURE) == \
+            [e for e in ordered if e.event_type == EventType.PROCEDURE]
+        assert index.by_type(EventType.LAB_RESULT, start, end) == [
+            e for e in ordered
+            if e.event_type == EventType.LAB_RESULT and start <= e.date <= end
+        ]
+        assert index.by_significance(ClinicalSignificance.CRITICAL, end_date=end) == [
+            e for e in ordered
+            if e.clinical_significance == ClinicalSignificance.CRITICAL and e.date <= end
+        ]
+        assert index.by_code("I10") == [e for e in ordered if "I10" in e.codes.values()]
+        assert index.by_code("I10", system="cpt") == []
+        assert index.by_code("missing") == []
+
+    def test_add_matches_extend(self, random_events):
+        """Test that adding events one at a time and in batches give the same index."""
+        one_by_one = TimelineIndex()
+        for event in random_events:
+            one_by_one.add(event)
+        batched = TimelineIndex(random_events[:100])
+        batched.extend(random_events[100:])
+
+        assert one_by_one.events == batched.events
+        assert one_by_one.by_code("22551") == batched.by_code("22551")
+        assert len(batched) == len(random_events)
+
+    def test_results_are_copies(self, random_events):
+        """Test that changing a returned list leaves the index intact."""
+        index = TimelineIndex(random_events)
+
+        index.by_type(EventType.ENCOUNTER).clear()
+
+        assert index.by_type(EventType.ENCOUNTER)
+
+
+class TestKnowledgeBaseIndex:
+    """Test suite for the knowledge base timeline index."""
+
+    def test_index_follows_timeline(self, sample_knowledge_base, random_events, temp_json_file):
+        """Test that the index is reused, rebuilt on change, and works after loading."""
+        kb = sample_knowledge_base
+        kb.timeline = random_events[:10]
+        index = kb.timeline_index()
+
+        assert kb.timeline_index() is index
+        kb.timeline.append(random_events[10])
+        assert len(kb.timeline_index()) == 11
+        kb.timeline = random_events
+        assert kb.timeline_index().events == sorted(random_events, key=lambda e: e.date)
+
+        JSONGenerator.save(kb, temp_json_file)
+        loaded = KBLoader.load(temp_json_file)
+        assert loaded.timeline_index().by_code("22551") == kb.timeline_index().by_code("22551")
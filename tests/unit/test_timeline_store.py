@@ -0,0 +1,78 @@
+"""Unit tests for ColumnarTimeline."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from dr_nexus.extractors.timeline_store import ColumnarTimeline
+from dr_nexus.models.timeline import TimelineEvent, EventType, ClinicalSignificance
+
+
+@pytest.fixture
+def events():
+    """Events with repeated values, ties, optional fields and nested details."""
+    start = datetime(2020, 1, 1)
+    return [
+        TimelineEvent(
+            date=start + timedelta(days=(i * 7) % 10),
+            event_type=[EventType.VITAL_SIGNS, EventType.ENCOUNTER, EventType.PROCEDURE][i % 3],
+            summary=f"Heart rate: {60 + i % 4} bpm" if i % 3 == 0 else "Office visit",
+            details={'value': 60 + i % 4, 'nested': {'list': [i, None]}} if i % 2 else {},
+            source_document="vitals.ndjson" if i % 3 == 0 else None,
+            clinical_significance=ClinicalSignificance.CRITICAL if i == 5 else ClinicalSignificance.LOW,
+            provider="Dr. Jane Smith" if i % 4 == 0 else None,
+            codes={'loinc': '8867-4'} if i % 3 == 0 else {}
+        )
+        for i in range(20)
+    ]
+
+
+class TestColumnarTimeline:
+    """Test suite for ColumnarTimeline."""
+
+    def test_round_trip(self, events):
+        """Test conversion to columns and back, with repeated values stored once."""
+        timeline = ColumnarTimeline.from_events(events)
+
+        assert len(timeline) == len(events)
+        assert timeline.to_events() == events
+        assert timeline.event(3) == events[3]
+        assert timeline.details(1) == events[1].details
+        assert timeline.details(0) == {}
+        assert len(timeline.dictionaries['summary']) == 5
+        assert timeline.dictionaries['provider'] == ["Dr. Jane Smith", None]
+
+    def test_sorted_is_stable(self, events):
+        """Test that sorting matches a stable sort of the events."""
+        assert ColumnarTimeline.from_events(events).sorted().to_events() == \
+            sorted(events, key=lambda e: e.date)
+
+    def test_filter(self, events):
+        """Test that combined filters match filtering the events."""
+        timeline = ColumnarTimeline.from_events(events)
+        start, end = datetime(2020, 1, 3), datetime(2020, 1, 6)
+
+        filtered = timeline.filter(start_date=start, end_date=end, event_type=EventType.VITAL_SIGNS)
+
+        assert filtered.to_events() == [
+            e for e in events
+            if start <= e.date <= end and e.event_type == EventType.VITAL_SIGNS
+        ]
+        assert timeline.filter(significance=ClinicalSignificance.CRITICAL).to_events() == [events[5]]
+        assert len(timeline.take([])) == 0
+
+    def test_count_by_type(self, events):
+        """Test counting events per type."""
+        assert ColumnarTimeline.from_events(events).count_by_type() == {
+            EventType.VITAL_SIGNS: 7,
+            EventType.ENCOUNTER: 7,
+            EventType.PROCEDURE: 6,
+        }
+
+    def test_empty(self):
+        """Test an empty timeline."""
+        timeline = ColumnarTimeline.from_events([])
+
+        assert len(timeline) == 0
+        assert timeline.to_events() == []
+        assert timeline.sorted().count_by_type() == {}
@@ -0,0 +1,124 @@
+"""Unit tests for KBWatcher."""
+
+import json
+
+from dr_nexus.ingestors.discovery import FileDiscovery
+from dr_nexus.ingestors.seen_index import SeenResourceIndex
+from dr_nexus.knowledge_base.kb_loader import KBLoader
+from dr_nexus.knowledge_base.watcher import KBWatcher
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _make_watcher(tmp_path, clock, **kwargs):
+    data = tmp_path / "data"
+    data.mkdir(exist_ok=True)
+    return KBWatcher(
+        data_dir=data,
+        kb_path=tmp_path / "kb.json",
+        discovery=FileDiscovery(manifest_path=tmp_path / "watch_manifest.json"),
+        debounce_seconds=3.0,
+        full_scan_interval=0,
+        clock=clock,
+        sleep=lambda seconds: None,
+        **kwargs
+    )
+
+
+def _drop_bundle(data_dir, name, bundle):
+    path = data_dir / name
+    path.write_text(json.dumps(bundle), encoding="utf-8")
+    return path
+
+
+class TestKBWatcher:
+    """Test suite for KBWatcher."""
+
+    def test_existing_files_are_baseline(self, tmp_path, sample_fhir_bundle):
+        """Test that files present when watching starts are not re-ingested."""
+        clock = FakeClock()
+        watcher = _make_watcher(tmp_path, clock)
+        _drop_bundle(watcher.data_dir, "old FHIR.json", sample_fhir_bundle)
+
+        assert watcher.start() == 0
+        assert watcher.poll() == 0
+        assert not (tmp_path / "kb.json").exists()
+
+    def test_new_files_are_debounced_and_merged(self, tmp_path, sample_fhir_bundle):
+        """Test that a burst of new files is applied once the directory is quiet."""
+        clock = FakeClock()
+        watcher = _make_watcher(tmp_path, clock)
+        watcher.start()
+
+        _drop_bundle(watcher.data_dir, "portal FHIR 1.json", sample_fhir_bundle)
+        clock.now = 1.0
+        assert watcher.poll() == 0
+        assert len(watcher.pending) == 1
+
+        _drop_bundle(watcher.data_dir, "portal FHIR 2.json", sample_fhir_bundle)
+        clock.now = 2.0
+        assert watcher.poll() == 0
+        assert len(watcher.pending) == 2
+
+        clock.now = 6.0
+        assert watcher.poll() == 2
+        assert not watcher.pending
+
+        kb = KBLoader.load(tmp_path / "kb.json")
+        assert [c.icd10_code for c in kb.patient_profile.chronic_conditions] == ["I10"]
+        assert kb.patient_profile.demographics.name == "John Doe"
+        assert kb.metadata.source_files_count == 2
+        assert len(kb.timeline) > 0
+
+    def test_max_batch_applies_immediately(self, tmp_path, sample_fhir_bundle):
+        """Test that a full batch skips the debounce period."""
+        clock = FakeClock()
+        watcher = _make_watcher(tmp_path, clock, max_batch=1)
+        watcher.start()
+
+        _drop_bundle(watcher.data_dir, "portal FHIR.json", sample_fhir_bundle)
+
+        assert watcher.poll() == 1
+        assert (tmp_path / "kb.json").exists()
+
+    def test_catches_up_on_changes_since_last_session(self, tmp_path, sample_fhir_bundle):
+        """Test that files added while no watcher ran are queued on start."""
+        first = _make_watcher(tmp_path, FakeClock())
+        first.start()
+
+        _drop_bundle(first.data_dir, "offline FHIR.json", sample_fhir_bundle)
+
+        second = _make_watcher(tmp_path, FakeClock())
+        assert second.start() == 1
+        assert second.flush() == 1
+
+    def test_seen_resources_are_skipped(self, tmp_path, sample_fhir_bundle):
+        """Test that a re-downloaded bundle is ingested without re-extracting its resources."""
+        for entry in sample_fhir_bundle['entry']:
+            entry['resource']['meta'] = {'lastUpdated': '2024-01-01T00:00:00'}
+        seen_index = SeenResourceIndex(tmp_path / "seen.json", scope="kb")
+        watcher = _make_watcher(tmp_path, FakeClock(), seen_index=seen_index)
+        watcher.start()
+
+        _drop_bundle(watcher.data_dir, "portal FHIR.json", sample_fhir_bundle)
+        watcher._scan(full=True)
+        assert watcher.flush() == 1
+        timeline = KBLoader.load(tmp_path / "kb.json").timeline
+
+        _drop_bundle(watcher.data_dir, "portal FHIR (1).json", sample_fhir_bundle)
+        watcher._scan(full=True)
+        new_data, ingested = watcher._ingest(dict(watcher.pending))
+
+        assert ingested == 1
+        assert new_data['conditions'] == []
+        assert new_data['timeline_events'] == []
+        assert "Condition/cond-1/2024-01-01T00:00:00" in SeenResourceIndex(tmp_path / "seen.json", scope="kb")
+        assert len(timeline) > 0